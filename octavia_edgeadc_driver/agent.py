@@ -3,26 +3,108 @@ EdgeADC Provider Agent for Octavia.
 
 This module provides the provider agent entry point for the Octavia driver agent.
 """
+from __future__ import annotations
+
 import logging
+import threading
 
+from octavia_lib.api.drivers import driver_lib
 from oslo_config import cfg
 
+from octavia_edgeadc_driver.api.edgeadc_client import EdgeADCClient
 from octavia_edgeadc_driver.common import config as driver_config
+from octavia_edgeadc_driver.common.device_registry import DeviceConfig
+from octavia_edgeadc_driver.common.health import MemberStatusPoller
+from octavia_edgeadc_driver.common.mapping_store import MappingStore
+from octavia_edgeadc_driver.common.reconciler import Reconciler
+from octavia_edgeadc_driver.common.statistics import ListenerStatsCollector
 
 LOG = logging.getLogger(__name__)
 CONF = cfg.CONF
 
 
-def edgeadc_provider_agent():
+def edgeadc_provider_agent(exit_event: threading.Event | None = None):
     """Entry point for the EdgeADC provider agent.
 
-    This function is called by the Octavia driver agent to initialize
-    the EdgeADC provider. It registers configuration options and sets
-    up any necessary background tasks.
+    This function is called by the Octavia driver agent in its own
+    process. It polls the device for member health and listener traffic,
+    reports them to Octavia and repairs configuration drift on the device
+    until ``exit_event`` is set.
     """
     driver_config.register_opts(CONF)
+    exit_event = exit_event or threading.Event()
     LOG.info("EdgeADC provider agent started")
 
-    # The agent runs as part of the Octavia driver agent process
-    # No additional background tasks needed for basic operation
+    status_interval = CONF.edgeadc.edgeadc_status_poll_interval
+    stats_interval = CONF.edgeadc.edgeadc_stats_interval
+    if stats_interval > 0 and not CONF.edgeadc.edgeadc_stats_path:
+        LOG.info("EdgeADC listener statistics disabled: edgeadc_stats_path is not set")
+        stats_interval = 0
+    reconcile_interval = CONF.edgeadc.edgeadc_reconcile_interval
+    if status_interval <= 0 and stats_interval <= 0 and reconcile_interval <= 0:
+        LOG.info("EdgeADC member status, statistics and reconciliation disabled")
+        return None
+
+    devices = driver_config.load_devices(CONF)
+    clients: list[EdgeADCClient] = []
+
+    def make_clients() -> dict[str, EdgeADCClient]:
+        # Each loop runs in its own thread and gets its own session per device
+        loop_clients = {device.host: _device_client(device) for device in devices}
+        clients.extend(loop_clients.values())
+        return loop_clients
+
+    library = driver_lib.DriverLibrary()
+    mappings = MappingStore(CONF.edgeadc.edgeadc_mapping_db)
+    threads: list[threading.Thread] = []
+
+    if status_interval > 0:
+        poller = MemberStatusPoller(
+            library.update_loadbalancer_status, mappings, make_clients(),
+            batch_size=CONF.edgeadc.edgeadc_status_batch_size
+        )
+        threads.append(threading.Thread(
+            target=poller.run, args=(status_interval, exit_event), name="edgeadc-member-status"))
+    if stats_interval > 0:
+        collector = ListenerStatsCollector(
+            library.update_listener_statistics, mappings, make_clients(),
+            batch_size=CONF.edgeadc.edgeadc_status_batch_size,
+            stats_path=CONF.edgeadc.edgeadc_stats_path
+        )
+        threads.append(threading.Thread(
+            target=collector.run, args=(stats_interval, exit_event), name="edgeadc-listener-stats"))
+    if reconcile_interval > 0:
+        reconciler = Reconciler(
+            library, mappings, make_clients(),
+            rate=CONF.edgeadc.edgeadc_reconcile_rate,
+            batch_size=CONF.edgeadc.edgeadc_reconcile_batch_size,
+            subnet_mask=CONF.edgeadc.edgeadc_default_subnet_mask
+        )
+        threads.append(threading.Thread(
+            target=reconciler.run, args=(reconcile_interval, exit_event), name="edgeadc-reconciler"))
+
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        exit_event.set()
+        for client in clients:
+            client.close()
+        mappings.close()
+        LOG.info("EdgeADC provider agent stopped")
     return None
+
+
+def _device_client(device: DeviceConfig) -> EdgeADCClient:
+    """Create a client session for one device."""
+    return EdgeADCClient(
+        host=device.host,
+        username=device.username,
+        password=device.password,
+        port=device.port,
+        timeout=device.timeout,
+        verify_ssl=device.verify_ssl,
+        peers=device.peers
+    )
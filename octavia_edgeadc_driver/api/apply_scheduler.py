@@ -0,0 +1,199 @@
+"""
+Coalescing scheduler for EdgeADC configuration applies.
+
+Applying the configuration (/POST/5?iAction=1) is the most expensive
+operation on the appliance. The scheduler debounces apply requests for a
+short window so that any number of changes made in that window are
+committed by a single apply.
+"""
+from __future__ import annotations
+
+import asyncio
+import collections
+import logging
+import threading
+from collections.abc import Awaitable, Callable
+
+LOG = logging.getLogger(__name__)
+
+
+class ApplyScheduler:
+    """Debounce and coalesce config applies for one device.
+
+    Each call to ``request()`` returns a ticket. The ticket is covered by
+    the first apply that starts after the request was made; ``wait()``
+    blocks until that apply has finished and returns its outcome.
+    """
+
+    def __init__(self, apply_fn: Callable[[], bool], window: float = 0.5) -> None:
+        self.window = window
+        self._apply_fn = apply_fn
+        self._cond = threading.Condition()
+        self._requested = 0
+        self._applied = 0
+        self._running = False
+        self._timer: threading.Timer | None = None
+        # (generation, ok) for recent applies, oldest first
+        self._outcomes: collections.deque[tuple[int, bool]] = collections.deque(maxlen=256)
+
+    @property
+    def pending(self) -> int:
+        """Number of requested changes not yet covered by an apply."""
+        with self._cond:
+            return self._requested - self._applied
+
+    def request(self) -> int:
+        """Record a pending change and schedule an apply for it."""
+        with self._cond:
+            self._requested += 1
+            ticket = self._requested
+            if self._timer is None and not self._running:
+                self._start_timer()
+            return ticket
+
+    def wait(self, ticket: int | None = None, timeout: float | None = None) -> bool:
+        """Wait for the apply covering ``ticket`` (default: all requests).
+
+        Returns False if that apply failed or the timeout expired.
+        """
+        with self._cond:
+            if ticket is None:
+                ticket = self._requested
+            if not self._cond.wait_for(lambda: self._applied >= ticket, timeout):
+                return False
+            for generation, ok in self._outcomes:
+                if generation >= ticket:
+                    return ok
+            return True
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Apply pending changes now instead of at the end of the window."""
+        with self._cond:
+            if self._requested == self._applied:
+                return True
+            ticket = self._requested
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            run_now = not self._running
+        if run_now:
+            self._run()
+        return self.wait(ticket, timeout)
+
+    def _start_timer(self) -> None:
+        self._timer = threading.Timer(self.window, self._run)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _run(self) -> None:
+        with self._cond:
+            self._timer = None
+            if self._running or self._requested == self._applied:
+                return
+            self._running = True
+            target = self._requested
+            count = target - self._applied
+
+        try:
+            ok = bool(self._apply_fn())
+        except Exception as e:
+            LOG.warning(f"Config apply failed: {e}")
+            ok = False
+        LOG.debug(f"Applied {count} coalesced change(s): {'OK' if ok else 'FAILED'}")
+
+        with self._cond:
+            self._running = False
+            self._applied = target
+            self._outcomes.append((target, ok))
+            # Changes made while the apply was running need another one
+            if self._requested > self._applied and self._timer is None:
+                self._start_timer()
+            self._cond.notify_all()
+
+
+class AsyncApplyScheduler:
+    """asyncio counterpart of :class:`ApplyScheduler`.
+
+    A single task per scheduler sleeps for the window, applies everything
+    requested so far and repeats while new requests keep arriving.
+    """
+
+    def __init__(self, apply_fn: Callable[[], Awaitable[bool]], window: float = 0.5) -> None:
+        self.window = window
+        self._apply_fn = apply_fn
+        self._requested = 0
+        self._applied = 0
+        self._task: asyncio.Task | None = None
+        self._cond: asyncio.Condition | None = None
+        self._flush_now: asyncio.Event | None = None
+        self._outcomes: collections.deque[tuple[int, bool]] = collections.deque(maxlen=256)
+
+    @property
+    def pending(self) -> int:
+        """Number of requested changes not yet covered by an apply."""
+        return self._requested - self._applied
+
+    def request(self) -> int:
+        """Record a pending change and schedule an apply for it."""
+        self._requested += 1
+        self._ensure_task()
+        return self._requested
+
+    async def wait(self, ticket: int | None = None, timeout: float | None = None) -> bool:
+        """Wait for the apply covering ``ticket`` (default: all requests)."""
+        if ticket is None:
+            ticket = self._requested
+        cond = self._condition()
+        try:
+            async with cond:
+                await asyncio.wait_for(cond.wait_for(lambda: self._applied >= ticket), timeout)
+        except asyncio.TimeoutError:
+            return False
+        for generation, ok in self._outcomes:
+            if generation >= ticket:
+                return ok
+        return True
+
+    async def flush(self, timeout: float | None = None) -> bool:
+        """Apply pending changes now instead of at the end of the window."""
+        if self._requested == self._applied:
+            return True
+        ticket = self._requested
+        self._flush_event().set()
+        self._ensure_task()
+        return await self.wait(ticket, timeout)
+
+    def _condition(self) -> asyncio.Condition:
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        return self._cond
+
+    def _flush_event(self) -> asyncio.Event:
+        if self._flush_now is None:
+            self._flush_now = asyncio.Event()
+        return self._flush_now
+
+    def _ensure_task(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    async def _run(self) -> None:
+        flush_now = self._flush_event()
+        while self._requested > self._applied:
+            try:
+                await asyncio.wait_for(flush_now.wait(), self.window)
+            except asyncio.TimeoutError:
+                pass
+            flush_now.clear()
+            target = self._requested
+            try:
+                ok = bool(await self._apply_fn())
+            except Exception as e:
+                LOG.warning(f"Config apply failed: {e}")
+                ok = False
+            LOG.debug(f"Applied {target - self._applied} coalesced change(s): {'OK' if ok else 'FAILED'}")
+            cond = self._condition()
+            async with cond:
+                self._applied = target
+                self._outcomes.append((target, ok))
+                cond.notify_all()
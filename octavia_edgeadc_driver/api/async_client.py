@@ -0,0 +1,603 @@
+"""
+Asyncio EdgeADC REST Client for the Octavia provider driver.
+Provides the EdgeADCClient method set as coroutines on httpx.AsyncClient,
+so many devices and independent reads can be driven from one event loop.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import contextvars
+import logging
+import time
+from collections.abc import Iterator
+from typing import Any
+
+import httpx
+
+from octavia_edgeadc_driver.api import payloads
+from octavia_edgeadc_driver.api.apply_scheduler import AsyncApplyScheduler
+from octavia_edgeadc_driver.api.polling import AdaptivePoller
+from octavia_edgeadc_driver.api.snapshot import IPServicesSnapshot
+from octavia_edgeadc_driver.common import constants
+
+LOG = logging.getLogger(__name__)
+
+# Clients whose applies the current task has deferred, once per nesting level
+_deferring: contextvars.ContextVar[tuple[AsyncEdgeADCClient, ...]] = contextvars.ContextVar(
+    "edgeadc_deferring", default=())
+
+
+class AsyncEdgeADCClient:
+    """Asyncio REST API client for EdgeADC devices."""
+
+    def __init__(
+        self,
+        host: str,
+        username: str,
+        password: str,
+        port: int = 443,
+        timeout: float = 30.0,
+        verify_ssl: bool = False,
+        cache_ttl: float = 5.0,
+        apply_delay: float = 0.0,
+        poll_timeout: float = 5.0
+    ) -> None:
+        self.host = host.strip()
+        self.port = port
+        self.base_url = f"https://{self.host}:{self.port}"
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+        self.verify_ssl = verify_ssl
+        self._guid: str | None = None
+        self._client: httpx.AsyncClient | None = None
+        self._login_lock: asyncio.Lock | None = None
+        # Cached /GET/9 snapshot; see get_snapshot()
+        self.cache_ttl = cache_ttl
+        self._snapshot: IPServicesSnapshot | None = None
+        self._snapshot_time = 0.0
+        # Bumped whenever the cache changes; see _store_snapshot()
+        self._snapshot_generation = 0
+        # Coalesce config applies when a debounce window is configured
+        self._apply_scheduler: AsyncApplyScheduler | None = None
+        if apply_delay > 0:
+            self._apply_scheduler = AsyncApplyScheduler(self.apply_config, apply_delay)
+        # Pollers learn how long this device takes to expose changes
+        self._template_poller = AdaptivePoller("VIP template", deadline=poll_timeout)
+        self._apply_poller = AdaptivePoller("VIP apply", deadline=poll_timeout)
+        self._placeholder_poller = AdaptivePoller("placeholder", deadline=poll_timeout)
+        # Blank templates held by a TemplatePool or a create in progress,
+        # keyed by (InterfaceID, ChannelID)
+        self._reserved_templates: set[tuple[str, str]] = set()
+        # Placeholders between their creation and fill-in, keyed by (ChannelKey, cId)
+        self._reserved_placeholders: set[tuple[str, int]] = set()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get or create HTTP client."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                verify=self.verify_ssl
+            )
+        return self._client
+
+    async def close(self) -> None:
+        """Apply any pending changes and close the HTTP client."""
+        if self._apply_scheduler and self._client:
+            await self._apply_scheduler.flush(timeout=self.timeout)
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+
+    async def login(self) -> str | None:
+        """Authenticate with the device and return GUID."""
+        url = f"{self.base_url}{constants.API_LOGIN}"
+        client = self._get_client()
+
+        try:
+            r = await client.post(
+                url,
+                content=payloads.login(self.username, self.password),
+                headers={"Content-Type": "text/plain"}
+            )
+            data = r.json() if r.content else {}
+        except Exception as e:
+            LOG.warning(f"EdgeADC login failed: {e}")
+            data = {}
+
+        guid = data.get("GUID")
+        if guid:
+            self._guid = guid
+            client.cookies.set("GUID", guid)
+            LOG.info(f"EdgeADC login successful for {self.host}")
+        else:
+            LOG.error(f"EdgeADC login failed for {self.host}: {data}")
+
+        return guid
+
+    async def _ensure_login(self) -> None:
+        """Ensure we have a valid session, logging in once for all waiters."""
+        if self._guid:
+            return
+        if self._login_lock is None:
+            self._login_lock = asyncio.Lock()
+        async with self._login_lock:
+            if not self._guid:
+                await self.login()
+
+    async def _get(self, path: str) -> tuple[int, Any]:
+        """Make a GET request."""
+        await self._ensure_login()
+        client = self._get_client()
+        url = f"{self.base_url}{path}"
+        try:
+            r = await client.get(url)
+            js = r.json() if r.content else None
+        except Exception as e:
+            LOG.warning(f"GET {path} failed: {e}")
+            return 500, None
+        return r.status_code, js
+
+    async def _post(self, path: str, payload: dict[str, Any]) -> tuple[int, Any]:
+        """Make a POST request.
+
+        Refreshes the cached snapshot from /POST/9 responses exactly like
+        EdgeADCClient._post.
+        """
+        await self._ensure_login()
+        updates_services = path.startswith(constants.API_IP_SERVICES_UPDATE)
+        generation = self.invalidate_cache() if updates_services else None
+        client = self._get_client()
+        url = f"{self.base_url}{path}"
+        try:
+            r = await client.post(url, json=payload)
+            js = r.json() if r.content else None
+        except Exception as e:
+            LOG.warning(f"POST {path} failed: {e}")
+            return 500, None
+        if updates_services and r.status_code == 200:
+            snapshot = IPServicesSnapshot.from_response(js)
+            if snapshot is not None:
+                self._store_snapshot(snapshot, generation)
+        return r.status_code, js
+
+    async def get_system_info(self) -> dict[str, Any]:
+        """Get system information."""
+        code, js = await self._get(constants.API_SYSTEM_INFO)
+        if code == 200 and isinstance(js, dict):
+            return js
+        return {}
+
+    def invalidate_cache(self) -> int:
+        """Drop the cached IP-services snapshot; returns the new cache generation."""
+        self._snapshot = None
+        self._snapshot_time = 0.0
+        self._snapshot_generation += 1
+        return self._snapshot_generation
+
+    async def get_snapshot(self, max_age: float | None = None) -> IPServicesSnapshot:
+        """Get the indexed IP-services snapshot (see EdgeADCClient.get_snapshot)."""
+        if max_age is None:
+            max_age = self.cache_ttl
+        if self._snapshot is not None and time.monotonic() - self._snapshot_time < max_age:
+            return self._snapshot
+
+        generation = self._snapshot_generation
+        code, js = await self._get(f"{constants.API_IP_SERVICES}?isPageLoad=true")
+        snapshot = IPServicesSnapshot.from_response(js) if code == 200 else None
+        if snapshot is None:
+            return IPServicesSnapshot([])
+
+        self._store_snapshot(snapshot, generation)
+        return snapshot
+
+    def _store_snapshot(self, snapshot: IPServicesSnapshot, generation: int | None = None) -> bool:
+        """Make ``snapshot`` the cached view of the device configuration.
+
+        With ``generation`` the snapshot is only stored if the cache has
+        not changed since that generation was read.
+        """
+        if generation is not None and generation != self._snapshot_generation:
+            return False
+        self._snapshot = snapshot
+        self._snapshot_time = time.monotonic()
+        self._snapshot_generation += 1
+        return True
+
+    async def get_ip_services(self, max_age: float | None = None) -> list[dict[str, Any]]:
+        """Get all IP services (VIPs)."""
+        return list((await self.get_snapshot(max_age=max_age)).vips)
+
+    def _claim_template(
+        self,
+        before: set[tuple[str, str]],
+        snapshot: IPServicesSnapshot | None
+    ) -> dict[str, Any] | None:
+        """Reserve a blank VIP template that appeared since ``before``."""
+        if snapshot is None:
+            return None
+        for vip in snapshot.blank_vips:
+            channel = IPServicesSnapshot.channel_of(vip)
+            if channel not in before and channel not in self._reserved_templates:
+                self._reserved_templates.add(channel)
+                return vip
+        return None
+
+    async def create_vip_template(self, reserve: bool = False) -> dict[str, Any] | None:
+        """Create a blank VIP template (step 1 of a VIP create) and return it.
+
+        With ``reserve`` the template is held for a later
+        ``create_virtual_service(template=...)`` and is never picked up by
+        other creates in the meantime.
+        """
+        before = set((await self.get_snapshot(max_age=0)).by_channel)
+        code, resp = await self._post(constants.API_VIP_CREATE_TEMPLATE, payloads.vip_template())
+        if code != 200:
+            LOG.error(f"EdgeADC {self.host}: Failed to create VIP template")
+            return None
+
+        # The create response normally carries the template; poll the
+        # device only if it does not.
+        template = self._claim_template(before, IPServicesSnapshot.from_response(resp))
+        if not template:
+            template = await self._find_new_template(before)
+        if not template:
+            LOG.error(f"EdgeADC {self.host}: Could not find VIP template")
+            return None
+        if not reserve:
+            self.release_template(template)
+        return template
+
+    def release_template(self, template: dict[str, Any]) -> None:
+        """Stop holding a reserved template."""
+        self._reserved_templates.discard(IPServicesSnapshot.channel_of(template))
+
+    async def delete_vip_template(self, template: dict[str, Any], wait_apply: bool = True) -> bool:
+        """Delete a blank VIP template."""
+        self.release_template(template)
+        code, _ = await self._post(constants.API_VIP_DELETE, payloads.vip_ref(template))
+        success = code == 200
+        if success:
+            await self._request_apply(wait_apply)
+        return success
+
+    async def _find_new_template(self, before: set[tuple[str, str]]) -> dict[str, Any] | None:
+        """Poll the device for a blank VIP template that appeared since ``before``."""
+        async def check() -> dict[str, Any] | None:
+            return self._claim_template(before, await self.get_snapshot(max_age=0))
+        return await self._template_poller.wait_async(check)
+
+    async def create_virtual_service(
+        self,
+        ip_addr: str,
+        port: int,
+        protocol: str = "HTTP",
+        subnet_mask: str = "255.255.255.0",
+        service_name: str = "",
+        wait_apply: bool = True,
+        template: dict[str, Any] | None = None
+    ) -> tuple[bool, dict[str, Any] | None]:
+        """Create a new Virtual IP Service (VIP) using Terraform two-step approach."""
+        # Step 1: Create a blank template, unless a reserved one was given.
+        # The template stays reserved until it is filled in.
+        if template is None:
+            template = await self.create_vip_template(reserve=True)
+            if not template:
+                return False, {"error": "Failed to create template"}
+
+        # Step 2: Update the template with the actual values
+        update_payload = payloads.vip_update(template, ip_addr, port, protocol, subnet_mask, service_name)
+        try:
+            code2, js = await self._post(constants.API_VIP_UPDATE_TEMPLATE, update_payload)
+        finally:
+            self.release_template(template)
+        success = code2 == 200
+
+        if success:
+            await self._request_apply(wait_apply)
+            if wait_apply and not self._apply_deferred:
+                await self._wait_for_vip(ip_addr, port)
+
+        LOG.info(f"EdgeADC {self.host}: Create VIP {ip_addr}:{port} - {'OK' if success else 'FAILED'}")
+        return success, js
+
+    async def _wait_for_vip(self, ip_addr: str, port: int) -> dict[str, Any] | None:
+        """Poll until an applied VIP is visible on the device (see EdgeADCClient._wait_for_vip)."""
+        vip = (await self.get_snapshot()).find_vip(ip_addr, port)
+        if vip is not None:
+            return vip
+
+        async def check() -> dict[str, Any] | None:
+            return (await self.get_snapshot(max_age=0)).find_vip(ip_addr, port)
+        vip = await self._apply_poller.wait_async(check, max_checks=constants.VIP_POLL_MAX_FETCHES)
+        if vip is None:
+            LOG.warning(f"EdgeADC {self.host}: VIP {ip_addr}:{port} not visible after apply")
+        return vip
+
+    async def delete_virtual_service(self, ip_addr: str, port: int, wait_apply: bool = True) -> bool:
+        """Delete a Virtual IP Service."""
+        vip_info = await self._get_vip_info(ip_addr, port, max_age=0)
+        if not vip_info:
+            LOG.warning(f"VIP {ip_addr}:{port} not found for deletion")
+            return False
+
+        code, _ = await self._post(constants.API_VIP_DELETE, payloads.vip_ref(vip_info))
+        success = code == 200
+
+        if success:
+            await self._request_apply(wait_apply)
+
+        LOG.info(f"EdgeADC {self.host}: Delete VIP {ip_addr}:{port} - {'OK' if success else 'FAILED'}")
+        return success
+
+    async def _get_vip_info(
+        self,
+        vip_ip: str,
+        vip_port: int,
+        max_age: float | None = None
+    ) -> dict[str, Any] | None:
+        """Get VIP info including InterfaceID and ChannelID."""
+        return (await self.get_snapshot(max_age=max_age)).find_vip(vip_ip, vip_port)
+
+    async def add_member(
+        self,
+        vip_ip: str,
+        vip_port: int,
+        member_ip: str,
+        member_port: int,
+        weight: int = 100,
+        wait_apply: bool = True
+    ) -> tuple[bool, dict[str, Any] | None]:
+        """Add a member (content server) to a VIP."""
+        snapshot = await self.get_snapshot(max_age=0)
+        vip_info = snapshot.find_vip(vip_ip, vip_port)
+        if not vip_info:
+            LOG.warning(f"VIP {vip_ip}:{vip_port} not found")
+            return False, {"error": "VIP not found"}
+
+        channel_key = str(vip_info.get("ChannelKey", ""))
+        before = set(snapshot.placeholder_cids(channel_key))
+
+        # Step 1: Create placeholder
+        code1, resp1 = await self._post(constants.API_SERVER_ADD_INIT, payloads.vip_ref(vip_info))
+        if code1 != 200:
+            return False, {"error": "Failed to create placeholder"}
+
+        # Find the new placeholder by its cId missing from ``before``
+        new_cids = self._claim_placeholders(channel_key, before, IPServicesSnapshot.from_response(resp1), 1)
+        if not new_cids:
+            new_cids = await self._find_new_placeholders(channel_key, before, 1)
+        if not new_cids:
+            LOG.warning(f"Could not find placeholder cId for VIP {vip_ip}:{vip_port}")
+            return False, {"error": "Could not find placeholder"}
+
+        # Step 2: Update placeholder with actual server details
+        add_payload = payloads.server_add(vip_info, new_cids[0], member_ip, member_port, weight)
+        try:
+            code2, js = await self._post(constants.API_SERVER_ADD_UPDATE, add_payload)
+        finally:
+            self._release_placeholders(channel_key, new_cids)
+        success = code2 == 200
+
+        if success:
+            await self._request_apply(wait_apply)
+
+        LOG.info(f"EdgeADC {self.host}: Add member {member_ip}:{member_port} to VIP - {'OK' if success else 'FAILED'}")
+        return success, js
+
+    async def add_members(
+        self,
+        vip_ip: str,
+        vip_port: int,
+        members: list[dict[str, Any]],
+        wait_apply: bool = True
+    ) -> tuple[bool, list[dict[str, Any]]]:
+        """Add many members to a VIP with a single config apply.
+
+        ``members`` are dicts with ``ip_address``, ``port`` and optional
+        ``weight``. All placeholders are created first and matched to
+        their cIds by diffing the last response against the placeholders
+        seen before, then filled in; any left blank are deleted. Returns
+        overall success and a per-member result list.
+        """
+        results = [{"ip_address": m["ip_address"], "port": int(m["port"]), "cId": None,
+                    "success": False} for m in members]
+        snapshot = await self.get_snapshot(max_age=0)
+        vip_info = snapshot.find_vip(vip_ip, vip_port)
+        if not vip_info:
+            LOG.warning(f"VIP {vip_ip}:{vip_port} not found")
+            return False, results
+        if not members:
+            return True, results
+
+        channel_key = str(vip_info.get("ChannelKey", ""))
+        before = set(snapshot.placeholder_cids(channel_key))
+
+        # Step 1: Create all placeholders
+        response = None
+        created = attempted = 0
+        for _ in members:
+            attempted += 1
+            code, response = await self._post(constants.API_SERVER_ADD_INIT, payloads.vip_ref(vip_info))
+            if code != 200:
+                break
+            created += 1
+        new_cids = self._claim_placeholders(
+            channel_key, before, IPServicesSnapshot.from_response(response), created)
+        if len(new_cids) < created:
+            new_cids += await self._find_new_placeholders(channel_key, before, created - len(new_cids))
+
+        # Step 2: Fill them in
+        changed = False
+        for result, member, cid in zip(results, members, new_cids):
+            payload = payloads.server_add(vip_info, cid, member["ip_address"], member["port"],
+                                          member.get("weight", 100))
+            code, _ = await self._post(constants.API_SERVER_ADD_UPDATE, payload)
+            result["cId"] = str(cid)
+            result["success"] = code == 200
+            changed = changed or result["success"]
+
+        # Remove every placeholder this call created but did not fill: those
+        # left blank by failed updates, those that could not be matched to a
+        # cId in time, and one a failed create may still have added
+        unfilled = [cid for result, cid in zip(results, new_cids) if not result["success"]]
+        if len(new_cids) < attempted:
+            strays = self._claim_placeholders(
+                channel_key, before, await self.get_snapshot(max_age=0), attempted - len(new_cids))
+            unfilled += strays
+            new_cids += strays
+        for cid in unfilled:
+            code, _ = await self._post(constants.API_SERVER_DELETE, payloads.server_ref(vip_info, cid))
+            changed = changed or code == 200
+        self._release_placeholders(channel_key, new_cids)
+
+        if changed:
+            await self._request_apply(wait_apply)
+
+        added = sum(1 for r in results if r["success"])
+        LOG.info(f"EdgeADC {self.host}: Add {added}/{len(members)} members to VIP {vip_ip}:{vip_port}")
+        return added == len(members), results
+
+    def _claim_placeholders(
+        self,
+        channel_key: str,
+        before: set[int],
+        snapshot: IPServicesSnapshot | None,
+        count: int
+    ) -> list[int]:
+        """Reserve up to ``count`` blank placeholders of a VIP that appeared since ``before``."""
+        claimed: list[int] = []
+        if snapshot is None:
+            return claimed
+        for cid in snapshot.placeholder_cids(channel_key):
+            if len(claimed) == count:
+                break
+            if cid not in before and (channel_key, cid) not in self._reserved_placeholders:
+                self._reserved_placeholders.add((channel_key, cid))
+                claimed.append(cid)
+        return claimed
+
+    async def _find_new_placeholders(self, channel_key: str, before: set[int], count: int) -> list[int]:
+        """Poll the device for ``count`` blank placeholders that appeared since ``before``."""
+        claimed: list[int] = []
+
+        async def check() -> bool | None:
+            snapshot = await self.get_snapshot(max_age=0)
+            claimed.extend(self._claim_placeholders(channel_key, before, snapshot, count - len(claimed)))
+            return True if len(claimed) == count else None
+
+        await self._placeholder_poller.wait_async(check)
+        return claimed
+
+    def _release_placeholders(self, channel_key: str, cids: list[int]) -> None:
+        """Stop holding placeholders once they are filled in or given up."""
+        self._reserved_placeholders.difference_update((channel_key, cid) for cid in cids)
+
+    async def delete_member(
+        self,
+        vip_ip: str,
+        vip_port: int,
+        member_ip: str,
+        member_port: int,
+        wait_apply: bool = True
+    ) -> bool:
+        """Delete a member from a VIP."""
+        snapshot = await self.get_snapshot(max_age=0)
+        vip_info = snapshot.find_vip(vip_ip, vip_port)
+        if not vip_info:
+            return False
+
+        server = snapshot.find_server(vip_ip, vip_port, member_ip, member_port)
+        if not server:
+            LOG.warning(f"Member {member_ip}:{member_port} not found in VIP {vip_ip}:{vip_port}")
+            return False
+
+        payload = payloads.server_ref(vip_info, server.get("cId", "0"))
+        code, _ = await self._post(constants.API_SERVER_DELETE, payload)
+        success = code == 200
+        if success:
+            await self._request_apply(wait_apply)
+        LOG.info(f"EdgeADC {self.host}: Delete member {member_ip}:{member_port} - {'OK' if success else 'FAILED'}")
+        return success
+
+    async def get_members(
+        self,
+        vip_ip: str,
+        vip_port: int,
+        max_age: float | None = None
+    ) -> list[dict[str, Any]]:
+        """Get all members for a VIP."""
+        vip_info = await self._get_vip_info(vip_ip, vip_port, max_age=max_age)
+        if not vip_info:
+            return []
+        return payloads.members(vip_info)
+
+    async def apply_config(self) -> bool:
+        """Apply pending configuration changes."""
+        code, _ = await self._post(constants.API_APPLY_CONFIG, {"apply": "1"})
+        return code == 200
+
+    async def _request_apply(self, wait: bool = True) -> bool:
+        """Apply a change now, or through the coalescing scheduler."""
+        if self._apply_deferred:
+            return True
+        if self._apply_scheduler is None:
+            return await self.apply_config()
+        ticket = self._apply_scheduler.request()
+        if not wait:
+            return True
+        return await self._apply_scheduler.wait(ticket, timeout=self.timeout)
+
+    @property
+    def _apply_deferred(self) -> int:
+        """Nesting depth of deferred_apply() in the calling task."""
+        return _deferring.get().count(self)
+
+    @contextlib.contextmanager
+    def deferred_apply(self) -> Iterator[None]:
+        """Suppress per-mutation applies made by the calling task.
+
+        The caller applies afterwards. Tasks it starts inherit the
+        suppression; other tasks keep applying their own changes.
+        """
+        token = _deferring.set(_deferring.get() + (self,))
+        try:
+            yield
+        finally:
+            _deferring.reset(token)
+
+    async def wait_for_apply(self, timeout: float | None = None) -> bool:
+        """Wait until every change made so far has been applied."""
+        if self._apply_scheduler is None:
+            return True
+        return await self._apply_scheduler.wait(timeout=timeout)
+
+    async def flush_apply(self, timeout: float | None = None) -> bool:
+        """Apply pending changes without waiting for the debounce window."""
+        if self._apply_scheduler is None:
+            return True
+        return await self._apply_scheduler.flush(timeout=timeout)
+
+    async def update_member_weight(
+        self,
+        vip_ip: str,
+        vip_port: int,
+        member_ip: str,
+        member_port: int,
+        weight: int,
+        wait_apply: bool = True
+    ) -> bool:
+        """Update a member's weight."""
+        snapshot = await self.get_snapshot(max_age=0)
+        vip_info = snapshot.find_vip(vip_ip, vip_port)
+        server = snapshot.find_server(vip_ip, vip_port, member_ip, member_port)
+        if not vip_info or not server:
+            return False
+
+        payload = payloads.server_weight(vip_info, server.get("cId", "0"), member_ip, member_port, weight)
+        code, _ = await self._post(constants.API_SERVER_ADD_UPDATE, payload)
+        if code == 200:
+            await self._request_apply(wait_apply)
+            return True
+        return False
@@ -0,0 +1,52 @@
+"""
+Cluster role detection for EdgeADC devices.
+
+Devices in an EdgeADC cluster share one configuration, owned by the
+primary, while every member can answer reads. The role of each member is
+read from the cluster status endpoint (/GET/30). A secondary role alone
+does not stop writes: member changes still take effect on such devices,
+so writes only move to a peer that reports itself primary.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+from octavia_edgeadc_driver.common import constants
+
+ROLE_STANDALONE = "standalone"
+ROLE_PRIMARY = "primary"
+ROLE_SECONDARY = "secondary"
+
+
+def cluster_role(response: Any) -> str | None:
+    """Read a device's cluster role from a /GET/30 response; None if unknown."""
+    role = _find(response, constants.CLUSTER_ROLE_FIELDS)
+    if role is not None:
+        role = role.lower()
+        if role in constants.CLUSTER_PRIMARY_ROLES:
+            return ROLE_PRIMARY
+        if role in constants.CLUSTER_SECONDARY_ROLES:
+            return ROLE_SECONDARY
+    state = _find(response, constants.CLUSTER_STATE_FIELDS)
+    if state is not None:
+        return constants.CLUSTER_STATE_ROLES.get(state)
+    return None
+
+
+def _find(node: Any, fields: tuple[str, ...]) -> str | None:
+    """Find the first of ``fields`` with a scalar value in a nested response."""
+    if isinstance(node, dict):
+        for field in fields:
+            value = node.get(field)
+            if isinstance(value, (str, int)) and not isinstance(value, bool):
+                return str(value).strip()
+        children = list(node.values())
+    elif isinstance(node, list):
+        children = node
+    else:
+        return None
+    for child in children:
+        value = _find(child, fields)
+        if value is not None:
+            return value
+    return None
@@ -4,20 +4,34 @@ Provides synchronous methods for communicating with EdgeNexus ADC devices.
 """
 from __future__ import annotations
 
-import base64
+import contextlib
 import logging
+import threading
 import time
+from collections.abc import Iterator
 from typing import Any
 
 import httpx
 
+from octavia_edgeadc_driver.api import payloads
+from octavia_edgeadc_driver.api.apply_scheduler import ApplyScheduler
+from octavia_edgeadc_driver.api.cluster import ROLE_PRIMARY, ROLE_SECONDARY, cluster_role
+from octavia_edgeadc_driver.api.polling import AdaptivePoller
+from octavia_edgeadc_driver.api.snapshot import IPServicesSnapshot, parse_ip_services
+from octavia_edgeadc_driver.api.transaction import Transaction
 from octavia_edgeadc_driver.common import constants
 
 LOG = logging.getLogger(__name__)
 
 
 class EdgeADCClient:
-    """Synchronous REST API client for EdgeADC devices."""
+    """Synchronous REST API client for EdgeADC devices.
+
+    A client may be shared by threads. Creates identify the template or
+    placeholder they made by diffing the device's objects before and
+    after the create call, so VIP and member creates run in parallel;
+    changes to existing content servers are serialized per VIP.
+    """
 
     def __init__(
         self,
@@ -26,7 +40,13 @@ class EdgeADCClient:
         password: str,
         port: int = 443,
         timeout: float = 30.0,
-        verify_ssl: bool = False
+        verify_ssl: bool = False,
+        cache_ttl: float = 5.0,
+        apply_delay: float = 0.0,
+        poll_timeout: float = 5.0,
+        snapshot_path: str | None = None,
+        peers: list[str] | tuple[str, ...] = (),
+        peer_read_grace: float = 5.0
     ) -> None:
         self.host = host.strip()
         self.port = port
@@ -35,37 +55,104 @@ class EdgeADCClient:
         self.password = password
         self.timeout = timeout
         self.verify_ssl = verify_ssl
-        self._guid: str | None = None
+        # Guards the client's shared state below
+        self._lock = threading.Lock()
+        # Session GUID per cluster member; one HTTP client serves them all
+        self._guids: dict[str, str] = {}
+        self._login_lock = threading.RLock()
         self._client: httpx.Client | None = None
+        # Cluster members: this device first, then its peers. Writes go to
+        # a peer reporting itself primary, or else to this device; reads
+        # rotate over all reachable members except right after a write.
+        self.peers = [self.host] + [
+            p.strip() for p in peers if p.strip() and p.strip() != self.host]
+        self.peer_read_grace = peer_read_grace
+        self.roles: dict[str, str | None] = {}
+        self._write_host = self.host
+        self._read_hosts = list(self.peers)
+        self._read_index = 0
+        self._last_write = float("-inf")
+        self._roles_valid = len(self.peers) == 1
+        # Cached /GET/9 snapshot; see get_snapshot()
+        self.cache_ttl = cache_ttl
+        self._snapshot: IPServicesSnapshot | None = None
+        self._snapshot_time = 0.0
+        # Bumped on every cache change so a slow read cannot overwrite a newer view
+        self._snapshot_generation = 0
+        # Last snapshot saved to disk, served to reads until the device answers
+        self.snapshot_path = snapshot_path
+        self._warm_snapshot: IPServicesSnapshot | None = None
+        self._warm_loaded = False
+        self._revalidate_thread: threading.Thread | None = None
+        # Coalesce config applies when a debounce window is configured
+        self._apply_scheduler: ApplyScheduler | None = None
+        if apply_delay > 0:
+            self._apply_scheduler = ApplyScheduler(self.apply_config, apply_delay)
+        # deferred_apply() nesting, per thread
+        self._local = threading.local()
+        # Pollers learn how long this device takes to expose changes
+        self._template_poller = AdaptivePoller("VIP template", deadline=poll_timeout)
+        self._apply_poller = AdaptivePoller("VIP apply", deadline=poll_timeout)
+        self._placeholder_poller = AdaptivePoller("placeholder", deadline=poll_timeout)
+        # Blank templates held by a TemplatePool or a create in progress,
+        # keyed by (InterfaceID, ChannelID)
+        self._reserved_templates: set[tuple[str, str]] = set()
+        # Placeholders between their creation and fill-in, keyed by (ChannelKey, cId)
+        self._reserved_placeholders: set[tuple[str, int]] = set()
+        # Serializes changes to existing content servers per VIP, keyed by ChannelKey
+        self._vip_locks: dict[str, threading.Lock] = {}
+
+    @property
+    def _guid(self) -> str | None:
+        """Session GUID on this device."""
+        return self._guids.get(self.host)
+
+    @_guid.setter
+    def _guid(self, guid: str | None) -> None:
+        if guid:
+            self._guids[self.host] = guid
+        else:
+            self._guids.pop(self.host, None)
+
+    @property
+    def write_host(self) -> str:
+        """Cluster member that configuration changes are sent to."""
+        return self._write_host
 
     def _get_client(self) -> httpx.Client:
         """Get or create HTTP client."""
-        if self._client is None:
-            self._client = httpx.Client(
-                timeout=self.timeout,
-                verify=self.verify_ssl
-            )
-        return self._client
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(
+                    timeout=self.timeout,
+                    verify=self.verify_ssl
+                )
+            return self._client
 
     def close(self) -> None:
-        """Close the HTTP client."""
+        """Apply any pending changes and close the HTTP client."""
+        if self._apply_scheduler and self._client:
+            self._apply_scheduler.flush(timeout=self.timeout)
+        if self._snapshot is not None:
+            self.save_snapshot()
         if self._client:
             self._client.close()
             self._client = None
 
-    def login(self) -> str | None:
-        """Authenticate with the device and return GUID."""
-        url = f"{self.base_url}{constants.API_LOGIN}"
-        client = self._get_client()
+    def login(self, host: str | None = None) -> str | None:
+        """Authenticate with the device, or one of its peers, and return GUID.
 
-        # Base64 encoded password
-        password_b64 = base64.b64encode(self.password.encode()).decode()
-        auth_payload = f'{{"{self.username}":"{password_b64}"}}'
+        Logging in to the device also reads the cluster roles of the
+        device and its peers.
+        """
+        host = host or self.host
+        url = f"https://{host}:{self.port}{constants.API_LOGIN}"
+        client = self._get_client()
 
         try:
             r = client.post(
                 url,
-                content=auth_payload,
+                content=payloads.login(self.username, self.password),
                 headers={"Content-Type": "text/plain"}
             )
             data = r.json() if r.content else {}
@@ -75,44 +162,121 @@ class EdgeADCClient:
 
         guid = data.get("GUID")
         if guid:
-            self._guid = guid
-            client.cookies.set("GUID", guid)
-            LOG.info(f"EdgeADC login successful for {self.host}")
+            self._guids[host] = guid
+            LOG.info(f"EdgeADC login successful for {host}")
+            if host == self.host:
+                self.discover_cluster()
         else:
-            LOG.error(f"EdgeADC login failed for {self.host}: {data}")
+            LOG.error(f"EdgeADC login failed for {host}: {data}")
 
         return guid
 
-    def _ensure_login(self) -> None:
-        """Ensure we have a valid session."""
-        if not self._guid:
-            self.login()
-
-    def _get(self, path: str) -> tuple[int, Any]:
-        """Make a GET request."""
-        self._ensure_login()
+    def _ensure_login(self, host: str | None = None) -> None:
+        """Ensure we have a valid session, logging in once for all waiting threads."""
+        host = host or self.host
+        if host in self._guids:
+            return
+        with self._login_lock:
+            if host not in self._guids:
+                self.login(host)
+
+    def discover_cluster(self) -> dict[str, str | None]:
+        """Read the cluster role of the device and its peers.
+
+        Writes only move to another member when that peer positively
+        reports itself primary; otherwise they stay on the configured
+        device, whatever role it reports.
+        """
+        roles: dict[str, str | None] = {}
+        reachable = []
+        for host in self.peers:
+            code, js = self._request("GET", host, constants.API_CLUSTER_STATUS)
+            roles[host] = cluster_role(js) if code == 200 else None
+            if code != 500:
+                reachable.append(host)
+
+        write_host = next((h for h in reachable if roles[h] == ROLE_PRIMARY), self.host)
+        if (write_host == self.host and roles[self.host] == ROLE_SECONDARY
+                and self.roles.get(self.host) != ROLE_SECONDARY):
+            LOG.warning(f"EdgeADC {self.host}: Device reports a secondary cluster role and no peer "
+                        f"reports itself primary; configuration changes are still sent to it")
+        if write_host != self._write_host:
+            LOG.info(f"EdgeADC {self.host}: Sending configuration changes to {write_host}")
+        self.roles = roles
+        self._write_host = write_host
+        self._read_hosts = reachable or [self.host]
+        self._roles_valid = True
+        return roles
+
+    def _read_host(self) -> str:
+        """Pick the cluster member to read from."""
+        primary = self._write_host
+        if len(self._read_hosts) == 1 or time.monotonic() - self._last_write < self.peer_read_grace:
+            # Peers may not have synced a recent write yet
+            return primary
+        self._read_index = (self._read_index + 1) % len(self._read_hosts)
+        return self._read_hosts[self._read_index]
+
+    def _request(
+        self,
+        method: str,
+        host: str,
+        path: str,
+        payload: dict[str, Any] | None = None
+    ) -> tuple[int, Any]:
+        """Send one request to a cluster member."""
+        self._ensure_login(host)
         client = self._get_client()
-        url = f"{self.base_url}{path}"
+        url = f"https://{host}:{self.port}{path}"
+        guid = self._guids.get(host)
+        headers = {"Cookie": f"GUID={guid}"} if guid else None
         try:
-            r = client.get(url)
+            if method == "GET":
+                r = client.get(url, headers=headers)
+            else:
+                r = client.post(url, json=payload, headers=headers)
             js = r.json() if r.content else None
         except Exception as e:
-            LOG.warning(f"GET {path} failed: {e}")
+            LOG.warning(f"{method} {path} on {host} failed: {e}")
+            if len(self.peers) > 1:
+                # A member may have failed over; read the roles again
+                self._roles_valid = False
             return 500, None
         return r.status_code, js
 
+    def _get(self, path: str) -> tuple[int, Any]:
+        """Make a GET request, to any reachable cluster member."""
+        self._ensure_login()
+        if not self._roles_valid:
+            self.discover_cluster()
+        host = self._read_host()
+        code, js = self._request("GET", host, path)
+        primary = self._write_host
+        if code != 200 and host != primary:
+            code, js = self._request("GET", primary, path)
+        return code, js
+
     def _post(self, path: str, payload: dict[str, Any]) -> tuple[int, Any]:
-        """Make a POST request."""
+        """Make a POST request, to the cluster member owning the configuration.
+
+        IP-services changes (/POST/9) drop the cached snapshot; when the
+        response carries the updated dataset it becomes the new snapshot,
+        so no follow-up GET is needed to see the change. The response is
+        dropped if a newer snapshot or change came in while it was sent.
+        """
         self._ensure_login()
-        client = self._get_client()
-        url = f"{self.base_url}{path}"
-        try:
-            r = client.post(url, json=payload)
-            js = r.json() if r.content else None
-        except Exception as e:
-            LOG.warning(f"POST {path} failed: {e}")
-            return 500, None
-        return r.status_code, js
+        if not self._roles_valid:
+            self.discover_cluster()
+        host = self._write_host
+        updates_services = path.startswith(constants.API_IP_SERVICES_UPDATE)
+        generation = self.invalidate_cache() if updates_services else None
+        self._last_write = time.monotonic()
+        code, js = self._request("POST", host, path, payload)
+        if updates_services and code == 200:
+            snapshot = IPServicesSnapshot.from_response(js)
+            if snapshot is not None:
+                self._store_snapshot(snapshot, generation)
+        return code, js
 
     def get_system_info(self) -> dict[str, Any]:
         """Get system information."""
@@ -121,133 +285,289 @@ class EdgeADCClient:
             return js
         return {}
 
-    def get_ip_services(self) -> list[dict[str, Any]]:
-        """Get all IP services (VIPs)."""
+    def invalidate_cache(self) -> int:
+        """Drop the cached IP-services snapshot; returns the new cache generation."""
+        with self._lock:
+            self._snapshot = None
+            self._snapshot_time = 0.0
+            self._snapshot_generation += 1
+            return self._snapshot_generation
+
+    def get_snapshot(self, max_age: float | None = None, allow_warm: bool = False) -> IPServicesSnapshot:
+        """Get the indexed IP-services snapshot.
+
+        The parsed /GET/9 dataset is cached for ``cache_ttl`` seconds. Pass
+        ``max_age`` to bound the staleness of the result for this call;
+        ``max_age=0`` always fetches from the device. Read-only callers may
+        pass ``allow_warm`` to accept the snapshot saved by a previous run
+        while :meth:`warm_start` is still revalidating it.
+        """
+        with self._lock:
+            cached, fetched, generation = self._snapshot, self._snapshot_time, self._snapshot_generation
+        if allow_warm and cached is None:
+            warm = self._load_warm_snapshot()
+            if warm is not None:
+                return warm
+        if max_age is None:
+            max_age = self.cache_ttl
+        if cached is not None and time.monotonic() - fetched < max_age:
+            return cached
+
         code, js = self._get(f"{constants.API_IP_SERVICES}?isPageLoad=true")
-        if code != 200 or not isinstance(js, dict):
-            return []
+        snapshot = IPServicesSnapshot.from_response(js) if code == 200 else None
+        if snapshot is None:
+            return IPServicesSnapshot([])
+
+        self._store_snapshot(snapshot, generation)
+        return snapshot
+
+    def _store_snapshot(self, snapshot: IPServicesSnapshot, generation: int | None = None) -> bool:
+        """Make ``snapshot`` the cached view of the device configuration.
+
+        With ``generation`` the snapshot is only stored if the cache has
+        not changed since that generation was read.
+        """
+        with self._lock:
+            if generation is not None and generation != self._snapshot_generation:
+                return False
+            self._snapshot = snapshot
+            self._snapshot_time = time.monotonic()
+            self._snapshot_generation += 1
+            self._warm_snapshot = None
+            self._warm_loaded = True
+        return True
+
+    def warm_start(self) -> None:
+        """Revalidate the saved snapshot against the device in the background.
+
+        Until the device answers, reads with ``allow_warm`` are served from
+        the file written by the previous run; it is only parsed if such a
+        read happens first.
+        """
+        if not self.snapshot_path or self._revalidate_thread is not None:
+            return
+        self._revalidate_thread = threading.Thread(
+            target=self._revalidate, name=f"edgeadc-warm-{self.host}", daemon=True
+        )
+        self._revalidate_thread.start()
+
+    def _revalidate(self) -> None:
+        try:
+            self.get_snapshot(max_age=0)
+            if self._snapshot is not None:
+                self.save_snapshot()
+        except Exception as e:
+            LOG.warning(f"EdgeADC {self.host}: Snapshot revalidation failed: {e}")
+
+    def _load_warm_snapshot(self) -> IPServicesSnapshot | None:
+        """Load the saved snapshot on first use."""
+        if not self._warm_loaded and self.snapshot_path:
+            self._warm_loaded = True
+            self._warm_snapshot = IPServicesSnapshot.load(self.snapshot_path)
+            if self._warm_snapshot is not None:
+                LOG.info(f"EdgeADC {self.host}: Serving {len(self._warm_snapshot.vips)} VIP(s) "
+                         f"from saved snapshot until the device answers")
+        return self._warm_snapshot
+
+    def save_snapshot(self) -> bool:
+        """Save the current snapshot for the next start; returns success."""
+        if not self.snapshot_path or self._snapshot is None:
+            return False
+        try:
+            self._snapshot.save(self.snapshot_path)
+        except OSError as e:
+            LOG.warning(f"EdgeADC {self.host}: Cannot save snapshot to {self.snapshot_path}: {e}")
+            return False
+        return True
 
-        # Parse the nested structure: data.dataset.ipService[interface_list][vip]
-        result = []
-        data = js.get('data', {})
-        if isinstance(data, dict):
-            dataset = data.get('dataset', {})
-            if isinstance(dataset, dict):
-                ip_services = dataset.get('ipService', [])
-                for interface_list in ip_services:
-                    if isinstance(interface_list, list):
-                        result.extend(interface_list)
-                    elif isinstance(interface_list, dict):
-                        result.append(interface_list)
-        return result
-
-    def _find_empty_template(self, max_retries: int = 5) -> dict[str, Any] | None:
-        """Find an empty VIP template (ipAddr is empty) with retry logic."""
-        for attempt in range(max_retries):
-            vips = self.get_ip_services()
-            for vip in vips:
-                if not vip.get("ipAddr"):
+    def get_ip_services(self, max_age: float | None = None) -> list[dict[str, Any]]:
+        """Get all IP services (VIPs)."""
+        return list(self.get_snapshot(max_age=max_age, allow_warm=max_age is None).vips)
+
+    def get_vip_counters(self, path: str | None = None) -> list[dict[str, Any]]:
+        """Get VIP dicts carrying traffic counters.
+
+        ``path`` names the statistics endpoint; its response is expected in
+        the ipService layout. Without it the IP-services dataset is used.
+        """
+        if not path:
+            return list(self.get_snapshot(max_age=0).vips)
+        code, js = self._get(path)
+        vips = parse_ip_services(js) if code == 200 else None
+        return vips or []
+
+    def _claim_template(
+        self,
+        before: set[tuple[str, str]],
+        snapshot: IPServicesSnapshot | None
+    ) -> dict[str, Any] | None:
+        """Reserve a blank VIP template that appeared since ``before``.
+
+        Any new unreserved template will do: blank templates are
+        interchangeable, and reserving under the lock keeps two creates
+        from taking the same one.
+        """
+        if snapshot is None:
+            return None
+        with self._lock:
+            for vip in snapshot.blank_vips:
+                channel = IPServicesSnapshot.channel_of(vip)
+                if channel not in before and channel not in self._reserved_templates:
+                    self._reserved_templates.add(channel)
                     return vip
-            if attempt < max_retries - 1:
-                time.sleep(0.5)  # Wait before retry
         return None
 
+    def _vip_lock(self, vip: dict[str, Any]) -> threading.Lock:
+        """Get the lock serializing content-server changes on a VIP."""
+        key = IPServicesSnapshot.key_of(vip)
+        with self._lock:
+            lock = self._vip_locks.get(key)
+            if lock is None:
+                lock = self._vip_locks[key] = threading.Lock()
+            return lock
+
+    def create_vip_template(self, reserve: bool = False) -> dict[str, Any] | None:
+        """Create a blank VIP template (step 1 of a VIP create) and return it.
+
+        With ``reserve`` the template is held for a later
+        ``create_virtual_service(template=...)`` and is never picked up by
+        other creates in the meantime.
+        """
+        before = set(self.get_snapshot(max_age=0).by_channel)
+        code, resp = self._post(constants.API_VIP_CREATE_TEMPLATE, payloads.vip_template())
+        if code != 200:
+            LOG.error(f"EdgeADC {self.host}: Failed to create VIP template")
+            return None
+
+        # The create response normally carries the template; poll the
+        # device only if it does not.
+        template = self._claim_template(before, IPServicesSnapshot.from_response(resp))
+        if not template:
+            template = self._find_new_template(before)
+        if not template:
+            LOG.error(f"EdgeADC {self.host}: Could not find VIP template")
+            return None
+        if not reserve:
+            self.release_template(template)
+        return template
+
+    def reserve_template(self, template: dict[str, Any]) -> None:
+        """Hold ``template`` again, e.g. after a create failed to fill it in."""
+        with self._lock:
+            self._reserved_templates.add(IPServicesSnapshot.channel_of(template))
+
+    def release_template(self, template: dict[str, Any]) -> None:
+        """Stop holding a reserved template."""
+        with self._lock:
+            self._reserved_templates.discard(IPServicesSnapshot.channel_of(template))
+
+    def is_reserved_template(self, template: dict[str, Any]) -> bool:
+        """Whether a TemplatePool or a create in progress is holding ``template``."""
+        with self._lock:
+            return IPServicesSnapshot.channel_of(template) in self._reserved_templates
+
+    def delete_vip_template(self, template: dict[str, Any], wait_apply: bool = True) -> bool:
+        """Delete a blank VIP template."""
+        self.release_template(template)
+        code, _ = self._post(constants.API_VIP_DELETE, payloads.vip_ref(template))
+        success = code == 200
+        if success:
+            self._request_apply(wait_apply)
+        return success
+
+    def _find_new_template(self, before: set[tuple[str, str]]) -> dict[str, Any] | None:
+        """Poll the device for a blank VIP template that appeared since ``before``."""
+        return self._template_poller.wait(
+            lambda: self._claim_template(before, self.get_snapshot(max_age=0))
+        )
+
     def create_virtual_service(
         self,
         ip_addr: str,
         port: int,
         protocol: str = "HTTP",
         subnet_mask: str = "255.255.255.0",
-        service_name: str = ""
+        service_name: str = "",
+        wait_apply: bool = True,
+        template: dict[str, Any] | None = None
     ) -> tuple[bool, dict[str, Any] | None]:
         """Create a new Virtual IP Service (VIP) using Terraform two-step approach.
 
         EdgeADC requires a two-step process:
         1. Create a blank template VIP
         2. Update the template with actual values
-        """
-        # Map Octavia protocol to EdgeADC
-        edgeadc_protocol = constants.PROTOCOL_MAP.get(protocol, "TCP")
-
-        # Step 1: Create blank template
-        template_payload = {
-            "editedInterface": "",
-            "editedChannel": "",
-            "CopyVIP": "0",
-            "ipAddr": "",
-            "localPortEnabledChecked": "",
-            "port": "",
-            "primaryChecked": "",
-            "serviceName": "",
-            "serviceType": "",
-            "subnetMask": ""
-        }
-        code1, _ = self._post(constants.API_VIP_CREATE_TEMPLATE, template_payload)
-        if code1 != 200:
-            LOG.error(f"EdgeADC {self.host}: Failed to create VIP template")
-            return False, {"error": "Failed to create template"}
-
-        time.sleep(0.5)
 
-        # Step 2: Find the template and update it (with retry)
-        template = self._find_empty_template()
-        if not template:
-            LOG.error(f"EdgeADC {self.host}: Could not find VIP template")
-            return False, {"error": "Could not find template"}
-
-        interface_id = template.get("InterfaceID", "0")
-        channel_id = template.get("ChannelID", "0")
-
-        update_payload = {
-            "editedInterface": str(interface_id),
-            "editedChannel": str(channel_id),
-            "CopyVIP": "0",
-            "ipAddr": ip_addr,
-            "localPortEnabledChecked": "true",
-            "port": str(port),
-            "primaryChecked": "Active",
-            "serviceName": service_name or f"octavia-{ip_addr}:{port}",
-            "serviceType": edgeadc_protocol,
-            "subnetMask": subnet_mask
-        }
-
-        code2, js = self._post(constants.API_VIP_UPDATE_TEMPLATE, update_payload)
+        Pass a template from ``create_vip_template(reserve=True)`` to skip
+        the first step.
+        """
+        # Step 1: Create a blank template, unless a reserved one was given.
+        # The template stays reserved until it is filled in.
+        if template is None:
+            template = self.create_vip_template(reserve=True)
+            if not template:
+                return False, {"error": "Failed to create template"}
+
+        # Step 2: Update the template with the actual values
+        update_payload = payloads.vip_update(template, ip_addr, port, protocol, subnet_mask, service_name)
+        try:
+            code2, js = self._post(constants.API_VIP_UPDATE_TEMPLATE, update_payload)
+        finally:
+            self.release_template(template)
         success = code2 == 200
 
         if success:
-            self.apply_config()
-            time.sleep(0.3)
+            self._request_apply(wait_apply)
+            if wait_apply and not self._apply_deferred:
+                self._wait_for_vip(ip_addr, port)
 
         LOG.info(f"EdgeADC {self.host}: Create VIP {ip_addr}:{port} - {'OK' if success else 'FAILED'}")
         return success, js
 
-    def delete_virtual_service(self, ip_addr: str, port: int) -> bool:
+    def _wait_for_vip(self, ip_addr: str, port: int) -> dict[str, Any] | None:
+        """Poll until an applied VIP is visible on the device.
+
+        The /POST/9 response of the create normally refreshed the cached
+        snapshot already; full reads are only made when it did not, and
+        at most VIP_POLL_MAX_FETCHES of them.
+        """
+        vip = self.get_snapshot().find_vip(ip_addr, port)
+        if vip is not None:
+            return vip
+        vip = self._apply_poller.wait(
+            lambda: self.get_snapshot(max_age=0).find_vip(ip_addr, port),
+            max_checks=constants.VIP_POLL_MAX_FETCHES
+        )
+        if vip is None:
+            LOG.warning(f"EdgeADC {self.host}: VIP {ip_addr}:{port} not visible after apply")
+        return vip
+
+    def delete_virtual_service(self, ip_addr: str, port: int, wait_apply: bool = True) -> bool:
         """Delete a Virtual IP Service."""
-        vip_info = self._get_vip_info(ip_addr, port)
+        vip_info = self._get_vip_info(ip_addr, port, max_age=0)
         if not vip_info:
             LOG.warning(f"VIP {ip_addr}:{port} not found for deletion")
             return False
 
-        payload = {
-            "editedInterface": str(vip_info.get("InterfaceID", "0")),
-            "editedChannel": str(vip_info.get("ChannelID", "0"))
-        }
-        code, _ = self._post(constants.API_VIP_DELETE, payload)
+        with self._vip_lock(vip_info):
+            code, _ = self._post(constants.API_VIP_DELETE, payloads.vip_ref(vip_info))
         success = code == 200
 
         if success:
-            self.apply_config()
+            with self._lock:
+                self._vip_locks.pop(IPServicesSnapshot.key_of(vip_info), None)
+            self._request_apply(wait_apply)
 
         LOG.info(f"EdgeADC {self.host}: Delete VIP {ip_addr}:{port} - {'OK' if success else 'FAILED'}")
         return success
 
-    def _get_vip_info(self, vip_ip: str, vip_port: int) -> dict[str, Any] | None:
+    def _get_vip_info(
+        self,
+        vip_ip: str,
+        vip_port: int,
+        max_age: float | None = None
+    ) -> dict[str, Any] | None:
         """Get VIP info including InterfaceID and ChannelID."""
-        vips = self.get_ip_services()
-        for vip in vips:
-            if vip.get("ipAddr") == vip_ip and str(vip.get("port")) == str(vip_port):
-                return vip
-        return None
+        return self.get_snapshot(max_age=max_age).find_vip(vip_ip, vip_port)
 
     def add_member(
         self,
@@ -255,184 +575,294 @@ class EdgeADCClient:
         vip_port: int,
         member_ip: str,
         member_port: int,
-        weight: int = 100
+        weight: int = 100,
+        wait_apply: bool = True
     ) -> tuple[bool, dict[str, Any] | None]:
         """Add a member (content server) to a VIP."""
-        vip_info = self._get_vip_info(vip_ip, vip_port)
+        snapshot = self.get_snapshot(max_age=0)
+        vip_info = snapshot.find_vip(vip_ip, vip_port)
         if not vip_info:
             LOG.warning(f"VIP {vip_ip}:{vip_port} not found")
             return False, {"error": "VIP not found"}
 
-        interface_id = vip_info.get("InterfaceID", "0")
-        channel_id = vip_info.get("ChannelID", "0")
-        channel_key = vip_info.get("ChannelKey", "")
+        channel_key = str(vip_info.get("ChannelKey", ""))
+        before = set(snapshot.placeholder_cids(channel_key))
 
         # Step 1: Create placeholder
-        init_payload = {
-            "editedInterface": str(interface_id),
-            "editedChannel": str(channel_id)
-        }
-        code1, resp1 = self._post(constants.API_SERVER_ADD_INIT, init_payload)
+        code1, resp1 = self._post(constants.API_SERVER_ADD_INIT, payloads.vip_ref(vip_info))
         if code1 != 200:
             return False, {"error": "Failed to create placeholder"}
 
-        # Find new placeholder cId
-        new_cid = self._find_placeholder_cid(resp1, channel_key)
-        if new_cid == 0:
+        # Find the new placeholder by its cId missing from ``before``
+        new_cids = self._claim_placeholders(channel_key, before, IPServicesSnapshot.from_response(resp1), 1)
+        if not new_cids:
+            new_cids = self._find_new_placeholders(channel_key, before, 1)
+        if not new_cids:
             LOG.warning(f"Could not find placeholder cId for VIP {vip_ip}:{vip_port}")
             return False, {"error": "Could not find placeholder"}
 
         # Step 2: Update placeholder with actual server details
-        add_payload = {
-            "editedInterface": str(interface_id),
-            "editedChannel": str(channel_id),
-            "cId": str(new_cid),
-            "statusReason": "Finding status",
-            "imagePath": "images/jnpsStateGrey.gif",
-            "CSActivity": "1",
-            "CSIPAddr": member_ip,
-            "CSPort": str(member_port),
-            "CSNotes": "",
-            "WeightFactor": str(weight),
-            "CSMonitorEndPoint": "self",
-            "contentServerGroupName": "Server Group",
-            "ServerId": ""
-        }
-
-        code2, js = self._post(constants.API_SERVER_ADD_UPDATE, add_payload)
+        add_payload = payloads.server_add(vip_info, new_cids[0], member_ip, member_port, weight)
+        try:
+            code2, js = self._post(constants.API_SERVER_ADD_UPDATE, add_payload)
+        finally:
+            self._release_placeholders(channel_key, new_cids)
         success = code2 == 200
 
         if success:
-            self.apply_config()
+            self._request_apply(wait_apply)
 
         LOG.info(f"EdgeADC {self.host}: Add member {member_ip}:{member_port} to VIP - {'OK' if success else 'FAILED'}")
         return success, js
 
-    def _find_placeholder_cid(self, response: dict, channel_key: str) -> int:
-        """Find the cId of a newly created placeholder server."""
-        if not response:
-            return 0
-
-        ip_services = response.get("data", {}).get("dataset", {}).get("ipService", [])
-        max_cid = 0
-
-        for interface_list in ip_services:
-            if not isinstance(interface_list, list):
-                continue
-            for vip in interface_list:
-                if not isinstance(vip, dict):
-                    continue
-                if vip.get("ChannelKey") == channel_key:
-                    content_servers = vip.get("contentServer", {})
-                    servers = content_servers.get("CServerId", []) if isinstance(content_servers, dict) else []
-                    if isinstance(servers, dict):
-                        servers = [servers]
-                    for server in servers:
-                        if isinstance(server, dict) and not server.get("CSIPAddr"):
-                            cid = int(server.get("cId", 0))
-                            if cid > max_cid:
-                                max_cid = cid
-        return max_cid
+    def add_members(
+        self,
+        vip_ip: str,
+        vip_port: int,
+        members: list[dict[str, Any]],
+        wait_apply: bool = True
+    ) -> tuple[bool, list[dict[str, Any]]]:
+        """Add many members to a VIP with a single config apply.
+
+        ``members`` are dicts with ``ip_address``, ``port`` and optional
+        ``weight``. All placeholders are created first and matched to
+        their cIds by diffing the last response against the placeholders
+        seen before, then filled in; any left blank are deleted. Returns
+        overall success and a per-member result list.
+        """
+        results = [{"ip_address": m["ip_address"], "port": int(m["port"]), "cId": None,
+                    "success": False} for m in members]
+        snapshot = self.get_snapshot(max_age=0)
+        vip_info = snapshot.find_vip(vip_ip, vip_port)
+        if not vip_info:
+            LOG.warning(f"VIP {vip_ip}:{vip_port} not found")
+            return False, results
+        if not members:
+            return True, results
+
+        channel_key = str(vip_info.get("ChannelKey", ""))
+        before = set(snapshot.placeholder_cids(channel_key))
+
+        # Step 1: Create all placeholders
+        response = None
+        created = attempted = 0
+        for _ in members:
+            attempted += 1
+            code, response = self._post(constants.API_SERVER_ADD_INIT, payloads.vip_ref(vip_info))
+            if code != 200:
+                break
+            created += 1
+        new_cids = self._claim_placeholders(
+            channel_key, before, IPServicesSnapshot.from_response(response), created)
+        if len(new_cids) < created:
+            new_cids += self._find_new_placeholders(channel_key, before, created - len(new_cids))
+
+        # Step 2: Fill them in
+        changed = False
+        for result, member, cid in zip(results, members, new_cids):
+            payload = payloads.server_add(vip_info, cid, member["ip_address"], member["port"],
+                                          member.get("weight", 100))
+            code, _ = self._post(constants.API_SERVER_ADD_UPDATE, payload)
+            result["cId"] = str(cid)
+            result["success"] = code == 200
+            changed = changed or result["success"]
+
+        # Remove every placeholder this call created but did not fill: those
+        # left blank by failed updates, those that could not be matched to a
+        # cId in time, and one a failed create may still have added
+        unfilled = [cid for result, cid in zip(results, new_cids) if not result["success"]]
+        if len(new_cids) < attempted:
+            strays = self._claim_placeholders(
+                channel_key, before, self.get_snapshot(max_age=0), attempted - len(new_cids))
+            unfilled += strays
+            new_cids += strays
+        for cid in unfilled:
+            code, _ = self._post(constants.API_SERVER_DELETE, payloads.server_ref(vip_info, cid))
+            changed = changed or code == 200
+        self._release_placeholders(channel_key, new_cids)
+
+        if changed:
+            self._request_apply(wait_apply)
+
+        added = sum(1 for r in results if r["success"])
+        LOG.info(f"EdgeADC {self.host}: Add {added}/{len(members)} members to VIP {vip_ip}:{vip_port}")
+        return added == len(members), results
+
+    def _claim_placeholders(
+        self,
+        channel_key: str,
+        before: set[int],
+        snapshot: IPServicesSnapshot | None,
+        count: int
+    ) -> list[int]:
+        """Reserve up to ``count`` blank placeholders of a VIP that appeared since ``before``."""
+        claimed: list[int] = []
+        if snapshot is None:
+            return claimed
+        with self._lock:
+            for cid in snapshot.placeholder_cids(channel_key):
+                if len(claimed) == count:
+                    break
+                if cid not in before and (channel_key, cid) not in self._reserved_placeholders:
+                    self._reserved_placeholders.add((channel_key, cid))
+                    claimed.append(cid)
+        return claimed
+
+    def _find_new_placeholders(self, channel_key: str, before: set[int], count: int) -> list[int]:
+        """Poll the device for ``count`` blank placeholders that appeared since ``before``."""
+        claimed: list[int] = []
+
+        def check() -> bool | None:
+            snapshot = self.get_snapshot(max_age=0)
+            claimed.extend(self._claim_placeholders(channel_key, before, snapshot, count - len(claimed)))
+            return True if len(claimed) == count else None
+
+        self._placeholder_poller.wait(check)
+        return claimed
+
+    def _release_placeholders(self, channel_key: str, cids: list[int]) -> None:
+        """Stop holding placeholders once they are filled in or given up."""
+        with self._lock:
+            self._reserved_placeholders.difference_update((channel_key, cid) for cid in cids)
+
+    def is_reserved_placeholder(self, channel_key: str, cid: int) -> bool:
+        """Whether a member add in progress is holding a placeholder."""
+        with self._lock:
+            return (str(channel_key), int(cid)) in self._reserved_placeholders
+
+    def delete_placeholder(self, vip: dict[str, Any], cid: int, wait_apply: bool = True) -> bool:
+        """Delete a blank content-server placeholder from a VIP."""
+        with self._vip_lock(vip):
+            code, _ = self._post(constants.API_SERVER_DELETE, payloads.server_ref(vip, cid))
+        success = code == 200
+        if success:
+            self._request_apply(wait_apply)
+        return success
 
     def delete_member(
         self,
         vip_ip: str,
         vip_port: int,
         member_ip: str,
-        member_port: int
+        member_port: int,
+        wait_apply: bool = True
     ) -> bool:
         """Delete a member from a VIP."""
-        vip_info = self._get_vip_info(vip_ip, vip_port)
+        vip_info = self.get_snapshot().find_vip(vip_ip, vip_port)
         if not vip_info:
             return False
 
-        # Find the server's cId
-        content_servers = vip_info.get("contentServer", {})
-        servers = content_servers.get("CServerId", []) if isinstance(content_servers, dict) else []
-        if isinstance(servers, dict):
-            servers = [servers]
-
-        for server in servers:
-            if isinstance(server, dict):
-                if server.get("CSIPAddr") == member_ip and str(server.get("CSPort")) == str(member_port):
-                    payload = {
-                        "editedInterface": str(vip_info.get("InterfaceID", "0")),
-                        "editedChannel": str(vip_info.get("ChannelID", "0")),
-                        "cId": str(server.get("cId", "0"))
-                    }
-                    code, _ = self._post(constants.API_SERVER_DELETE, payload)
-                    success = code == 200
-                    if success:
-                        self.apply_config()
-                    LOG.info(f"EdgeADC {self.host}: Delete member {member_ip}:{member_port} - {'OK' if success else 'FAILED'}")
-                    return success
-
-        LOG.warning(f"Member {member_ip}:{member_port} not found in VIP {vip_ip}:{vip_port}")
-        return False
+        with self._vip_lock(vip_info):
+            # Take the IDs to change from the device, not the cache
+            snapshot = self.get_snapshot(max_age=0)
+            vip_info = snapshot.find_vip(vip_ip, vip_port)
+            server = snapshot.find_server(vip_ip, vip_port, member_ip, member_port)
+            if not vip_info or not server:
+                LOG.warning(f"Member {member_ip}:{member_port} not found in VIP {vip_ip}:{vip_port}")
+                return False
+
+            payload = payloads.server_ref(vip_info, server.get("cId", "0"))
+            code, _ = self._post(constants.API_SERVER_DELETE, payload)
+        success = code == 200
+        if success:
+            self._request_apply(wait_apply)
+        LOG.info(f"EdgeADC {self.host}: Delete member {member_ip}:{member_port} - {'OK' if success else 'FAILED'}")
+        return success
 
-    def get_members(self, vip_ip: str, vip_port: int) -> list[dict[str, Any]]:
+    def get_members(
+        self,
+        vip_ip: str,
+        vip_port: int,
+        max_age: float | None = None
+    ) -> list[dict[str, Any]]:
         """Get all members for a VIP."""
-        vip_info = self._get_vip_info(vip_ip, vip_port)
+        vip_info = self.get_snapshot(max_age=max_age, allow_warm=max_age is None).find_vip(vip_ip, vip_port)
         if not vip_info:
             return []
 
-        content_servers = vip_info.get("contentServer", {})
-        servers = content_servers.get("CServerId", []) if isinstance(content_servers, dict) else []
-        if isinstance(servers, dict):
-            servers = [servers]
-
-        result = []
-        for server in servers:
-            if isinstance(server, dict) and server.get("CSIPAddr"):
-                result.append({
-                    "ip_address": server.get("CSIPAddr"),
-                    "port": int(server.get("CSPort", 0)),
-                    "weight": int(server.get("WeightFactor", 100)),
-                    "cId": server.get("cId"),
-                    "status": server.get("statusReason", "unknown")
-                })
-        return result
+        return payloads.members(vip_info)
 
     def apply_config(self) -> bool:
         """Apply pending configuration changes."""
         code, _ = self._post(constants.API_APPLY_CONFIG, {"apply": "1"})
         return code == 200
 
+    def _request_apply(self, wait: bool = True) -> bool:
+        """Apply a change now, or through the coalescing scheduler.
+
+        With ``wait`` the call returns once the apply covering the change
+        has completed; otherwise it returns as soon as one is scheduled.
+        """
+        if self._apply_deferred:
+            return True
+        if self._apply_scheduler is None:
+            return self.apply_config()
+        ticket = self._apply_scheduler.request()
+        if not wait:
+            return True
+        return self._apply_scheduler.wait(ticket, timeout=self.timeout)
+
+    @property
+    def _apply_deferred(self) -> int:
+        """Nesting depth of deferred_apply() in the calling thread."""
+        return getattr(self._local, "deferred", 0)
+
+    @contextlib.contextmanager
+    def deferred_apply(self) -> Iterator[None]:
+        """Suppress per-mutation applies made by the calling thread.
+
+        The caller applies afterwards. Other threads keep applying their
+        own changes.
+        """
+        self._local.deferred = self._apply_deferred + 1
+        try:
+            yield
+        finally:
+            self._local.deferred -= 1
+
+    def transaction(self, rollback: bool = True) -> Transaction:
+        """Start a batch of mutations committed by a single config apply.
+
+        See :mod:`octavia_edgeadc_driver.api.transaction`.
+        """
+        return Transaction(self, rollback=rollback)
+
+    def wait_for_apply(self, timeout: float | None = None) -> bool:
+        """Wait until every change made so far has been applied."""
+        if self._apply_scheduler is None:
+            return True
+        return self._apply_scheduler.wait(timeout=timeout)
+
+    def flush_apply(self, timeout: float | None = None) -> bool:
+        """Apply pending changes without waiting for the debounce window."""
+        if self._apply_scheduler is None:
+            return True
+        return self._apply_scheduler.flush(timeout=timeout)
+
     def update_member_weight(
         self,
         vip_ip: str,
         vip_port: int,
         member_ip: str,
         member_port: int,
-        weight: int
+        weight: int,
+        wait_apply: bool = True
     ) -> bool:
         """Update a member's weight."""
-        vip_info = self._get_vip_info(vip_ip, vip_port)
+        vip_info = self.get_snapshot().find_vip(vip_ip, vip_port)
         if not vip_info:
             return False
 
-        content_servers = vip_info.get("contentServer", {})
-        servers = content_servers.get("CServerId", []) if isinstance(content_servers, dict) else []
-        if isinstance(servers, dict):
-            servers = [servers]
-
-        for server in servers:
-            if isinstance(server, dict):
-                if server.get("CSIPAddr") == member_ip and str(server.get("CSPort")) == str(member_port):
-                    payload = {
-                        "editedInterface": str(vip_info.get("InterfaceID", "0")),
-                        "editedChannel": str(vip_info.get("ChannelID", "0")),
-                        "cId": str(server.get("cId", "0")),
-                        "CSActivity": "1",
-                        "CSIPAddr": member_ip,
-                        "CSPort": str(member_port),
-                        "WeightFactor": str(weight),
-                        "CSMonitorEndPoint": "self",
-                    }
-                    code, _ = self._post(constants.API_SERVER_ADD_UPDATE, payload)
-                    if code == 200:
-                        self.apply_config()
-                        return True
-                    return False
-
+        with self._vip_lock(vip_info):
+            # Take the IDs to change from the device, not the cache
+            snapshot = self.get_snapshot(max_age=0)
+            vip_info = snapshot.find_vip(vip_ip, vip_port)
+            server = snapshot.find_server(vip_ip, vip_port, member_ip, member_port)
+            if not vip_info or not server:
+                return False
+            payload = payloads.server_weight(vip_info, server.get("cId", "0"), member_ip, member_port, weight)
+            code, _ = self._post(constants.API_SERVER_ADD_UPDATE, payload)
+        if code == 200:
+            self._request_apply(wait_apply)
+            return True
         return False
@@ -0,0 +1,134 @@
+"""
+Background removal of orphaned blank objects on one EdgeADC device.
+
+VIP creates and member adds are two-step operations: a blank VIP template
+(empty ipAddr) or a blank content-server placeholder (empty CSIPAddr) is
+created first and filled in afterwards. When the second step fails, the
+blank object stays on the device. The reaper finds blank objects that have
+stayed blank for longer than a grace period and deletes them in batches,
+each committed by a single apply.
+
+The device does not report when an object was created, so an object's
+age is counted from the first reaper pass that saw it blank. Templates
+and placeholders the same client is holding are never touched.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable
+
+from octavia_edgeadc_driver.api.snapshot import IPServicesSnapshot
+
+if TYPE_CHECKING:
+    from octavia_edgeadc_driver.api.edgeadc_client import EdgeADCClient
+
+LOG = logging.getLogger(__name__)
+
+# Orphan keys: ("vip", InterfaceID, ChannelID) or ("server", ChannelKey, cId)
+_OrphanKey = tuple[str, str, str]
+
+
+class OrphanReaper:
+    """Deletes blank VIP templates and placeholders left behind on a device."""
+
+    def __init__(
+        self,
+        client: EdgeADCClient,
+        grace_period: float = 600.0,
+        interval: float = 300.0,
+        batch_size: int = 50,
+        clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.client = client
+        self.grace_period = grace_period
+        self.interval = interval
+        self.batch_size = batch_size
+        self._clock = clock
+        self._first_seen: dict[_OrphanKey, float] = {}
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.reaped_templates = 0
+        self.reaped_placeholders = 0
+
+    def start(self) -> None:
+        """Start reaping in the background."""
+        if self._thread is not None or self.interval <= 0:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name=f"edgeadc-reaper-{self.client.host}", daemon=True
+        )
+        self._thread.start()
+
+    def close(self) -> None:
+        """Stop the background thread."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.client.timeout)
+            self._thread = None
+
+    def reap_once(self) -> int:
+        """Delete orphans older than the grace period; returns how many were deleted."""
+        snapshot = self.client.get_snapshot(max_age=0)
+        orphans = self._orphans(snapshot)
+        now = self._clock()
+        # Forget objects that were filled in or removed since the last pass
+        self._first_seen = {key: self._first_seen.get(key, now) for key in orphans}
+        expired = [
+            key for key in orphans if now - self._first_seen[key] >= self.grace_period
+        ][:self.batch_size]
+        if not expired:
+            return 0
+
+        templates = placeholders = 0
+        with self.client.deferred_apply():
+            for key in expired:
+                kind, first, second = key
+                vip = orphans[key]
+                if kind == "vip":
+                    deleted = self.client.delete_vip_template(vip)
+                else:
+                    deleted = self.client.delete_placeholder(vip, int(second))
+                if not deleted:
+                    LOG.warning(f"EdgeADC {self.client.host}: Failed to delete orphaned {kind} {first}/{second}")
+                    continue
+                del self._first_seen[key]
+                if kind == "vip":
+                    templates += 1
+                else:
+                    placeholders += 1
+        if templates or placeholders:
+            self.client.apply_config()
+        self.reaped_templates += templates
+        self.reaped_placeholders += placeholders
+        LOG.info(
+            f"EdgeADC {self.client.host}: Deleted {templates} orphaned VIP template(s) "
+            f"and {placeholders} orphaned placeholder(s)"
+        )
+        return templates + placeholders
+
+    def _orphans(self, snapshot: IPServicesSnapshot) -> dict[_OrphanKey, dict[str, Any]]:
+        """Blank objects on the device, each mapped to the VIP it is deleted through."""
+        orphans: dict[_OrphanKey, dict[str, Any]] = {}
+        for vip in snapshot.blank_vips:
+            if not self.client.is_reserved_template(vip):
+                interface_id, channel_id = IPServicesSnapshot.channel_of(vip)
+                orphans[("vip", interface_id, channel_id)] = vip
+        for channel_key, cids in snapshot.placeholders.items():
+            owner = snapshot.by_channel_key.get(channel_key)
+            # Placeholders of a blank template go away with the template
+            if owner is None or not owner.get("ipAddr"):
+                continue
+            for cid in cids:
+                if not self.client.is_reserved_placeholder(channel_key, cid):
+                    orphans[("server", channel_key, str(cid))] = owner
+        return orphans
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            try:
+                self.reap_once()
+            except Exception as e:
+                LOG.warning(f"EdgeADC {self.client.host}: Orphan reaping failed: {e}")
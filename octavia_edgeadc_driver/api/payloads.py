@@ -0,0 +1,127 @@
+"""
+Request payloads for the EdgeADC REST API.
+
+Shared by the synchronous and asyncio clients so that both send exactly
+the same requests to the device.
+"""
+from __future__ import annotations
+
+import base64
+from typing import Any
+
+from octavia_edgeadc_driver.api.snapshot import content_servers
+from octavia_edgeadc_driver.common import constants
+
+
+def login(username: str, password: str) -> str:
+    """Build the /POST/32 login body (base64 encoded password)."""
+    password_b64 = base64.b64encode(password.encode()).decode()
+    return f'{{"{username}":"{password_b64}"}}'
+
+
+def vip_template() -> dict[str, str]:
+    """Build the payload that creates a blank VIP template."""
+    return {
+        "editedInterface": "",
+        "editedChannel": "",
+        "CopyVIP": "0",
+        "ipAddr": "",
+        "localPortEnabledChecked": "",
+        "port": "",
+        "primaryChecked": "",
+        "serviceName": "",
+        "serviceType": "",
+        "subnetMask": ""
+    }
+
+
+def vip_update(
+    template: dict[str, Any],
+    ip_addr: str,
+    port: int,
+    protocol: str,
+    subnet_mask: str,
+    service_name: str
+) -> dict[str, str]:
+    """Build the payload that fills a blank VIP template."""
+    return {
+        "editedInterface": str(template.get("InterfaceID", "0")),
+        "editedChannel": str(template.get("ChannelID", "0")),
+        "CopyVIP": "0",
+        "ipAddr": ip_addr,
+        "localPortEnabledChecked": "true",
+        "port": str(port),
+        "primaryChecked": "Active",
+        "serviceName": service_name or f"octavia-{ip_addr}:{port}",
+        "serviceType": constants.PROTOCOL_MAP.get(protocol, "TCP"),
+        "subnetMask": subnet_mask
+    }
+
+
+def vip_ref(vip: dict[str, Any]) -> dict[str, str]:
+    """Build the payload addressing a VIP (delete, placeholder create)."""
+    return {
+        "editedInterface": str(vip.get("InterfaceID", "0")),
+        "editedChannel": str(vip.get("ChannelID", "0"))
+    }
+
+
+def server_ref(vip: dict[str, Any], cid: int | str) -> dict[str, str]:
+    """Build the payload addressing a content server of a VIP."""
+    return {**vip_ref(vip), "cId": str(cid)}
+
+
+def server_add(
+    vip: dict[str, Any],
+    cid: int | str,
+    member_ip: str,
+    member_port: int,
+    weight: int
+) -> dict[str, str]:
+    """Build the payload that fills a blank content-server placeholder."""
+    return {
+        **server_ref(vip, cid),
+        "statusReason": "Finding status",
+        "imagePath": "images/jnpsStateGrey.gif",
+        "CSActivity": "1",
+        "CSIPAddr": member_ip,
+        "CSPort": str(member_port),
+        "CSNotes": "",
+        "WeightFactor": str(weight),
+        "CSMonitorEndPoint": "self",
+        "contentServerGroupName": "Server Group",
+        "ServerId": ""
+    }
+
+
+def server_weight(
+    vip: dict[str, Any],
+    cid: int | str,
+    member_ip: str,
+    member_port: int,
+    weight: int
+) -> dict[str, str]:
+    """Build the payload that changes a content server's weight."""
+    return {
+        **server_ref(vip, cid),
+        "CSActivity": "1",
+        "CSIPAddr": member_ip,
+        "CSPort": str(member_port),
+        "WeightFactor": str(weight),
+        "CSMonitorEndPoint": "self",
+    }
+
+
+def members(vip: dict[str, Any]) -> list[dict[str, Any]]:
+    """Convert a VIP's configured content servers to member dicts."""
+    result = []
+    for server in content_servers(vip):
+        if server.get("CSIPAddr"):
+            result.append({
+                "ip_address": server.get("CSIPAddr"),
+                "port": int(server.get("CSPort", 0)),
+                "weight": int(server.get("WeightFactor", 100)),
+                "cId": server.get("cId"),
+                "status": server.get("statusReason", "unknown")
+            })
+    return result
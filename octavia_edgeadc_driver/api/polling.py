@@ -0,0 +1,118 @@
+"""
+Deadline-bounded adaptive polling for EdgeADC state changes.
+
+Some device changes (a new VIP template, an applied config) only become
+visible after a short delay. Instead of fixed sleeps, AdaptivePoller
+checks with short, exponentially growing intervals under an overall
+deadline, and remembers how long the device actually took so the first
+interval tracks the device's typical latency.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+LOG = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class AdaptivePoller:
+    """Poll a condition with exponential backoff and learned latency."""
+
+    def __init__(
+        self,
+        name: str,
+        deadline: float = 5.0,
+        min_interval: float = 0.05,
+        max_interval: float = 1.0,
+        factor: float = 2.0,
+        smoothing: float = 0.3
+    ) -> None:
+        self.name = name
+        self.deadline = deadline
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.factor = factor
+        self.smoothing = smoothing
+        # Exponentially weighted average of observed latency, in seconds
+        self.observed: float | None = None
+
+    def first_interval(self) -> float:
+        """Interval before the first re-check.
+
+        Half the typical latency, so the expected hit lands within the
+        first two checks without hammering a slow device.
+        """
+        if self.observed is None:
+            return self.min_interval
+        return min(max(self.observed / 2, self.min_interval), self.max_interval)
+
+    def record(self, elapsed: float) -> None:
+        """Fold an observed latency into the running average."""
+        if self.observed is None:
+            self.observed = elapsed
+        else:
+            self.observed += self.smoothing * (elapsed - self.observed)
+
+    def wait(
+        self,
+        check: Callable[[], T | None],
+        deadline: float | None = None,
+        immediate: bool = True,
+        max_checks: int | None = None
+    ) -> T | None:
+        """Call ``check`` until it returns a value or the deadline expires.
+
+        ``max_checks`` also bounds how often ``check`` is called.
+        """
+        deadline = self.deadline if deadline is None else deadline
+        start = time.monotonic()
+        interval = self.first_interval()
+        if not immediate:
+            time.sleep(min(interval, deadline))
+        checks = 0
+        while True:
+            result = check()
+            checks += 1
+            elapsed = time.monotonic() - start
+            if result is not None:
+                self.record(elapsed)
+                return result
+            remaining = deadline - elapsed
+            if remaining <= 0 or (max_checks is not None and checks >= max_checks):
+                LOG.warning(f"Polling {self.name} gave up after {elapsed:.2f}s and {checks} check(s)")
+                return None
+            time.sleep(min(interval, remaining))
+            interval = min(interval * self.factor, self.max_interval)
+
+    async def wait_async(
+        self,
+        check: Callable[[], Awaitable[T | None]],
+        deadline: float | None = None,
+        immediate: bool = True,
+        max_checks: int | None = None
+    ) -> T | None:
+        """Coroutine variant of :meth:`wait`."""
+        deadline = self.deadline if deadline is None else deadline
+        start = time.monotonic()
+        interval = self.first_interval()
+        if not immediate:
+            await asyncio.sleep(min(interval, deadline))
+        checks = 0
+        while True:
+            result = await check()
+            checks += 1
+            elapsed = time.monotonic() - start
+            if result is not None:
+                self.record(elapsed)
+                return result
+            remaining = deadline - elapsed
+            if remaining <= 0 or (max_checks is not None and checks >= max_checks):
+                LOG.warning(f"Polling {self.name} gave up after {elapsed:.2f}s and {checks} check(s)")
+                return None
+            await asyncio.sleep(min(interval, remaining))
+            interval = min(interval * self.factor, self.max_interval)
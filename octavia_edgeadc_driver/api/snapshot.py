@@ -0,0 +1,169 @@
+"""
+Parsed view of the EdgeADC IP-services (/GET/9) dataset.
+
+The device returns VIPs nested as data.dataset.ipService[interface][vip],
+with each VIP's content servers under contentServer.CServerId. The snapshot
+flattens that tree once and builds keyed indexes so lookups by address,
+ChannelKey, (InterfaceID, ChannelID) or content server are O(1).
+
+Snapshots can be saved to a compact JSON file and loaded back, so a
+restarted driver has a view of the device before its first /GET/9.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any
+
+
+def content_servers(vip: dict[str, Any]) -> list[dict[str, Any]]:
+    """Return the content servers of a VIP as a list of dicts."""
+    cs = vip.get("contentServer", {})
+    servers = cs.get("CServerId", []) if isinstance(cs, dict) else []
+    if isinstance(servers, dict):
+        servers = [servers]
+    return [s for s in servers if isinstance(s, dict)]
+
+
+def parse_ip_services(js: Any) -> list[dict[str, Any]] | None:
+    """Flatten the ipService tree of a /GET/9 or /POST/9 response.
+
+    Returns None when the response carries no dataset at all.
+    """
+    if not isinstance(js, dict):
+        return None
+    data = js.get("data")
+    if not isinstance(data, dict):
+        return None
+    dataset = data.get("dataset")
+    if not isinstance(dataset, dict) or "ipService" not in dataset:
+        return None
+
+    result: list[dict[str, Any]] = []
+    for interface_list in dataset.get("ipService") or []:
+        if isinstance(interface_list, list):
+            result.extend(v for v in interface_list if isinstance(v, dict))
+        elif isinstance(interface_list, dict):
+            result.append(interface_list)
+    return result
+
+
+class IPServicesSnapshot:
+    """Immutable, indexed view of the device's VIPs and content servers."""
+
+    def __init__(self, vips: list[dict[str, Any]]) -> None:
+        self.vips = vips
+        self.by_address: dict[tuple[str, str], dict[str, Any]] = {}
+        self.by_channel_key: dict[str, dict[str, Any]] = {}
+        self.by_channel: dict[tuple[str, str], dict[str, Any]] = {}
+        self.servers: dict[tuple[str, str, str, str], dict[str, Any]] = {}
+        self.blank_vips: list[dict[str, Any]] = []
+        self.placeholders: dict[str, list[int]] = {}
+        self._fingerprints: dict[str, str] | None = None
+
+        for vip in vips:
+            ip = vip.get("ipAddr") or ""
+            port = str(vip.get("port", ""))
+            if ip:
+                self.by_address.setdefault((ip, port), vip)
+            else:
+                self.blank_vips.append(vip)
+            channel_key = str(vip.get("ChannelKey", ""))
+            if channel_key:
+                self.by_channel_key[channel_key] = vip
+            self.by_channel[self.channel_of(vip)] = vip
+
+            for server in content_servers(vip):
+                cs_ip = server.get("CSIPAddr") or ""
+                if cs_ip:
+                    if ip:
+                        key = (ip, port, cs_ip, str(server.get("CSPort", "")))
+                        self.servers.setdefault(key, server)
+                else:
+                    try:
+                        cid = int(server.get("cId", 0))
+                    except (TypeError, ValueError):
+                        continue
+                    self.placeholders.setdefault(channel_key, []).append(cid)
+
+    @classmethod
+    def from_response(cls, js: Any) -> IPServicesSnapshot | None:
+        """Build a snapshot from a device response, if it carries a dataset."""
+        vips = parse_ip_services(js)
+        if vips is None:
+            return None
+        return cls(vips)
+
+    def save(self, path: str) -> None:
+        """Write the snapshot to ``path`` atomically."""
+        directory = os.path.dirname(path) or "."
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".snapshot-")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(self.vips, f, separators=(",", ":"))
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> IPServicesSnapshot | None:
+        """Read a snapshot written by :meth:`save`; None if there is none."""
+        try:
+            with open(path, "rb") as f:
+                vips = json.loads(f.read())
+        except (OSError, ValueError):
+            return None
+        if not isinstance(vips, list):
+            return None
+        return cls([v for v in vips if isinstance(v, dict)])
+
+    @staticmethod
+    def key_of(vip: dict[str, Any]) -> str:
+        """Return the key identifying a VIP across reads: its ChannelKey."""
+        channel_key = str(vip.get("ChannelKey", ""))
+        if channel_key:
+            return channel_key
+        interface_id, channel_id = IPServicesSnapshot.channel_of(vip)
+        return f"{interface_id}/{channel_id}"
+
+    @property
+    def fingerprints(self) -> dict[str, str]:
+        """Digest of each VIP's full subtree, keyed by :meth:`key_of`.
+
+        Computed once per snapshot; equal digests mean the VIP and all of
+        its content servers are unchanged.
+        """
+        if self._fingerprints is None:
+            self._fingerprints = {
+                self.key_of(vip): hashlib.blake2b(
+                    json.dumps(vip, sort_keys=True, separators=(",", ":")).encode(), digest_size=16
+                ).hexdigest()
+                for vip in self.vips
+            }
+        return self._fingerprints
+
+    @staticmethod
+    def channel_of(vip: dict[str, Any]) -> tuple[str, str]:
+        """Return the (InterfaceID, ChannelID) key of a VIP."""
+        return str(vip.get("InterfaceID", "0")), str(vip.get("ChannelID", "0"))
+
+    def find_vip(self, ip_addr: str, port: int | str) -> dict[str, Any] | None:
+        """Find a VIP by address and port."""
+        return self.by_address.get((ip_addr, str(port)))
+
+    def find_server(
+        self,
+        vip_ip: str,
+        vip_port: int | str,
+        member_ip: str,
+        member_port: int | str
+    ) -> dict[str, Any] | None:
+        """Find a content server by VIP address and server address."""
+        return self.servers.get((vip_ip, str(vip_port), member_ip, str(member_port)))
+
+    def placeholder_cids(self, channel_key: str) -> list[int]:
+        """Return all blank content-server cIds of a VIP, ascending."""
+        return sorted(self.placeholders.get(str(channel_key), []))
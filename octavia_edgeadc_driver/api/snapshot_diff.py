@@ -0,0 +1,91 @@
+"""
+Diff of two IP-services snapshots.
+
+VIPs are matched by ChannelKey and content servers by cId. Each VIP's
+fingerprint is compared first, so unchanged VIPs are skipped without
+looking at their content servers; the whole diff is linear in the size
+of the two datasets.
+"""
+from __future__ import annotations
+
+import dataclasses
+from typing import Any
+
+from octavia_edgeadc_driver.api.snapshot import IPServicesSnapshot, content_servers
+
+
+@dataclasses.dataclass
+class ServerChange:
+    """A content server present in both snapshots with different fields."""
+
+    cid: str
+    old: dict[str, Any]
+    new: dict[str, Any]
+    fields: set[str]
+
+
+@dataclasses.dataclass
+class VIPChange:
+    """A VIP present in both snapshots whose subtree changed."""
+
+    key: str
+    old: dict[str, Any]
+    new: dict[str, Any]
+    # Changed VIP fields, excluding the contentServer subtree
+    fields: set[str] = dataclasses.field(default_factory=set)
+    servers_added: list[dict[str, Any]] = dataclasses.field(default_factory=list)
+    servers_removed: list[dict[str, Any]] = dataclasses.field(default_factory=list)
+    servers_modified: list[ServerChange] = dataclasses.field(default_factory=list)
+
+
+@dataclasses.dataclass
+class SnapshotDiff:
+    """Differences between two snapshots."""
+
+    added: list[dict[str, Any]] = dataclasses.field(default_factory=list)
+    removed: list[dict[str, Any]] = dataclasses.field(default_factory=list)
+    modified: list[VIPChange] = dataclasses.field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.modified)
+
+
+def _changed_fields(old: dict[str, Any], new: dict[str, Any], skip: tuple[str, ...] = ()) -> set[str]:
+    return {k for k in old.keys() | new.keys() if k not in skip and old.get(k) != new.get(k)}
+
+
+def _servers_by_cid(vip: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    return {str(server.get("cId", "")): server for server in content_servers(vip)}
+
+
+def diff_vip(key: str, old: dict[str, Any], new: dict[str, Any]) -> VIPChange:
+    """Compare two versions of one VIP, content servers by cId."""
+    change = VIPChange(key, old, new, _changed_fields(old, new, skip=("contentServer",)))
+    old_servers = _servers_by_cid(old)
+    new_servers = _servers_by_cid(new)
+    for cid, server in new_servers.items():
+        before = old_servers.get(cid)
+        if before is None:
+            change.servers_added.append(server)
+        elif before != server:
+            change.servers_modified.append(ServerChange(cid, before, server, _changed_fields(before, server)))
+    change.servers_removed.extend(s for cid, s in old_servers.items() if cid not in new_servers)
+    return change
+
+
+def diff_snapshots(old: IPServicesSnapshot, new: IPServicesSnapshot) -> SnapshotDiff:
+    """Report VIPs and content servers added, removed or modified."""
+    result = SnapshotDiff()
+    old_prints = old.fingerprints
+    new_prints = new.fingerprints
+    old_vips = {IPServicesSnapshot.key_of(vip): vip for vip in old.vips}
+
+    for vip in new.vips:
+        key = IPServicesSnapshot.key_of(vip)
+        before = old_vips.get(key)
+        if before is None:
+            result.added.append(vip)
+        elif old_prints[key] != new_prints[key]:
+            result.modified.append(diff_vip(key, before, vip))
+    result.removed.extend(vip for key, vip in old_vips.items() if key not in new_prints)
+    return result
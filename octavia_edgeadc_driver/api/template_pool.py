@@ -0,0 +1,145 @@
+"""
+Pool of pre-provisioned blank VIP templates for one EdgeADC device.
+
+Creating a VIP takes two steps: create a blank template, then fill it in.
+The pool keeps a few blank templates (empty ipAddr) ready and refills them
+from a background thread, so a listener create only has to fill in a
+template and apply.
+"""
+from __future__ import annotations
+
+import collections
+import logging
+import threading
+from typing import TYPE_CHECKING, Any
+
+from octavia_edgeadc_driver.api.snapshot import IPServicesSnapshot
+
+if TYPE_CHECKING:
+    from octavia_edgeadc_driver.api.edgeadc_client import EdgeADCClient
+
+LOG = logging.getLogger(__name__)
+
+
+class TemplatePool:
+    """Keeps ``size`` blank VIP templates reserved on a device."""
+
+    def __init__(self, client: EdgeADCClient, size: int = 2, refill_interval: float = 30.0) -> None:
+        self.client = client
+        self.size = size
+        self.refill_interval = refill_interval
+        self._templates: collections.deque[dict[str, Any]] = collections.deque()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+        # Accounting of every template the pool has created
+        self.created = 0
+        self.consumed = 0
+        self.discarded = 0
+        self.reclaimed = 0
+
+    @property
+    def available(self) -> int:
+        """Number of templates ready for use."""
+        with self._lock:
+            return len(self._templates)
+
+    def start(self) -> None:
+        """Start refilling in the background."""
+        if self._thread is not None or self.size <= 0:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name=f"edgeadc-templates-{self.client.host}", daemon=True
+        )
+        self._thread.start()
+
+    def acquire(self) -> dict[str, Any] | None:
+        """Take a template that is still blank on the device, if any.
+
+        The caller passes it to ``create_virtual_service(template=...)``
+        and hands it back with ``put_back`` if that create fails.
+        """
+        template = None
+        while template is None:
+            with self._lock:
+                if not self._templates:
+                    break
+                candidate = self._templates.popleft()
+            current = self.client.get_snapshot(max_age=0).by_channel.get(IPServicesSnapshot.channel_of(candidate))
+            if current is not None and not current.get("ipAddr"):
+                template = candidate
+            else:
+                # Used or removed behind our back
+                self.client.release_template(candidate)
+                self.discarded += 1
+        if template is not None:
+            self.consumed += 1
+        self._wakeup.set()
+        return template
+
+    def put_back(self, template: dict[str, Any]) -> None:
+        """Return a template taken by a create that failed.
+
+        ``acquire`` re-checks it on the device before it is used again,
+        so a template the failed create did fill in is discarded then.
+        """
+        self.client.reserve_template(template)
+        with self._lock:
+            self._templates.appendleft(template)
+        self.consumed -= 1
+
+    def refill(self) -> int:
+        """Create templates until the pool is full; returns how many were added."""
+        added = 0
+        while not self._stopped.is_set():
+            with self._lock:
+                if len(self._templates) >= self.size:
+                    break
+            template = self.client.create_vip_template(reserve=True)
+            if template is None:
+                break
+            with self._lock:
+                self._templates.append(template)
+            self.created += 1
+            added += 1
+        if added:
+            LOG.debug(f"EdgeADC {self.client.host}: Added {added} blank VIP template(s) to pool")
+        return added
+
+    def close(self) -> int:
+        """Stop refilling and delete the unused templates with one apply.
+
+        Returns the number of templates reclaimed.
+        """
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.client.timeout)
+            self._thread = None
+
+        with self._lock:
+            leftovers = list(self._templates)
+            self._templates.clear()
+        if not leftovers:
+            return 0
+
+        reclaimed = 0
+        with self.client.deferred_apply():
+            for template in leftovers:
+                if self.client.delete_vip_template(template):
+                    reclaimed += 1
+        self.client.apply_config()
+        self.reclaimed += reclaimed
+        LOG.info(f"EdgeADC {self.client.host}: Reclaimed {reclaimed}/{len(leftovers)} pooled VIP template(s)")
+        return reclaimed
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                self.refill()
+            except Exception as e:
+                LOG.warning(f"EdgeADC {self.client.host}: Template pool refill failed: {e}")
+            self._wakeup.wait(self.refill_interval)
+            self._wakeup.clear()
@@ -0,0 +1,219 @@
+"""
+Batched EdgeADC mutations committed with a single config apply.
+
+Usage::
+
+    with client.transaction() as txn:
+        txn.create_virtual_service("10.0.0.100", 80)
+        txn.add_member("10.0.0.100", 80, "10.0.1.1", 8080)
+        txn.add_member("10.0.0.100", 80, "10.0.1.2", 8080)
+    for result in txn.results:
+        ...
+
+Operations are queued while the block runs and executed in order when it
+exits. The config is applied once, after the last operation. If an
+operation fails, the remaining ones are skipped and, unless disabled, the
+operations already executed are undone on a best-effort basis.
+"""
+from __future__ import annotations
+
+import dataclasses
+import logging
+from typing import TYPE_CHECKING, Any, Callable
+
+from octavia_edgeadc_driver.api.snapshot import content_servers
+
+if TYPE_CHECKING:
+    from octavia_edgeadc_driver.api.edgeadc_client import EdgeADCClient
+
+LOG = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass
+class OperationResult:
+    """Outcome of one queued operation."""
+
+    operation: str
+    params: dict[str, Any]
+    success: bool = False
+    response: Any = None
+    error: str | None = None
+    rolled_back: bool = False
+
+
+class Transaction:
+    """Queue of client mutations executed under one config apply."""
+
+    def __init__(self, client: EdgeADCClient, rollback: bool = True) -> None:
+        self.client = client
+        self.rollback = rollback
+        self.results: list[OperationResult] = []
+        self.applied: bool | None = None
+        self._ops: list[tuple[str, dict[str, Any]]] = []
+        self._committed = False
+
+    def __enter__(self) -> Transaction:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            LOG.warning(f"EdgeADC {self.client.host}: Transaction aborted, {len(self._ops)} operation(s) discarded")
+            self._ops.clear()
+
+    @property
+    def success(self) -> bool:
+        """True if every operation succeeded and the config was applied."""
+        return bool(self.applied) and all(r.success for r in self.results)
+
+    # ========== Queued Operations ==========
+
+    def create_virtual_service(
+        self,
+        ip_addr: str,
+        port: int,
+        protocol: str = "HTTP",
+        subnet_mask: str = "255.255.255.0",
+        service_name: str = ""
+    ) -> None:
+        """Queue a VIP create."""
+        self._queue("create_virtual_service", ip_addr=ip_addr, port=port, protocol=protocol,
+                    subnet_mask=subnet_mask, service_name=service_name)
+
+    def delete_virtual_service(self, ip_addr: str, port: int) -> None:
+        """Queue a VIP delete."""
+        self._queue("delete_virtual_service", ip_addr=ip_addr, port=port)
+
+    def add_member(
+        self,
+        vip_ip: str,
+        vip_port: int,
+        member_ip: str,
+        member_port: int,
+        weight: int = 100
+    ) -> None:
+        """Queue a member add."""
+        self._queue("add_member", vip_ip=vip_ip, vip_port=vip_port, member_ip=member_ip,
+                    member_port=member_port, weight=weight)
+
+    def delete_member(self, vip_ip: str, vip_port: int, member_ip: str, member_port: int) -> None:
+        """Queue a member delete."""
+        self._queue("delete_member", vip_ip=vip_ip, vip_port=vip_port, member_ip=member_ip,
+                    member_port=member_port)
+
+    def update_member_weight(
+        self,
+        vip_ip: str,
+        vip_port: int,
+        member_ip: str,
+        member_port: int,
+        weight: int
+    ) -> None:
+        """Queue a member weight update."""
+        self._queue("update_member_weight", vip_ip=vip_ip, vip_port=vip_port, member_ip=member_ip,
+                    member_port=member_port, weight=weight)
+
+    def _queue(self, operation: str, **params: Any) -> None:
+        if self._committed:
+            raise RuntimeError("Transaction already committed")
+        self._ops.append((operation, params))
+
+    # ========== Commit ==========
+
+    def commit(self) -> bool:
+        """Execute the queued operations and apply the config once."""
+        if self._committed:
+            return self.success
+        self._committed = True
+        client = self.client
+        undo_log: list[tuple[OperationResult, Callable[[], Any]]] = []
+        changed = False
+
+        with client.deferred_apply():
+            for index, (operation, params) in enumerate(self._ops):
+                result = OperationResult(operation, params)
+                self.results.append(result)
+                undo = self._prepare_undo(operation, params)
+                try:
+                    outcome = getattr(client, operation)(**params)
+                except Exception as e:
+                    outcome = False
+                    result.error = str(e)
+                if isinstance(outcome, tuple):
+                    result.success, result.response = outcome
+                else:
+                    result.success = bool(outcome)
+                if result.success:
+                    changed = True
+                    if undo is not None:
+                        undo_log.append((result, undo))
+                    continue
+
+                result.error = result.error or "Operation failed"
+                for skipped_op, skipped_params in self._ops[index + 1:]:
+                    self.results.append(OperationResult(skipped_op, skipped_params, error="Skipped"))
+                if self.rollback:
+                    self._rollback(undo_log)
+                break
+
+        self.applied = client.apply_config() if changed else True
+        LOG.info(f"EdgeADC {client.host}: Transaction of {len(self._ops)} operation(s) - "
+                 f"{'OK' if self.success else 'FAILED'}")
+        return self.success
+
+    def _rollback(self, undo_log: list[tuple[OperationResult, Callable[[], Any]]]) -> None:
+        """Undo executed operations in reverse order, best effort."""
+        for result, undo in reversed(undo_log):
+            try:
+                outcome = undo()
+                ok = outcome[0] if isinstance(outcome, tuple) else bool(outcome)
+            except Exception as e:
+                LOG.warning(f"Rollback of {result.operation} failed: {e}")
+                ok = False
+            result.rolled_back = ok
+            if not ok:
+                LOG.warning(f"EdgeADC {self.client.host}: Could not roll back {result.operation} {result.params}")
+
+    def _prepare_undo(self, operation: str, params: dict[str, Any]) -> Callable[[], Any] | None:
+        """Capture what is needed to reverse ``operation`` before it runs."""
+        client = self.client
+        if operation == "create_virtual_service":
+            return lambda: client.delete_virtual_service(params["ip_addr"], params["port"])
+        if operation == "add_member":
+            return lambda: client.delete_member(params["vip_ip"], params["vip_port"],
+                                                params["member_ip"], params["member_port"])
+
+        snapshot = client.get_snapshot()
+        if operation == "delete_virtual_service":
+            vip = snapshot.find_vip(params["ip_addr"], params["port"])
+            if not vip:
+                return None
+            members = [s for s in content_servers(vip) if s.get("CSIPAddr")]
+
+            def recreate() -> bool:
+                ok, _ = client.create_virtual_service(
+                    params["ip_addr"], params["port"],
+                    protocol=vip.get("serviceType") or "HTTP",
+                    subnet_mask=vip.get("subnetMask") or "255.255.255.0",
+                    service_name=vip.get("serviceName") or ""
+                )
+                for server in members if ok else []:
+                    client.add_member(params["ip_addr"], params["port"], server["CSIPAddr"],
+                                      int(server.get("CSPort", 0)), int(server.get("WeightFactor", 100)))
+                return ok
+            return recreate
+
+        server = snapshot.find_server(params["vip_ip"], params["vip_port"],
+                                      params["member_ip"], params["member_port"])
+        if not server:
+            return None
+        old_weight = int(server.get("WeightFactor", 100))
+        if operation == "delete_member":
+            return lambda: client.add_member(params["vip_ip"], params["vip_port"], params["member_ip"],
+                                             params["member_port"], old_weight)
+        if operation == "update_member_weight":
+            return lambda: client.update_member_weight(params["vip_ip"], params["vip_port"],
+                                                       params["member_ip"], params["member_port"],
+                                                       old_weight)
+        return None
@@ -3,6 +3,10 @@ Configuration options for the EdgeADC Octavia driver.
 """
 from oslo_config import cfg
 
+from octavia_edgeadc_driver.common.device_registry import DeviceConfig
+
+DEVICE_GROUP_PREFIX = 'edgeadc_device_'
+
 EDGEADC_OPTS = [
     cfg.StrOpt(
         'edgeadc_host',
@@ -35,11 +39,233 @@ EDGEADC_OPTS = [
         default=30,
         help='Timeout in seconds for EdgeADC API requests'
     ),
+    cfg.ListOpt(
+        'edgeadc_peers',
+        default=[],
+        help='Other members of the EdgeADC cluster edgeadc_host belongs '
+             'to. Configuration changes are sent to a member that reports '
+             'itself primary, or else to edgeadc_host, and reads are spread '
+             'over all members.'
+    ),
+    cfg.ListOpt(
+        'edgeadc_devices',
+        default=[],
+        help='Names of the EdgeADC devices load balancers are placed on. '
+             'Each device is configured in an [edgeadc_device_<name>] '
+             'section. Empty uses the single device configured by '
+             'edgeadc_host.'
+    ),
+    cfg.StrOpt(
+        'edgeadc_placement_strategy',
+        default='least_vips',
+        help='How a new load balancer is placed when several devices are '
+             'eligible: least_vips, least_members, weighted_utilization '
+             '(VIP capacity, CPU and memory use), or a module:Class path '
+             'of a custom PlacementStrategy.'
+    ),
+    cfg.FloatOpt(
+        'edgeadc_placement_refresh_interval',
+        default=60.0,
+        min=0,
+        help='Seconds between background reads of each device\'s load '
+             'used for placement. 0 reads it only once at startup.'
+    ),
     cfg.StrOpt(
         'edgeadc_default_subnet_mask',
         default='255.255.255.0',
         help='Default subnet mask for VIPs'
     ),
+    cfg.FloatOpt(
+        'edgeadc_cache_ttl',
+        default=5.0,
+        help='Seconds a cached IP-services (/GET/9) snapshot is reused '
+             'before it is fetched again. 0 disables the cache.'
+    ),
+    cfg.FloatOpt(
+        'edgeadc_apply_delay',
+        default=0.0,
+        help='Seconds to wait before applying configuration changes so '
+             'that changes made in the meantime share a single apply. '
+             '0 applies every change immediately.'
+    ),
+    cfg.FloatOpt(
+        'edgeadc_poll_timeout',
+        default=5.0,
+        help='Maximum seconds to poll the EdgeADC for a change to become '
+             'visible, such as a new VIP template or an applied VIP.'
+    ),
+    cfg.IntOpt(
+        'edgeadc_template_pool_size',
+        default=0,
+        min=0,
+        help='Number of blank VIP templates kept ready on each EdgeADC so '
+             'that listener creates skip template creation. 0 disables '
+             'the pool.'
+    ),
+    cfg.FloatOpt(
+        'edgeadc_template_pool_interval',
+        default=30.0,
+        help='Seconds between background checks that refill the VIP '
+             'template pool. Taking a template also triggers a refill.'
+    ),
+    cfg.FloatOpt(
+        'edgeadc_orphan_reap_interval',
+        default=0.0,
+        min=0,
+        help='Seconds between background scans for blank VIP templates and '
+             'blank content-server placeholders left behind by failed '
+             'operations. 0 disables orphan removal. Only enable it when a '
+             'single process manages each device: a reaper cannot see the '
+             'templates and placeholders reserved by other processes.'
+    ),
+    cfg.FloatOpt(
+        'edgeadc_orphan_grace_period',
+        default=600.0,
+        min=0,
+        help='Seconds a blank VIP template or placeholder must stay blank '
+             'before it is considered orphaned and deleted.'
+    ),
+    cfg.IntOpt(
+        'edgeadc_orphan_batch_size',
+        default=50,
+        min=1,
+        help='Maximum number of orphans deleted per scan, committed by a '
+             'single config apply.'
+    ),
+    cfg.IntOpt(
+        'edgeadc_worker_threads',
+        default=8,
+        min=0,
+        help='Worker threads that carry out EdgeADC operations in the '
+             'background, so Octavia API calls return without waiting for '
+             'the device. 0 runs every operation inline.'
+    ),
+    cfg.IntOpt(
+        'edgeadc_device_concurrency',
+        default=4,
+        min=0,
+        help='Maximum number of background operations running against one '
+             'EdgeADC device at a time. Operations of one load balancer '
+             'always run in order. 0 means no limit beyond the worker threads.'
+    ),
+    cfg.FloatOpt(
+        'edgeadc_status_interval',
+        default=0.2,
+        min=0,
+        help='Seconds to collect status updates before reporting them to '
+             'Octavia in one call. 0 reports every update immediately.'
+    ),
+    cfg.IntOpt(
+        'edgeadc_status_batch_size',
+        default=100,
+        min=1,
+        help='Number of objects with pending status updates that triggers '
+             'an immediate report.'
+    ),
+    cfg.StrOpt(
+        'edgeadc_mapping_db',
+        default='/var/lib/octavia/edgeadc_mappings.db',
+        help='SQLite database that maps Octavia object IDs to EdgeADC '
+             'device objects (VIP channel and content-server cId). '
+             'Use ":memory:" to keep the mapping in memory only.'
+    ),
+    cfg.StrOpt(
+        'edgeadc_snapshot_dir',
+        default='/var/lib/octavia',
+        help='Directory where the last known VIP configuration of each '
+             'EdgeADC device is saved. On startup it answers reads while '
+             'the device is revalidated in the background. Empty disables '
+             'warm start.'
+    ),
+    cfg.FloatOpt(
+        'edgeadc_status_poll_interval',
+        default=10.0,
+        min=0,
+        help='Seconds between member health polls by the provider agent. '
+             'Only changed operating statuses are reported. 0 disables '
+             'polling.'
+    ),
+    cfg.FloatOpt(
+        'edgeadc_stats_interval',
+        default=60.0,
+        min=0,
+        help='Seconds between listener statistics submissions by the '
+             'provider agent. 0 disables statistics collection, and so '
+             'does an empty edgeadc_stats_path.'
+    ),
+    cfg.StrOpt(
+        'edgeadc_stats_path',
+        default='',
+        help='EdgeADC API path that returns per-VIP traffic counters in the '
+             'IP-services layout. Statistics are only collected when it is '
+             'set, as the counter field names are not documented for the '
+             'default firmware API.'
+    ),
+    cfg.FloatOpt(
+        'edgeadc_reconcile_interval',
+        default=0.0,
+        min=0,
+        help='Seconds between provider agent passes that compare the '
+             'listeners and members Octavia expects with each device and '
+             'repair missing or drifted objects. 0 disables reconciliation.'
+    ),
+    cfg.FloatOpt(
+        'edgeadc_reconcile_rate',
+        default=5.0,
+        min=0,
+        help='Maximum writes per second against one device during '
+             'reconciliation. Each /POST/9 and each config apply counts: '
+             'recreating a VIP or a member takes two writes, fixing a '
+             'weight one, and every batch one more for its apply. 0 means '
+             'no limit.'
+    ),
+    cfg.IntOpt(
+        'edgeadc_reconcile_batch_size',
+        default=20,
+        min=1,
+        help='Number of repairs committed together by one config apply.'
+    ),
+]
+
+# Options of an [edgeadc_device_<name>] section; unset ones fall back to
+# the [edgeadc] section
+DEVICE_OPTS = [
+    cfg.StrOpt(
+        'edgeadc_host',
+        help='EdgeADC device hostname or IP address'
+    ),
+    cfg.StrOpt(
+        'edgeadc_username',
+        help='EdgeADC admin username'
+    ),
+    cfg.StrOpt(
+        'edgeadc_password',
+        secret=True,
+        help='EdgeADC admin password'
+    ),
+    cfg.IntOpt(
+        'edgeadc_port',
+        help='EdgeADC HTTPS port'
+    ),
+    cfg.BoolOpt(
+        'edgeadc_verify_ssl',
+        help='Verify SSL certificates when connecting to EdgeADC'
+    ),
+    cfg.IntOpt(
+        'edgeadc_request_timeout',
+        help='Timeout in seconds for EdgeADC API requests'
+    ),
+    cfg.ListOpt(
+        'edgeadc_peers',
+        default=[],
+        help='Other members of the EdgeADC cluster this device belongs to'
+    ),
+    cfg.StrOpt(
+        'edgeadc_cluster',
+        default='',
+        help='Cluster the device belongs to, matched against the '
+             'edgeadc_cluster availability zone metadata'
+    ),
 ]
 
 
@@ -48,6 +274,38 @@ def register_opts(conf):
     conf.register_opts(EDGEADC_OPTS, group='edgeadc')
 
 
+def load_devices(conf) -> list[DeviceConfig]:
+    """Read the configured devices, registering their sections."""
+    defaults = conf.edgeadc
+    names = list(defaults.edgeadc_devices or [])
+    if not names:
+        return [DeviceConfig(
+            name='default', host=defaults.edgeadc_host,
+            username=defaults.edgeadc_username, password=defaults.edgeadc_password,
+            port=defaults.edgeadc_port, verify_ssl=defaults.edgeadc_verify_ssl,
+            timeout=defaults.edgeadc_request_timeout, peers=tuple(defaults.edgeadc_peers or ())
+        )]
+
+    devices = []
+    for name in names:
+        group = DEVICE_GROUP_PREFIX + name
+        conf.register_opts(DEVICE_OPTS, group=group)
+        section = conf[group]
+        inherited = {
+            opt: getattr(defaults, opt) if getattr(section, opt) is None else getattr(section, opt)
+            for opt in ('edgeadc_username', 'edgeadc_password', 'edgeadc_port',
+                        'edgeadc_verify_ssl', 'edgeadc_request_timeout')
+        }
+        devices.append(DeviceConfig(
+            name=name, host=section.edgeadc_host or name,
+            username=inherited['edgeadc_username'], password=inherited['edgeadc_password'],
+            port=inherited['edgeadc_port'], verify_ssl=inherited['edgeadc_verify_ssl'],
+            timeout=inherited['edgeadc_request_timeout'], cluster=section.edgeadc_cluster,
+            peers=tuple(section.edgeadc_peers or ())
+        ))
+    return devices
+
+
 def list_opts():
     """Return a list of oslo.config options for documentation."""
-    return [('edgeadc', EDGEADC_OPTS)]
+    return [('edgeadc', EDGEADC_OPTS), (DEVICE_GROUP_PREFIX + '<name>', DEVICE_OPTS)]
@@ -12,6 +12,8 @@ API_SYSTEM_INFO = '/GET/5'
 API_CLUSTER_STATUS = '/GET/30'
 
 # VIP operations (Terraform-style two-step approach)
+# Every /POST/9 response carries the updated ipService dataset
+API_IP_SERVICES_UPDATE = '/POST/9'
 API_VIP_CREATE_TEMPLATE = '/POST/9?iAction=3&iType=1&FilterKeyword='
 API_VIP_UPDATE_TEMPLATE = '/POST/9?iAction=2&iType=1&FilterKeyword='
 API_VIP_DELETE = '/POST/9?iAction=3&iType=4&FilterKeyword='
@@ -20,6 +22,9 @@ API_SERVER_ADD_UPDATE = '/POST/9?iAction=2&iType=2&FilterKeyword='
 API_SERVER_DELETE = '/POST/9?iAction=3&iType=5&FilterKeyword='
 API_APPLY_CONFIG = '/POST/5?iAction=1'
 
+# Full /GET/9 reads at most made while waiting for an applied VIP
+VIP_POLL_MAX_FETCHES = 5
+
 # Protocol mappings: Octavia -> EdgeADC
 PROTOCOL_MAP = {
     'HTTP': 'HTTP',
@@ -57,6 +62,49 @@ OPERATING_STATUS_DEGRADED = 'DEGRADED'
 OPERATING_STATUS_ERROR = 'ERROR'
 OPERATING_STATUS_NO_MONITOR = 'NO_MONITOR'
 
+# Content-server health indicator (imagePath file stem) -> operating status
+CS_STATUS_IMAGE_MAP = {
+    'jnpsStateGreen': OPERATING_STATUS_ONLINE,
+    'jnpsStateAmber': OPERATING_STATUS_DEGRADED,
+    'jnpsStateYellow': OPERATING_STATUS_DEGRADED,
+    'jnpsStateRed': OPERATING_STATUS_ERROR,
+    'jnpsStateBlue': OPERATING_STATUS_NO_MONITOR,
+    'jnpsStateGrey': OPERATING_STATUS_OFFLINE,
+}
+
+# statusReason while the device has not finished its first health check
+CS_STATUS_PENDING = 'Finding status'
+
+# Per-VIP traffic counters: Octavia listener statistic -> device field names
+# tried in order. Counters are cumulative except active_connections.
+VIP_COUNTER_FIELDS = {
+    'bytes_in': ('BytesIn', 'bytesIn', 'InBytes'),
+    'bytes_out': ('BytesOut', 'bytesOut', 'OutBytes'),
+    'active_connections': ('ActiveConnections', 'CurrentConnections', 'currConn'),
+    'total_connections': ('TotalConnections', 'totalConn'),
+    'request_errors': ('RequestErrors', 'Errors'),
+}
+VIP_GAUGE_COUNTERS = ('active_connections',)
+
+# Cluster role in the cluster status (/GET/30) response. An explicit role
+# field wins; otherwise clusterState tells standalone devices (0) from
+# cluster members (1). Only a peer reporting a primary role takes writes
+# away from the configured device.
+CLUSTER_ROLE_FIELDS = ('clusterRole', 'ClusterRole')
+CLUSTER_STATE_FIELDS = ('clusterState', 'ClusterState')
+CLUSTER_PRIMARY_ROLES = ('primary', 'master', 'owner')
+CLUSTER_SECONDARY_ROLES = ('secondary', 'slave', 'backup', 'standby', 'passive')
+CLUSTER_STATE_ROLES = {'0': 'standalone', '1': 'secondary'}
+
+# Device capacity and utilization in the system info (/GET/5) response:
+# load figure -> field names tried in order, anywhere in the response.
+# Utilization figures are percentages.
+SYSTEM_LOAD_FIELDS = {
+    'max_vips': ('MaxVirtualServices', 'maxVirtualServices', 'MaxVIPs', 'LicensedVIPs'),
+    'cpu': ('CPUUsage', 'cpuUsage', 'CpuLoad', 'cpuLoad'),
+    'memory': ('MemoryUsage', 'memoryUsage', 'MemUsage', 'memUsage'),
+}
+
 # Provisioning status values
 PROVISIONING_STATUS_ACTIVE = 'ACTIVE'
 PROVISIONING_STATUS_DELETED = 'DELETED'
@@ -0,0 +1,95 @@
+"""
+Registry of the EdgeADC devices the driver can place load balancers on.
+
+Each device is configured in its own ``[edgeadc_device_<name>]`` section
+and may belong to a cluster. A load balancer's device is chosen from the
+``edgeadc_device`` flavor key (a device name or host) and the
+``edgeadc_cluster`` availability zone key when it is created; the choice
+is recorded in the mapping store, so every later operation on the load
+balancer goes to the same device.
+"""
+from __future__ import annotations
+
+import dataclasses
+import logging
+from typing import Any
+
+LOG = logging.getLogger(__name__)
+
+# Flavor and availability zone metadata keys that select devices
+FLAVOR_DEVICE_KEY = "edgeadc_device"
+AZ_CLUSTER_KEY = "edgeadc_cluster"
+
+
+@dataclasses.dataclass(frozen=True)
+class DeviceConfig:
+    """Connection settings of one EdgeADC device."""
+
+    name: str
+    host: str
+    username: str = "admin"
+    password: str = dataclasses.field(default="", repr=False)
+    port: int = 443
+    verify_ssl: bool = False
+    timeout: int = 30
+    cluster: str = ""
+    # Other members of the device's EdgeADC HA cluster
+    peers: tuple[str, ...] = ()
+
+
+class DeviceRegistry:
+    """Configured devices, looked up by name or host."""
+
+    def __init__(self, devices: list[DeviceConfig]) -> None:
+        if not devices:
+            raise ValueError("At least one EdgeADC device must be configured")
+        self._devices = list(devices)
+        self._by_name = {d.name: d for d in self._devices}
+        self._by_host = {d.host: d for d in self._devices}
+
+    @property
+    def devices(self) -> list[DeviceConfig]:
+        """All devices, in configuration order."""
+        return list(self._devices)
+
+    @property
+    def default(self) -> DeviceConfig:
+        """Device used for objects that were never bound to one."""
+        return self._devices[0]
+
+    @property
+    def clusters(self) -> set[str]:
+        """Names of the configured clusters."""
+        return {d.cluster for d in self._devices if d.cluster}
+
+    def get(self, name_or_host: str | None) -> DeviceConfig | None:
+        """Look up a device by name or host."""
+        if not name_or_host:
+            return None
+        return self._by_name.get(name_or_host) or self._by_host.get(name_or_host)
+
+    def candidates(
+        self,
+        flavor_metadata: dict[str, Any] | None = None,
+        az_metadata: dict[str, Any] | None = None
+    ) -> list[DeviceConfig]:
+        """Devices a new load balancer may be placed on.
+
+        The flavor's ``edgeadc_device`` pins one device; the availability
+        zone's ``edgeadc_cluster`` limits placement to that cluster's
+        devices. Without either, every device is eligible.
+        """
+        candidates = self.devices
+        device = _metadata(flavor_metadata).get(FLAVOR_DEVICE_KEY)
+        if device:
+            pinned = self.get(device)
+            candidates = [pinned] if pinned is not None else []
+        cluster = _metadata(az_metadata).get(AZ_CLUSTER_KEY)
+        if cluster:
+            candidates = [d for d in candidates if d.cluster == cluster]
+        return candidates
+
+
+def _metadata(metadata: Any) -> dict[str, Any]:
+    """Octavia passes Unset or None when a load balancer has no flavor or AZ."""
+    return metadata if isinstance(metadata, dict) else {}
@@ -0,0 +1,193 @@
+"""
+Background executor for EdgeADC provider driver operations.
+
+Octavia calls provider driver methods from its API request threads. The
+executor lets the driver accept a call, return right away and do the
+device work on a bounded pool of worker threads, so API latency does not
+depend on appliance latency.
+
+Operations are queued per key (the load balancer ID). Each key's queue
+runs strictly in submission order, so a listener create finishes before a
+member create on the same load balancer, while different load balancers
+run in parallel. A per-device limit caps how many operations hit one
+appliance at the same time. A queue whose device is at its limit is
+parked rather than blocking a worker, and resumes when an operation on
+that device finishes, so a busy device never starves the others.
+"""
+from __future__ import annotations
+
+import collections
+import concurrent.futures
+import dataclasses
+import logging
+import threading
+import time
+from typing import Any, Callable
+
+LOG = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass
+class QueueStats:
+    """Queue depth and wait time of one key's operations."""
+
+    depth: int = 0
+    completed: int = 0
+    last_wait: float = 0.0
+    max_wait: float = 0.0
+    total_wait: float = 0.0
+
+    @property
+    def avg_wait(self) -> float:
+        """Average seconds an operation waited before it started."""
+        return self.total_wait / self.completed if self.completed else 0.0
+
+
+@dataclasses.dataclass
+class _Operation:
+    name: str
+    device: str | None
+    fn: Callable[..., Any]
+    args: tuple[Any, ...]
+    future: concurrent.futures.Future
+    enqueued: float
+
+
+class OperationExecutor:
+    """Runs driver operations on a bounded worker pool, ordered per key."""
+
+    def __init__(self, max_workers: int = 8, device_concurrency: int = 0) -> None:
+        self.max_workers = max_workers
+        self.device_concurrency = device_concurrency
+        self._pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="edgeadc-op"
+        )
+        self._lock = threading.Lock()
+        # Signalled when the last in-flight operation finishes
+        self._idle = threading.Condition(self._lock)
+        self._inflight = 0
+        self._queues: dict[str, collections.deque[_Operation]] = {}
+        self._stats: dict[str, QueueStats] = {}
+        # Keys whose statistics are dropped when their queue empties
+        self._forgotten: set[str] = set()
+        # Operations running per device, and keys waiting for a free slot
+        self._device_busy: dict[str, int] = {}
+        self._parked: dict[str, collections.deque[str]] = {}
+
+    @property
+    def inflight(self) -> int:
+        """Number of submitted operations that have not finished yet."""
+        with self._lock:
+            return self._inflight
+
+    def queue_depth(self, key: str) -> int:
+        """Number of operations queued or running for ``key``."""
+        with self._lock:
+            return len(self._queues.get(key, ()))
+
+    def stats(self) -> dict[str, QueueStats]:
+        """Per-key queue depth and wait times, as copies."""
+        with self._lock:
+            return {
+                key: dataclasses.replace(stats, depth=len(self._queues.get(key, ())))
+                for key, stats in self._stats.items()
+            }
+
+    def forget(self, key: str) -> None:
+        """Drop the statistics of a key once its queued operations have run."""
+        with self._lock:
+            if key in self._queues:
+                self._forgotten.add(key)
+            else:
+                self._stats.pop(key, None)
+
+    def submit(
+        self,
+        key: str,
+        name: str,
+        fn: Callable[..., Any],
+        *args: Any,
+        device: str | None = None
+    ) -> concurrent.futures.Future:
+        """Queue ``fn(*args)`` behind earlier operations with the same key."""
+        op = _Operation(name, device, fn, args, concurrent.futures.Future(), time.monotonic())
+        with self._lock:
+            self._inflight += 1
+            queue = self._queues.get(key)
+            start = queue is None
+            if queue is None:
+                queue = self._queues[key] = collections.deque()
+            queue.append(op)
+            self._stats.setdefault(key, QueueStats())
+        if start:
+            self._pool.submit(self._drain, key)
+        return op.future
+
+    def _limited(self, device: str | None) -> str | None:
+        """Return ``device`` if its concurrency is capped, else None."""
+        return device if self.device_concurrency > 0 else None
+
+    def _drain(self, key: str) -> None:
+        """Run a key's operations one at a time until its queue is empty.
+
+        If the next operation's device is at its limit, the key is parked
+        and the worker returns to the pool.
+        """
+        while True:
+            with self._lock:
+                op = self._queues[key][0]
+                device = self._limited(op.device)
+                if device is not None:
+                    if self._device_busy.get(device, 0) >= self.device_concurrency:
+                        self._parked.setdefault(device, collections.deque()).append(key)
+                        return
+                    self._device_busy[device] = self._device_busy.get(device, 0) + 1
+            waited = time.monotonic() - op.enqueued
+            self._run(op)
+            resume = None
+            with self._lock:
+                if device is not None:
+                    self._device_busy[device] -= 1
+                    parked = self._parked.get(device)
+                    if parked:
+                        resume = parked.popleft()
+                stats = self._stats[key]
+                stats.completed += 1
+                stats.last_wait = waited
+                stats.total_wait += waited
+                stats.max_wait = max(stats.max_wait, waited)
+                self._inflight -= 1
+                if not self._inflight:
+                    self._idle.notify_all()
+                queue = self._queues[key]
+                queue.popleft()
+                done = not queue
+                if done:
+                    del self._queues[key]
+                    if key in self._forgotten:
+                        self._forgotten.discard(key)
+                        del self._stats[key]
+            if resume is not None:
+                self._pool.submit(self._drain, resume)
+            if done:
+                return
+
+    def _run(self, op: _Operation) -> None:
+        if not op.future.set_running_or_notify_cancel():
+            return
+        try:
+            op.future.set_result(op.fn(*op.args))
+        except Exception as e:
+            LOG.exception(f"EdgeADC operation {op.name} failed: {e}")
+            op.future.set_exception(e)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting operations, optionally waiting for queued ones.
+
+        Parked queues are resubmitted to the pool when their device frees
+        up, so the pool is only shut down once every operation has run.
+        """
+        if wait:
+            with self._idle:
+                self._idle.wait_for(lambda: not self._inflight)
+        self._pool.shutdown(wait=wait)
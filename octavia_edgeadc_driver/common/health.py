@@ -0,0 +1,111 @@
+"""
+Member operating-status polling for the provider agent.
+
+The device reports the health of each content server through its
+``imagePath`` indicator and ``statusReason`` text. The poller reads them
+from the IP-services snapshot for every member in the mapping store,
+works out the Octavia operating status and pushes only the statuses that
+changed since the previous poll, in batches.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Callable
+
+from octavia_edgeadc_driver.common import constants
+from octavia_edgeadc_driver.common.mapping_store import KIND_MEMBER, MappingStore
+
+if TYPE_CHECKING:
+    from octavia_edgeadc_driver.api.edgeadc_client import EdgeADCClient
+
+LOG = logging.getLogger(__name__)
+
+
+def member_operating_status(server: dict[str, Any]) -> str | None:
+    """Map a content server's health indicator to an operating status.
+
+    Returns None while the device has not determined the status yet.
+    """
+    reason = str(server.get("statusReason") or "")
+    if reason.lower().startswith(constants.CS_STATUS_PENDING.lower()):
+        return None
+    image = os.path.splitext(os.path.basename(str(server.get("imagePath") or "")))[0]
+    status = constants.CS_STATUS_IMAGE_MAP.get(image)
+    if status is not None:
+        return status
+    reason = reason.lower()
+    if "online" in reason or reason == "up":
+        return constants.OPERATING_STATUS_ONLINE
+    if "offline" in reason or "down" in reason or "fail" in reason:
+        return constants.OPERATING_STATUS_ERROR
+    if "disabled" in reason or "drain" in reason:
+        return constants.OPERATING_STATUS_OFFLINE
+    return None
+
+
+class MemberStatusPoller:
+    """Push member operating-status changes to Octavia."""
+
+    def __init__(
+        self,
+        send_fn: Callable[[dict[str, list[dict[str, Any]]]], Any],
+        mappings: MappingStore,
+        clients: dict[str, EdgeADCClient],
+        batch_size: int = 100
+    ) -> None:
+        self._send_fn = send_fn
+        self.mappings = mappings
+        self.clients = clients
+        self.batch_size = batch_size
+        # Last operating status pushed per member ID
+        self._last: dict[str, str] = {}
+
+    def poll_once(self) -> int:
+        """Read every device once and push changes; returns how many."""
+        changes: list[dict[str, str]] = []
+        seen: set[str] = set()
+        for host, client in self.clients.items():
+            members = self.mappings.all(kind=KIND_MEMBER, host=host)
+            if not members:
+                continue
+            snapshot = client.get_snapshot(max_age=0)
+            if not snapshot.vips:
+                LOG.warning(f"EdgeADC {host}: No IP services returned; member status not updated")
+                seen.update(m.octavia_id for m in members)
+                continue
+            for member in members:
+                seen.add(member.octavia_id)
+                server = snapshot.find_server(member.vip_ip, member.vip_port, member.address, member.port)
+                status = member_operating_status(server) if server else constants.OPERATING_STATUS_ERROR
+                if status is None or self._last.get(member.octavia_id) == status:
+                    continue
+                self._last[member.octavia_id] = status
+                changes.append({"id": member.octavia_id, "operating_status": status})
+
+        # Forget members that no longer exist
+        for member_id in self._last.keys() - seen:
+            del self._last[member_id]
+
+        for start in range(0, len(changes), self.batch_size):
+            batch = changes[start:start + self.batch_size]
+            try:
+                self._send_fn({"members": batch})
+            except Exception as e:
+                LOG.error(f"Failed to push operating status of {len(batch)} member(s): {e}")
+                # Retry these on the next poll
+                for update in batch:
+                    self._last.pop(update["id"], None)
+        if changes:
+            LOG.debug(f"Pushed operating status changes of {len(changes)} member(s)")
+        return len(changes)
+
+    def run(self, interval: float, stop: threading.Event) -> None:
+        """Poll every ``interval`` seconds until ``stop`` is set."""
+        while not stop.is_set():
+            try:
+                self.poll_once()
+            except Exception as e:
+                LOG.exception(f"Member status poll failed: {e}")
+            stop.wait(interval)
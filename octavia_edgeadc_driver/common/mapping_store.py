@@ -0,0 +1,207 @@
+"""
+Persistent mapping from Octavia objects to EdgeADC device objects.
+
+Octavia identifies load balancers, listeners, pools and members by UUID;
+the device identifies VIPs by (InterfaceID, ChannelID, ChannelKey) and
+content servers by cId. The store records where each Octavia object lives
+on which device in a local SQLite database, so the driver can find an
+object directly, including after a restart.
+"""
+from __future__ import annotations
+
+import dataclasses
+import logging
+import sqlite3
+import threading
+from typing import Any
+
+LOG = logging.getLogger(__name__)
+
+KIND_LOADBALANCER = "loadbalancer"
+KIND_LISTENER = "listener"
+KIND_POOL = "pool"
+KIND_MEMBER = "member"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS device_objects (
+    octavia_id   TEXT PRIMARY KEY,
+    kind         TEXT NOT NULL,
+    host         TEXT NOT NULL,
+    parent_id    TEXT,
+    vip_ip       TEXT NOT NULL DEFAULT '',
+    vip_port     INTEGER NOT NULL DEFAULT 0,
+    interface_id TEXT NOT NULL DEFAULT '',
+    channel_id   TEXT NOT NULL DEFAULT '',
+    channel_key  TEXT NOT NULL DEFAULT '',
+    address      TEXT NOT NULL DEFAULT '',
+    port         INTEGER NOT NULL DEFAULT 0,
+    cid          INTEGER,
+    weight       INTEGER,
+    deleting     INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS device_objects_parent ON device_objects (parent_id);
+"""
+
+
+@dataclasses.dataclass
+class DeviceObject:
+    """Device coordinates of one Octavia object."""
+
+    octavia_id: str
+    kind: str
+    host: str
+    parent_id: str | None = None
+    # VIP the object belongs to (listeners, pools and members)
+    vip_ip: str = ""
+    vip_port: int = 0
+    interface_id: str = ""
+    channel_id: str = ""
+    channel_key: str = ""
+    # Content server address and cId (members only)
+    address: str = ""
+    port: int = 0
+    cid: int | None = None
+    # Weight the member was last configured with
+    weight: int | None = None
+    # Set while the driver removes the object from the device
+    deleting: bool = False
+
+    @classmethod
+    def from_vip(
+        cls,
+        octavia_id: str,
+        kind: str,
+        host: str,
+        vip: dict[str, Any],
+        parent_id: str | None = None
+    ) -> DeviceObject:
+        """Build a mapping from a device VIP dict."""
+        return cls(
+            octavia_id=octavia_id, kind=kind, host=host, parent_id=parent_id,
+            vip_ip=vip.get("ipAddr") or "", vip_port=int(vip.get("port") or 0),
+            interface_id=str(vip.get("InterfaceID", "")), channel_id=str(vip.get("ChannelID", "")),
+            channel_key=str(vip.get("ChannelKey", ""))
+        )
+
+
+_FIELDS = [f.name for f in dataclasses.fields(DeviceObject)]
+
+
+def _from_row(row: tuple[Any, ...]) -> DeviceObject:
+    obj = DeviceObject(*row)
+    obj.deleting = bool(obj.deleting)
+    return obj
+
+
+class MappingStore:
+    """SQLite-backed store of :class:`DeviceObject` records."""
+
+    def __init__(self, path: str = ":memory:") -> None:
+        self.path = path
+        try:
+            self._conn = self._connect(path)
+        except sqlite3.Error as e:
+            LOG.warning(f"Cannot open mapping database {path} ({e}); mappings will not persist")
+            self.path = ":memory:"
+            self._conn = self._connect(self.path)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _connect(path: str) -> sqlite3.Connection:
+        conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(device_objects)")}
+        if "weight" not in columns:
+            conn.execute("ALTER TABLE device_objects ADD COLUMN weight INTEGER")
+        if "deleting" not in columns:
+            conn.execute("ALTER TABLE device_objects ADD COLUMN deleting INTEGER NOT NULL DEFAULT 0")
+        return conn
+
+    def get(self, octavia_id: str) -> DeviceObject | None:
+        """Look up an object by its Octavia ID."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(_FIELDS)} FROM device_objects WHERE octavia_id = ?", (octavia_id,)
+            ).fetchone()
+        return _from_row(row) if row else None
+
+    def children(self, parent_id: str, kind: str | None = None) -> list[DeviceObject]:
+        """Objects recorded under ``parent_id``, optionally of one kind."""
+        query = f"SELECT {', '.join(_FIELDS)} FROM device_objects WHERE parent_id = ?"
+        params: tuple[Any, ...] = (parent_id,)
+        if kind is not None:
+            query += " AND kind = ?"
+            params += (kind,)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [_from_row(row) for row in rows]
+
+    def all(self, kind: str | None = None, host: str | None = None) -> list[DeviceObject]:
+        """All recorded objects, optionally filtered by kind and device."""
+        query = f"SELECT {', '.join(_FIELDS)} FROM device_objects WHERE 1 = 1"
+        params: tuple[Any, ...] = ()
+        if kind is not None:
+            query += " AND kind = ?"
+            params += (kind,)
+        if host is not None:
+            query += " AND host = ?"
+            params += (host,)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [_from_row(row) for row in rows]
+
+    def put(self, *objects: DeviceObject) -> None:
+        """Insert or replace records in one transaction."""
+        if not objects:
+            return
+        placeholders = ", ".join("?" * len(_FIELDS))
+        with self._lock:
+            with self._transaction():
+                self._conn.executemany(
+                    f"INSERT OR REPLACE INTO device_objects ({', '.join(_FIELDS)}) VALUES ({placeholders})",
+                    [dataclasses.astuple(obj) for obj in objects]
+                )
+
+    def mark_deleting(self, *octavia_ids: str, deleting: bool = True) -> None:
+        """Flag records whose device objects are about to be removed.
+
+        With ``deleting=False`` the flag is cleared again, e.g. after a
+        failed delete.
+        """
+        if not octavia_ids:
+            return
+        with self._lock:
+            with self._transaction():
+                self._conn.executemany(
+                    "UPDATE device_objects SET deleting = ? WHERE octavia_id = ?",
+                    [(int(deleting), i) for i in octavia_ids]
+                )
+
+    def delete(self, *octavia_ids: str, cascade: bool = False) -> None:
+        """Remove records, and with ``cascade`` everything recorded under them."""
+        ids = list(octavia_ids)
+        with self._lock:
+            with self._transaction():
+                while ids:
+                    self._conn.executemany(
+                        "DELETE FROM device_objects WHERE octavia_id = ?", [(i,) for i in ids]
+                    )
+                    if not cascade:
+                        break
+                    marks = ", ".join("?" * len(ids))
+                    ids = [row[0] for row in self._conn.execute(
+                        f"SELECT octavia_id FROM device_objects WHERE parent_id IN ({marks})", ids
+                    )]
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
+
+    def _transaction(self) -> sqlite3.Connection:
+        # In autocommit mode the connection's context manager does not open a
+        # transaction by itself
+        self._conn.execute("BEGIN")
+        return self._conn
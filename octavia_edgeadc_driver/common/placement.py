@@ -0,0 +1,241 @@
+"""
+Load-aware placement of new load balancers on EdgeADC devices.
+
+When a load balancer may go to more than one device, the scheduler picks
+the least loaded one according to a placement strategy. Device load comes
+from VIP and content-server counts in the IP-services snapshot (/GET/9)
+and capacity and utilization from system info (/GET/5). A background
+thread keeps these figures cached, so placing a load balancer never waits
+for a device.
+"""
+from __future__ import annotations
+
+import dataclasses
+import importlib
+import logging
+import threading
+import time
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any, Callable
+
+from octavia_edgeadc_driver.api.snapshot import content_servers
+from octavia_edgeadc_driver.common import constants
+
+if TYPE_CHECKING:
+    from octavia_edgeadc_driver.api.edgeadc_client import EdgeADCClient
+    from octavia_edgeadc_driver.common.device_registry import DeviceConfig
+
+LOG = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass
+class DeviceLoad:
+    """Cached load figures of one device."""
+
+    host: str
+    vips: int = 0
+    members: int = 0
+    # Capacity and utilization, if the device reports them
+    max_vips: int | None = None
+    cpu: float | None = None
+    memory: float | None = None
+    # Load balancers placed on the device since the figures were read
+    placed: int = 0
+    updated: float = 0.0
+
+
+def system_load(info: Any) -> dict[str, float]:
+    """Read capacity and utilization figures from a system info response."""
+    load: dict[str, float] = {}
+    for figure, fields in constants.SYSTEM_LOAD_FIELDS.items():
+        for field in fields:
+            value = _find(info, field)
+            if value is not None:
+                load[figure] = value
+                break
+    return load
+
+
+def _find(node: Any, field: str) -> float | None:
+    """Find the first numeric ``field`` in a nested response."""
+    children: Iterable[Any]
+    if isinstance(node, dict):
+        if field in node:
+            try:
+                return float(str(node[field]).rstrip("%"))
+            except ValueError:
+                pass
+        children = node.values()
+    elif isinstance(node, list):
+        children = node
+    else:
+        return None
+    for child in children:
+        value = _find(child, field)
+        if value is not None:
+            return value
+    return None
+
+
+class PlacementStrategy:
+    """Base class of placement strategies; lower scores are preferred."""
+
+    name = ""
+
+    def score(self, load: DeviceLoad, loads: list[DeviceLoad]) -> float:
+        """Score one device against the other candidates."""
+        raise NotImplementedError
+
+    def choose(self, candidates: list[DeviceConfig], loads: dict[str, DeviceLoad]) -> DeviceConfig:
+        """Pick the candidate with the lowest score, earliest configured on ties."""
+        candidate_loads = [loads.get(d.host) or DeviceLoad(d.host) for d in candidates]
+        scores = [self.score(load, candidate_loads) for load in candidate_loads]
+        return candidates[scores.index(min(scores))]
+
+
+class LeastVIPsStrategy(PlacementStrategy):
+    """Prefer the device with the fewest VIPs."""
+
+    name = "least_vips"
+
+    def score(self, load: DeviceLoad, loads: list[DeviceLoad]) -> float:
+        return load.vips + load.placed
+
+
+class LeastMembersStrategy(PlacementStrategy):
+    """Prefer the device with the fewest content servers."""
+
+    name = "least_members"
+
+    def score(self, load: DeviceLoad, loads: list[DeviceLoad]) -> float:
+        # Count each new load balancer as at least one member to come
+        return load.members + load.placed
+
+
+class WeightedUtilizationStrategy(PlacementStrategy):
+    """Prefer the device with the lowest weighted VIP, CPU and memory use.
+
+    VIP use is relative to the device's VIP capacity, or to the busiest
+    candidate if the device does not report one. Figures a device does
+    not report are left out and the remaining weights rescaled.
+    """
+
+    name = "weighted_utilization"
+
+    def __init__(self, vip_weight: float = 0.5, cpu_weight: float = 0.3, memory_weight: float = 0.2) -> None:
+        self.vip_weight = vip_weight
+        self.cpu_weight = cpu_weight
+        self.memory_weight = memory_weight
+
+    def score(self, load: DeviceLoad, loads: list[DeviceLoad]) -> float:
+        busiest = max(max(other.vips + other.placed for other in loads), 1)
+        parts = [(self.vip_weight, (load.vips + load.placed) / (load.max_vips or busiest))]
+        if load.cpu is not None:
+            parts.append((self.cpu_weight, load.cpu / 100))
+        if load.memory is not None:
+            parts.append((self.memory_weight, load.memory / 100))
+        total = sum(weight for weight, _ in parts)
+        return sum(weight * value for weight, value in parts) / total if total else 0.0
+
+
+STRATEGIES: dict[str, type[PlacementStrategy]] = {
+    cls.name: cls for cls in (LeastVIPsStrategy, LeastMembersStrategy, WeightedUtilizationStrategy)
+}
+
+
+def load_strategy(name: str) -> PlacementStrategy:
+    """Create a strategy by name, or from a ``module:Class`` path."""
+    if name in STRATEGIES:
+        return STRATEGIES[name]()
+    module_name, _, class_name = name.partition(":")
+    if not class_name:
+        raise ValueError(f"Unknown placement strategy: {name}")
+    strategy = getattr(importlib.import_module(module_name), class_name)()
+    if not isinstance(strategy, PlacementStrategy):
+        raise ValueError(f"{name} is not a PlacementStrategy")
+    return strategy
+
+
+class PlacementScheduler:
+    """Picks devices for new load balancers from cached load figures."""
+
+    def __init__(
+        self,
+        strategy: PlacementStrategy,
+        get_client: Callable[[str], EdgeADCClient],
+        hosts: list[str],
+        refresh_interval: float = 60.0
+    ) -> None:
+        self.strategy = strategy
+        self.refresh_interval = refresh_interval
+        self._get_client = get_client
+        self._hosts = list(hosts)
+        self._loads: dict[str, DeviceLoad] = {host: DeviceLoad(host) for host in self._hosts}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def loads(self) -> dict[str, DeviceLoad]:
+        """Cached load figures per device host, as copies."""
+        with self._lock:
+            return {host: dataclasses.replace(load) for host, load in self._loads.items()}
+
+    def select(self, candidates: list[DeviceConfig]) -> DeviceConfig:
+        """Pick a device for a new load balancer and count it as placed."""
+        with self._lock:
+            device = candidates[0] if len(candidates) == 1 else self.strategy.choose(candidates, self._loads)
+            load = self._loads.setdefault(device.host, DeviceLoad(device.host))
+            load.placed += 1
+        return device
+
+    def refresh(self, host: str) -> DeviceLoad:
+        """Read a device's current load figures."""
+        client = self._get_client(host)
+        vips = client.get_snapshot(allow_warm=True).vips
+        load = DeviceLoad(
+            host,
+            vips=sum(1 for vip in vips if vip.get("ipAddr")),
+            members=sum(1 for vip in vips for cs in content_servers(vip) if cs.get("CSIPAddr")),
+            updated=time.monotonic()
+        )
+        figures = system_load(client.get_system_info())
+        if "max_vips" in figures:
+            load.max_vips = int(figures["max_vips"])
+        load.cpu = figures.get("cpu")
+        load.memory = figures.get("memory")
+        with self._lock:
+            self._loads[host] = load
+        return load
+
+    def refresh_all(self) -> None:
+        """Refresh every device, keeping the old figures of unreachable ones."""
+        for host in self._hosts:
+            try:
+                self.refresh(host)
+            except Exception as e:
+                LOG.warning(f"EdgeADC {host}: Failed to read load for placement: {e}")
+
+    def start(self) -> None:
+        """Refresh the load figures in the background.
+
+        With a refresh interval of 0 the figures are read once.
+        """
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="edgeadc-placement", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        """Stop the background refresh."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self.refresh_all()
+            if self.refresh_interval <= 0:
+                break
+            self._stopped.wait(self.refresh_interval)
@@ -0,0 +1,62 @@
+"""
+Token-bucket rate limiting for device mutations.
+
+Bulk work such as a full resync can issue thousands of writes. A
+per-device bucket spreads them out so the appliance's management plane
+keeps serving other requests.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable
+
+
+class TokenBucket:
+    """Allow ``rate`` operations per second with bursts of up to ``burst``."""
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ) -> None:
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: int = 1) -> bool:
+        """Take ``tokens`` if available now."""
+        if self.rate <= 0:
+            return True
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens: int = 1) -> float:
+        """Block until ``tokens`` are available; returns seconds waited."""
+        if self.rate <= 0:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= min(tokens, self.burst):
+                    self._tokens -= tokens
+                    return waited
+                delay = (min(tokens, self.burst) - self._tokens) / self.rate
+            self._sleep(delay)
+            waited += delay
@@ -0,0 +1,268 @@
+"""
+Desired-state reconciliation for the provider agent.
+
+Devices can lose configuration (a reboot, an edit in the GUI) without the
+driver noticing. The reconciler compares the listeners and members that
+Octavia expects, as recorded in the mapping store and confirmed through
+the driver library, with each device's IP-services snapshot. It repairs
+missing VIPs, missing content servers and weight drift in small batches,
+each committed by one config apply, under a per-device mutation rate
+limit. Objects on the device that the driver does not know about are left
+alone, and so are objects the driver is deleting.
+"""
+from __future__ import annotations
+
+import dataclasses
+import functools
+import logging
+import threading
+from typing import TYPE_CHECKING, Any, Callable
+
+from octavia_edgeadc_driver.api.snapshot import IPServicesSnapshot
+from octavia_edgeadc_driver.common.mapping_store import (
+    KIND_LISTENER,
+    KIND_MEMBER,
+    DeviceObject,
+    MappingStore,
+)
+from octavia_edgeadc_driver.common.rate_limit import TokenBucket
+
+if TYPE_CHECKING:
+    from octavia_edgeadc_driver.api.edgeadc_client import EdgeADCClient
+
+LOG = logging.getLogger(__name__)
+
+# /POST/9 writes each kind of repair sends, charged against the rate limit:
+# a VIP is a template create plus its fill-in, a member a placeholder plus
+# its fill-in
+_REPAIR_WRITES = {"vip": 2, "member": 2, "weight": 1}
+
+
+@dataclasses.dataclass
+class ReconcileReport:
+    """Outcome of one reconciliation pass over one device."""
+
+    host: str
+    vips_created: int = 0
+    members_added: int = 0
+    weights_fixed: int = 0
+    stale_mappings: int = 0
+    failures: int = 0
+    applies: int = 0
+
+    @property
+    def repairs(self) -> int:
+        """Number of device objects repaired."""
+        return self.vips_created + self.members_added + self.weights_fixed
+
+
+@dataclasses.dataclass
+class _Repair:
+    """One device write; ``kind`` is 'vip', 'member' or 'weight'."""
+
+    kind: str
+    mapping: DeviceObject
+    obj: Any
+    run: Callable[[], bool]
+
+
+class Reconciler:
+    """Repair drift between Octavia's desired state and the devices."""
+
+    def __init__(
+        self,
+        library: Any,
+        mappings: MappingStore,
+        clients: dict[str, EdgeADCClient],
+        rate: float = 5.0,
+        batch_size: int = 20,
+        subnet_mask: str = "255.255.255.0"
+    ) -> None:
+        self.library = library
+        self.mappings = mappings
+        self.clients = clients
+        self.batch_size = batch_size
+        self.subnet_mask = subnet_mask
+        self._limiters = {host: TokenBucket(rate, burst=batch_size) for host in clients}
+
+    def reconcile_once(self) -> list[ReconcileReport]:
+        """Check every device once and repair what drifted."""
+        reports = []
+        for host, client in self.clients.items():
+            try:
+                reports.append(self._reconcile_device(host, client))
+            except Exception as e:
+                LOG.exception(f"EdgeADC {host}: Reconciliation failed: {e}")
+        return reports
+
+    def _lookup(self, kind: str, octavia_id: str) -> Any:
+        getter = self.library.get_listener if kind == KIND_LISTENER else self.library.get_member
+        try:
+            return getter(octavia_id)
+        except Exception as e:
+            LOG.warning(f"Failed to look up {kind} {octavia_id}: {e}")
+            return None
+
+    def _reconcile_device(self, host: str, client: EdgeADCClient) -> ReconcileReport:
+        report = ReconcileReport(host)
+        snapshot = client.get_snapshot(max_age=0)
+        if not snapshot.vips:
+            # An empty or failed read is indistinguishable from a wiped
+            # device; do not recreate everything on a transient error
+            LOG.warning(f"EdgeADC {host}: No IP services returned; reconciliation skipped")
+            return report
+
+        repairs = self._plan(host, client, snapshot, report)
+        for start in range(0, len(repairs), self.batch_size):
+            self._execute(host, client, repairs[start:start + self.batch_size], report)
+        if report.repairs or report.failures:
+            LOG.info(f"EdgeADC {host}: Reconciled {report.vips_created} VIP(s), "
+                     f"{report.members_added} member(s), {report.weights_fixed} weight(s); "
+                     f"{report.failures} failure(s)")
+        return report
+
+    def _plan(
+        self,
+        host: str,
+        client: EdgeADCClient,
+        snapshot: IPServicesSnapshot,
+        report: ReconcileReport
+    ) -> list[_Repair]:
+        """Work out the device writes that restore the desired state."""
+        repairs: list[_Repair] = []
+        missing_vips: set[tuple[str, int]] = set()
+        for mapping in self.mappings.all(kind=KIND_LISTENER, host=host):
+            if mapping.deleting:
+                continue
+            if snapshot.find_vip(mapping.vip_ip, mapping.vip_port) is not None:
+                continue
+            listener = self._lookup(KIND_LISTENER, mapping.octavia_id)
+            if listener is None:
+                self.mappings.delete(mapping.octavia_id, cascade=True)
+                report.stale_mappings += 1
+                continue
+            missing_vips.add((mapping.vip_ip, mapping.vip_port))
+            run = functools.partial(self._create_vip, client, mapping, listener)
+            repairs.append(_Repair("vip", mapping, listener, run))
+
+        for mapping in self.mappings.all(kind=KIND_MEMBER, host=host):
+            if mapping.deleting:
+                continue
+            vip_missing = (mapping.vip_ip, mapping.vip_port) in missing_vips
+            if not vip_missing and snapshot.find_vip(mapping.vip_ip, mapping.vip_port) is None:
+                # The VIP is gone and its listener was not recreated
+                continue
+            server = None if vip_missing else snapshot.find_server(
+                mapping.vip_ip, mapping.vip_port, mapping.address, mapping.port)
+            if server is not None and (
+                mapping.weight is None or int(server.get("WeightFactor", 100)) == mapping.weight
+            ):
+                continue
+            # Only drifted members are confirmed with Octavia
+            member = self._lookup(KIND_MEMBER, mapping.octavia_id)
+            if member is None:
+                self.mappings.delete(mapping.octavia_id)
+                report.stale_mappings += 1
+                continue
+            weight = getattr(member, "weight", None) or 100
+            if weight != mapping.weight:
+                self.mappings.put(dataclasses.replace(mapping, weight=weight))
+            if server is None:
+                run = functools.partial(self._add_member, client, mapping, weight)
+                repairs.append(_Repair("member", mapping, member, run))
+            elif int(server.get("WeightFactor", 100)) != weight:
+                run = functools.partial(self._fix_weight, client, mapping, weight)
+                repairs.append(_Repair("weight", mapping, member, run))
+        return repairs
+
+    def _create_vip(self, client: EdgeADCClient, mapping: DeviceObject, listener: Any) -> bool:
+        success, _ = client.create_virtual_service(
+            ip_addr=mapping.vip_ip, port=mapping.vip_port, protocol=listener.protocol,
+            subnet_mask=self.subnet_mask,
+            service_name=listener.name or f"octavia-{mapping.octavia_id[:8]}", wait_apply=False
+        )
+        return success
+
+    @staticmethod
+    def _add_member(client: EdgeADCClient, mapping: DeviceObject, weight: int) -> bool:
+        success, _ = client.add_member(
+            vip_ip=mapping.vip_ip, vip_port=mapping.vip_port, member_ip=mapping.address,
+            member_port=mapping.port, weight=weight, wait_apply=False
+        )
+        return success
+
+    @staticmethod
+    def _fix_weight(client: EdgeADCClient, mapping: DeviceObject, weight: int) -> bool:
+        return client.update_member_weight(
+            vip_ip=mapping.vip_ip, vip_port=mapping.vip_port, member_ip=mapping.address,
+            member_port=mapping.port, weight=weight, wait_apply=False
+        )
+
+    def _execute(
+        self,
+        host: str,
+        client: EdgeADCClient,
+        batch: list[_Repair],
+        report: ReconcileReport
+    ) -> None:
+        """Run one batch of repairs and commit it with a single apply."""
+        done: list[_Repair] = []
+        with client.deferred_apply():
+            for repair in batch:
+                self._limiters[host].acquire(_REPAIR_WRITES[repair.kind])
+                current = self.mappings.get(repair.mapping.octavia_id)
+                if current is None or current.deleting:
+                    # Deleted by the driver since the pass was planned
+                    continue
+                try:
+                    ok = repair.run()
+                except Exception as e:
+                    LOG.warning(f"EdgeADC {host}: Repair of {repair.kind} "
+                                f"{repair.mapping.octavia_id} failed: {e}")
+                    ok = False
+                if ok:
+                    done.append(repair)
+                else:
+                    report.failures += 1
+        if not done:
+            return
+        self._limiters[host].acquire()
+        report.applies += 1
+        if not client.apply_config():
+            report.failures += len(done)
+            return
+
+        snapshot = client.get_snapshot()
+        for repair in done:
+            if repair.kind == "vip":
+                report.vips_created += 1
+                vip = snapshot.find_vip(repair.mapping.vip_ip, repair.mapping.vip_port)
+                if vip is not None:
+                    self._move_to_channel(host, vip)
+            elif repair.kind == "member":
+                report.members_added += 1
+                m = repair.mapping
+                server = snapshot.find_server(m.vip_ip, m.vip_port, m.address, m.port)
+                if server is not None:
+                    # Re-read: a VIP recreated in this batch moved the mapping
+                    current = self.mappings.get(m.octavia_id) or m
+                    self.mappings.put(dataclasses.replace(current, cid=int(server.get("cId", 0))))
+            else:
+                report.weights_fixed += 1
+
+    def _move_to_channel(self, host: str, vip: dict[str, Any]) -> None:
+        """Point every mapping on a recreated VIP at its new channel."""
+        moved = DeviceObject.from_vip("", "", host, vip)
+        self.mappings.put(*(
+            dataclasses.replace(
+                mapping, interface_id=moved.interface_id, channel_id=moved.channel_id,
+                channel_key=moved.channel_key
+            )
+            for mapping in self.mappings.all(host=host)
+            if (mapping.vip_ip, mapping.vip_port) == (moved.vip_ip, moved.vip_port)
+        ))
+
+    def run(self, interval: float, stop: threading.Event) -> None:
+        """Reconcile every ``interval`` seconds until ``stop`` is set."""
+        while not stop.wait(interval):
+            self.reconcile_once()
@@ -0,0 +1,193 @@
+"""
+Process-wide state shared by every provider driver instance.
+
+Octavia's driver factory loads a new driver object for every API request.
+Device sessions, template pools, orphan reapers, the placement
+scheduler, the operation executor and the status aggregator must outlive
+those objects: an operation accepted by one request has to be
+ordered against operations accepted by the next, and status updates from
+different requests have to be merged. They therefore live in one
+:class:`DriverRuntime` per process and configuration, created by the
+first driver and closed once when the process exits. Per-process startup
+work such as warm start runs once, when the runtime is created.
+"""
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import threading
+from typing import Any, Callable
+
+from octavia_edgeadc_driver.api.edgeadc_client import EdgeADCClient
+from octavia_edgeadc_driver.api.orphan_reaper import OrphanReaper
+from octavia_edgeadc_driver.api.template_pool import TemplatePool
+from octavia_edgeadc_driver.common import config as driver_config
+from octavia_edgeadc_driver.common.device_registry import DeviceConfig, DeviceRegistry
+from octavia_edgeadc_driver.common.executor import OperationExecutor
+from octavia_edgeadc_driver.common.mapping_store import MappingStore
+from octavia_edgeadc_driver.common.placement import PlacementScheduler, load_strategy
+from octavia_edgeadc_driver.common.status import StatusAggregator
+
+LOG = logging.getLogger(__name__)
+
+StatusFn = Callable[[dict[str, list[dict[str, Any]]]], Any]
+
+
+class DriverRuntime:
+    """Device sessions, queues and status batching of one driver configuration."""
+
+    def __init__(self, conf: Any, update_status: StatusFn) -> None:
+        self.conf = conf
+        self.devices = DeviceRegistry(driver_config.load_devices(conf))
+        self.mappings = MappingStore(conf.edgeadc.edgeadc_mapping_db)
+        self.clients: dict[str, EdgeADCClient] = {}
+        self.template_pools: dict[str, TemplatePool] = {}
+        self.reapers: dict[str, OrphanReaper] = {}
+        # Pool ID -> load balancer ID, learned from the driver library
+        self.pool_loadbalancers: dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.executor: OperationExecutor | None = None
+        if conf.edgeadc.edgeadc_worker_threads > 0:
+            self.executor = OperationExecutor(
+                conf.edgeadc.edgeadc_worker_threads,
+                device_concurrency=conf.edgeadc.edgeadc_device_concurrency
+            )
+        self.status: StatusAggregator | None = None
+        if conf.edgeadc.edgeadc_status_interval > 0:
+            self.status = StatusAggregator(
+                update_status,
+                interval=conf.edgeadc.edgeadc_status_interval,
+                max_batch=conf.edgeadc.edgeadc_status_batch_size
+            )
+        self.scheduler: PlacementScheduler | None = None
+        if len(self.devices.devices) > 1:
+            self.scheduler = PlacementScheduler(
+                load_strategy(conf.edgeadc.edgeadc_placement_strategy),
+                self.host_client,
+                [device.host for device in self.devices.devices],
+                refresh_interval=conf.edgeadc.edgeadc_placement_refresh_interval
+            )
+
+    def start(self) -> None:
+        """Warm-start the devices and start placement, once per process."""
+        if self.conf.edgeadc.edgeadc_snapshot_dir:
+            for device in self.devices.devices:
+                self.device_client(device).warm_start()
+        if self.scheduler is not None:
+            self.scheduler.start()
+
+    def host_client(self, host: str) -> EdgeADCClient:
+        """Get or create the client of a configured device by its host."""
+        device = self.devices.get(host)
+        if device is None:
+            raise ValueError(f"Unknown EdgeADC device: {host}")
+        return self.device_client(device)
+
+    def device_client(self, device: DeviceConfig) -> EdgeADCClient:
+        """Get or create the client of a device."""
+        with self._lock:
+            client = self.clients.get(device.host)
+            if client is None:
+                client = self.clients[device.host] = EdgeADCClient(
+                    host=device.host,
+                    username=device.username,
+                    password=device.password,
+                    port=device.port,
+                    timeout=device.timeout,
+                    verify_ssl=device.verify_ssl,
+                    peers=device.peers,
+                    cache_ttl=self.conf.edgeadc.edgeadc_cache_ttl,
+                    apply_delay=self.conf.edgeadc.edgeadc_apply_delay,
+                    poll_timeout=self.conf.edgeadc.edgeadc_poll_timeout,
+                    snapshot_path=self.snapshot_path(device.host)
+                )
+                if self.conf.edgeadc.edgeadc_template_pool_size > 0:
+                    pool = TemplatePool(
+                        client,
+                        size=self.conf.edgeadc.edgeadc_template_pool_size,
+                        refill_interval=self.conf.edgeadc.edgeadc_template_pool_interval
+                    )
+                    pool.start()
+                    self.template_pools[device.host] = pool
+                if self.conf.edgeadc.edgeadc_orphan_reap_interval > 0:
+                    # One reaper per device for the whole process: it shares
+                    # the client, so it sees every template and placeholder
+                    # reserved by any driver instance of this process
+                    reaper = OrphanReaper(
+                        client,
+                        grace_period=self.conf.edgeadc.edgeadc_orphan_grace_period,
+                        interval=self.conf.edgeadc.edgeadc_orphan_reap_interval,
+                        batch_size=self.conf.edgeadc.edgeadc_orphan_batch_size
+                    )
+                    reaper.start()
+                    self.reapers[device.host] = reaper
+            return client
+
+    def snapshot_path(self, host: str) -> str | None:
+        """Get the file a device's snapshot is saved to, if warm start is enabled."""
+        directory = self.conf.edgeadc.edgeadc_snapshot_dir
+        if not directory:
+            return None
+        return os.path.join(directory, f"edgeadc_snapshot_{host}.json")
+
+    def close(self) -> None:
+        """Finish queued operations, send pending statuses, reclaim pooled
+        templates and close sessions."""
+        if self.scheduler is not None:
+            self.scheduler.close()
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+        if self.status is not None:
+            self.status.close()
+        for reaper in self.reapers.values():
+            reaper.close()
+        self.reapers.clear()
+        for pool in self.template_pools.values():
+            try:
+                pool.close()
+            except Exception as e:
+                LOG.warning(f"Failed to reclaim VIP templates on {pool.client.host}: {e}")
+        self.template_pools.clear()
+        for client in self.clients.values():
+            client.close()
+        self.clients.clear()
+        self.mappings.close()
+
+
+_runtimes: dict[tuple[Any, ...], DriverRuntime] = {}
+_runtimes_lock = threading.Lock()
+
+
+def get_runtime(conf: Any, update_status: StatusFn) -> DriverRuntime:
+    """Get the runtime of the current configuration, creating it on first use."""
+    key = (tuple(driver_config.load_devices(conf)), conf.edgeadc.edgeadc_mapping_db)
+    with _runtimes_lock:
+        runtime = _runtimes.get(key)
+        if runtime is None:
+            runtime = _runtimes[key] = DriverRuntime(conf, update_status)
+            runtime.start()
+            LOG.info("EdgeADC driver runtime started")
+        return runtime
+
+
+def close_runtime(runtime: DriverRuntime) -> None:
+    """Close a runtime; the next driver instance starts a new one."""
+    with _runtimes_lock:
+        for key, current in list(_runtimes.items()):
+            if current is runtime:
+                del _runtimes[key]
+    runtime.close()
+
+
+@atexit.register
+def close_runtimes() -> None:
+    """Close every runtime of this process."""
+    with _runtimes_lock:
+        runtimes = list(_runtimes.values())
+        _runtimes.clear()
+    for runtime in runtimes:
+        try:
+            runtime.close()
+        except Exception as e:
+            LOG.warning(f"Failed to close EdgeADC driver runtime: {e}")
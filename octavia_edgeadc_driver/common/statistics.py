@@ -0,0 +1,133 @@
+"""
+Listener statistics collection for the provider agent.
+
+The device exposes cumulative traffic counters per VIP. The collector
+reads them for every listener in the mapping store, turns them into the
+deltas Octavia expects (active connections stay absolute) and submits
+them in batches through ``update_listener_statistics``. Per listener only
+the last counter sample and, if a submit failed, one merged unsent delta
+are kept. VIPs that expose no counters are skipped rather than reported
+as idle.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from typing import TYPE_CHECKING, Any, Callable
+
+from octavia_edgeadc_driver.common import constants
+from octavia_edgeadc_driver.common.mapping_store import KIND_LISTENER, MappingStore
+
+if TYPE_CHECKING:
+    from octavia_edgeadc_driver.api.edgeadc_client import EdgeADCClient
+
+LOG = logging.getLogger(__name__)
+
+
+def vip_counters(vip: dict[str, Any]) -> dict[str, int] | None:
+    """Read the traffic counters of a VIP; None if it carries none."""
+    counters: dict[str, int] = {}
+    for stat, fields in constants.VIP_COUNTER_FIELDS.items():
+        for field in fields:
+            if field in vip:
+                try:
+                    counters[stat] = int(vip[field])
+                except (TypeError, ValueError):
+                    pass
+                break
+    return counters or None
+
+
+class ListenerStatsCollector:
+    """Submit per-listener traffic deltas to Octavia."""
+
+    def __init__(
+        self,
+        send_fn: Callable[[dict[str, list[dict[str, Any]]]], Any],
+        mappings: MappingStore,
+        clients: dict[str, EdgeADCClient],
+        batch_size: int = 100,
+        stats_path: str | None = None
+    ) -> None:
+        self._send_fn = send_fn
+        self.mappings = mappings
+        self.clients = clients
+        self.batch_size = batch_size
+        self.stats_path = stats_path
+        # Last counter sample per listener ID
+        self._last: dict[str, tuple[int, ...]] = {}
+        # Deltas whose submit failed, merged into the next one
+        self._unsent: dict[str, dict[str, Any]] = {}
+        # Devices already reported as exposing no counters
+        self._no_counters: set[str] = set()
+
+    @staticmethod
+    def _delta(stat: str, current: int, previous: int) -> int:
+        if stat in constants.VIP_GAUGE_COUNTERS:
+            return current
+        # A counter that went backwards was reset on the device
+        return current - previous if current >= previous else current
+
+    def collect_once(self) -> int:
+        """Sample every device once and submit deltas; returns listener count."""
+        stats_names = tuple(constants.VIP_COUNTER_FIELDS)
+        updates: list[dict[str, Any]] = []
+        seen: set[str] = set()
+        for host, client in self.clients.items():
+            listeners = self.mappings.all(kind=KIND_LISTENER, host=host)
+            if not listeners:
+                continue
+            by_address = {
+                (vip.get("ipAddr"), str(vip.get("port", ""))): vip
+                for vip in client.get_vip_counters(self.stats_path)
+            }
+            for listener in listeners:
+                vip = by_address.get((listener.vip_ip, str(listener.vip_port)))
+                if vip is None:
+                    continue
+                counters = vip_counters(vip)
+                if counters is None:
+                    # Submitting zeros would report an idle listener
+                    if host not in self._no_counters:
+                        self._no_counters.add(host)
+                        LOG.warning(
+                            f"EdgeADC {host}: VIP {listener.vip_ip}:{listener.vip_port} carries no "
+                            f"traffic counters; statistics of such listeners are not submitted"
+                        )
+                    continue
+                seen.add(listener.octavia_id)
+                sample = tuple(counters.get(stat, 0) for stat in stats_names)
+                previous = self._last.get(listener.octavia_id)
+                self._last[listener.octavia_id] = sample
+                if previous is None:
+                    # First sample only sets the baseline
+                    continue
+                update: dict[str, Any] = {"id": listener.octavia_id}
+                unsent = self._unsent.pop(listener.octavia_id, {})
+                for stat, current, before in zip(stats_names, sample, previous):
+                    update[stat] = self._delta(stat, current, before)
+                    if stat not in constants.VIP_GAUGE_COUNTERS:
+                        update[stat] += unsent.get(stat, 0)
+                updates.append(update)
+
+        for listener_id in self._last.keys() - seen:
+            del self._last[listener_id]
+            self._unsent.pop(listener_id, None)
+
+        for start in range(0, len(updates), self.batch_size):
+            batch = updates[start:start + self.batch_size]
+            try:
+                self._send_fn({"listeners": batch})
+            except Exception as e:
+                LOG.error(f"Failed to submit statistics of {len(batch)} listener(s): {e}")
+                self._unsent.update((update["id"], update) for update in batch)
+        return len(updates)
+
+    def run(self, interval: float, stop: threading.Event) -> None:
+        """Collect every ``interval`` seconds until ``stop`` is set."""
+        while not stop.is_set():
+            try:
+                self.collect_once()
+            except Exception as e:
+                LOG.exception(f"Listener statistics collection failed: {e}")
+            stop.wait(interval)
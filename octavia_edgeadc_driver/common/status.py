@@ -0,0 +1,128 @@
+"""
+Batched status reporting to Octavia.
+
+Every ``update_loadbalancer_status`` call is a round trip over the driver
+agent socket. The aggregator merges status updates for load balancers,
+listeners, pools, members and health monitors into one combined dict and
+sends it after a short window, or as soon as enough objects are pending.
+When an object is updated twice before a flush, the newer values win.
+A batch that fails to send is merged back under any newer updates and
+retried with exponential backoff, so no object is left pending in Octavia.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Any, Callable
+
+LOG = logging.getLogger(__name__)
+
+# Order in which resource types appear in a combined update
+STATUS_RESOURCES = ("loadbalancers", "listeners", "pools", "members", "healthmonitors",
+                    "l7policies", "l7rules")
+
+
+class StatusAggregator:
+    """Merge status updates and send them in batches."""
+
+    def __init__(
+        self,
+        send_fn: Callable[[dict[str, list[dict[str, Any]]]], Any],
+        interval: float = 0.2,
+        max_batch: int = 100,
+        max_retry_interval: float = 30.0
+    ) -> None:
+        self.interval = interval
+        self.max_batch = max_batch
+        self.max_retry_interval = max_retry_interval
+        self._send_fn = send_fn
+        self._lock = threading.Lock()
+        # Serializes sends so batches reach Octavia in the order they were cut
+        self._send_lock = threading.Lock()
+        self._pending: dict[tuple[str, str], dict[str, Any]] = {}
+        self._timer: threading.Timer | None = None
+        # Consecutive failed sends; retries back off while this is non-zero
+        self._failures = 0
+        self._closed = False
+        self.sent_batches = 0
+        self.sent_updates = 0
+
+    @property
+    def pending(self) -> int:
+        """Number of objects with an unsent status."""
+        with self._lock:
+            return len(self._pending)
+
+    def update(self, status_dict: dict[str, list[dict[str, Any]]]) -> None:
+        """Queue status updates, in the ``update_loadbalancer_status`` format."""
+        with self._lock:
+            for resource, updates in status_dict.items():
+                for update in updates:
+                    key = (resource, update["id"])
+                    self._pending.setdefault(key, {}).update(update)
+            # While retrying, leave sending to the backoff timer
+            full = len(self._pending) >= self.max_batch and not self._failures
+            if not full and self._pending:
+                self._schedule(self.interval)
+        if full:
+            self.flush()
+
+    def _schedule(self, delay: float) -> None:
+        """Start the flush timer unless one is already running; caller holds the lock."""
+        if self._timer is None and not self._closed:
+            self._timer = threading.Timer(delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self) -> bool:
+        """Send all pending updates now; returns False if sending failed."""
+        with self._send_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return True
+
+            combined: dict[str, list[dict[str, Any]]] = {}
+            for (resource, _), update in pending.items():
+                combined.setdefault(resource, []).append(update)
+            combined = {r: combined[r] for r in sorted(combined, key=self._resource_order)}
+            try:
+                self._send_fn(combined)
+            except Exception as e:
+                with self._lock:
+                    # Updates queued since the batch was cut are newer and win
+                    for key, update in pending.items():
+                        self._pending[key] = {**update, **self._pending.get(key, {})}
+                    self._failures += 1
+                    delay = min(self.interval * 2 ** self._failures, self.max_retry_interval)
+                    self._schedule(delay)
+                LOG.error(f"Failed to update status of {len(pending)} object(s), "
+                          f"retrying in {delay:.1f}s: {e}")
+                return False
+            with self._lock:
+                self._failures = 0
+            self.sent_batches += 1
+            self.sent_updates += len(pending)
+            LOG.debug(f"Sent status of {len(pending)} object(s) in one update")
+            return True
+
+    def close(self) -> None:
+        """Send whatever is still pending and stop retrying."""
+        sent = self.flush()
+        with self._lock:
+            self._closed = True
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not sent:
+                LOG.error(f"Dropping status of {len(self._pending)} object(s) at shutdown")
+
+    @staticmethod
+    def _resource_order(resource: str) -> int:
+        try:
+            return STATUS_RESOURCES.index(resource)
+        except ValueError:
+            return len(STATUS_RESOURCES)
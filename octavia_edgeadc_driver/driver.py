@@ -6,6 +6,7 @@ OpenStack to use EdgeNexus EdgeADC as a load balancer backend.
 """
 from __future__ import annotations
 
+import dataclasses
 import logging
 from typing import Any
 
@@ -16,6 +17,22 @@ from oslo_config import cfg
 from octavia_edgeadc_driver.api.edgeadc_client import EdgeADCClient
 from octavia_edgeadc_driver.common import config as driver_config
 from octavia_edgeadc_driver.common import constants
+from octavia_edgeadc_driver.common import runtime as driver_runtime
+from octavia_edgeadc_driver.common.device_registry import (
+    AZ_CLUSTER_KEY,
+    FLAVOR_DEVICE_KEY,
+    DeviceConfig,
+)
+from octavia_edgeadc_driver.common.executor import OperationExecutor, QueueStats
+from octavia_edgeadc_driver.common.mapping_store import (
+    KIND_LISTENER,
+    KIND_LOADBALANCER,
+    KIND_MEMBER,
+    KIND_POOL,
+    DeviceObject,
+)
+from octavia_edgeadc_driver.common.placement import PlacementScheduler
+from octavia_edgeadc_driver.common.status import StatusAggregator
 
 LOG = logging.getLogger(__name__)
 CONF = cfg.CONF
@@ -34,39 +51,175 @@ class EdgeADCProviderDriver(provider_base.ProviderDriver):
     - Octavia Pool -> EdgeADC load balancing configuration
     - Octavia Member -> EdgeADC Content Server
     - Octavia HealthMonitor -> EdgeADC Monitoring Policy
+
+    Octavia creates a driver per API request. Device sessions, the
+    operation queues, status batching and the mapping store are shared by
+    all instances of a process through a :class:`DriverRuntime`.
     """
 
     def __init__(self):
         super().__init__()
         self.driver_lib = driver_lib.DriverLibrary()
-        self._clients: dict[str, EdgeADCClient] = {}
+        self._runtime = driver_runtime.get_runtime(CONF, self.driver_lib.update_loadbalancer_status)
+        self._devices = self._runtime.devices
+        self._clients = self._runtime.clients
+        self._template_pools = self._runtime.template_pools
+        self._pool_loadbalancers = self._runtime.pool_loadbalancers
+        self._mappings = self._runtime.mappings
         LOG.info("EdgeADC provider driver initialized")
 
+    def close(self) -> None:
+        """Close the shared runtime.
+
+        Octavia never calls this; the runtime is closed when the process
+        exits. It is meant for tools and tests that own the process.
+        """
+        driver_runtime.close_runtime(self._runtime)
+
+    @property
+    def _executor(self) -> OperationExecutor | None:
+        """Background executor shared by every driver instance of this process."""
+        return self._runtime.executor
+
+    @property
+    def _scheduler(self) -> PlacementScheduler | None:
+        """Placement scheduler shared by every driver instance of this process."""
+        return self._runtime.scheduler
+
+    @property
+    def _status(self) -> StatusAggregator | None:
+        """Status aggregator shared by every driver instance of this process."""
+        return self._runtime.status
+
     def _get_client(self, loadbalancer_id: str = None) -> EdgeADCClient:
-        """Get or create an EdgeADC client."""
-        host = CONF.edgeadc.edgeadc_host
-        if host not in self._clients:
-            self._clients[host] = EdgeADCClient(
-                host=host,
-                username=CONF.edgeadc.edgeadc_username,
-                password=CONF.edgeadc.edgeadc_password,
-                port=CONF.edgeadc.edgeadc_port,
-                timeout=CONF.edgeadc.edgeadc_request_timeout,
-                verify_ssl=CONF.edgeadc.edgeadc_verify_ssl
+        """Get the client of the device a load balancer is placed on."""
+        return self._device_client(self._loadbalancer_device(loadbalancer_id))
+
+    def _device_client(self, device: DeviceConfig) -> EdgeADCClient:
+        """Get or create the client of a device."""
+        return self._runtime.device_client(device)
+
+    def _loadbalancer_device(self, loadbalancer_id: str | None) -> DeviceConfig:
+        """Get the device a load balancer is bound to, or the default device."""
+        if len(self._devices.devices) == 1 or not loadbalancer_id:
+            return self._devices.default
+        mapping = self._mappings.get(loadbalancer_id)
+        device = self._devices.get(mapping.host) if mapping is not None else None
+        if device is None:
+            if mapping is not None:
+                LOG.warning(f"Load balancer {loadbalancer_id} is bound to unknown device {mapping.host}")
+            return self._devices.default
+        return device
+
+    def _pool_device(self, pool_id: str) -> DeviceConfig:
+        """Get the device a pool's VIP lives on."""
+        if len(self._devices.devices) == 1:
+            return self._devices.default
+        mapping = self._mappings.get(pool_id)
+        device = self._devices.get(mapping.host) if mapping is not None else None
+        return device or self._loadbalancer_device(self._pool_loadbalancer_id(pool_id))
+
+    def _place_loadbalancer(self, loadbalancer: data_models.LoadBalancer) -> DeviceConfig:
+        """Bind a new load balancer to a device allowed by its flavor and AZ."""
+        mapping = self._mappings.get(loadbalancer.loadbalancer_id)
+        device = self._devices.get(mapping.host) if mapping is not None else None
+        if device is not None:
+            return device
+        candidates = self._devices.candidates(
+            getattr(loadbalancer, 'flavor', None), getattr(loadbalancer, 'availability_zone', None))
+        if not candidates:
+            raise driver_exceptions.DriverError(
+                user_fault_string="No EdgeADC device matches the load balancer's flavor and availability zone",
+                operator_fault_string=f"No EdgeADC device for load balancer {loadbalancer.loadbalancer_id}"
             )
-        return self._clients[host]
+        device = self._scheduler.select(candidates) if self._scheduler is not None else candidates[0]
+        vip_address = getattr(loadbalancer, 'vip_address', None)
+        self._mappings.put(DeviceObject(
+            loadbalancer.loadbalancer_id, KIND_LOADBALANCER, device.host,
+            vip_ip=vip_address if isinstance(vip_address, str) else ""
+        ))
+        LOG.info(f"Load balancer {loadbalancer.loadbalancer_id} placed on EdgeADC {device.name} ({device.host})")
+        return device
 
     def _update_status(self, status_dict: dict[str, list[dict[str, str]]]) -> None:
-        """Update resource status in Octavia."""
+        """Update resource status in Octavia, batched if configured."""
+        if self._status is not None:
+            self._status.update(status_dict)
+            return
         try:
             self.driver_lib.update_loadbalancer_status(status_dict)
         except Exception as e:
             LOG.error(f"Failed to update status: {e}")
 
+    def _dispatch(
+        self,
+        loadbalancer_id: str,
+        resource: str,
+        obj_id: str,
+        pending_status: str,
+        fn,
+        *args: Any
+    ) -> None:
+        """Run the device work of an operation.
+
+        With worker threads configured the object is reported as pending,
+        the work is queued behind earlier operations on the same load
+        balancer and the API call returns immediately; the final status is
+        reported by the worker. Otherwise the work runs inline and errors
+        propagate to Octavia as before.
+        """
+        if self._executor is None:
+            fn(*args)
+            return
+        self._update_status({resource: [{"id": obj_id, "provisioning_status": pending_status}]})
+        self._executor.submit(
+            loadbalancer_id, f"{resource}:{obj_id}", self._run_operation, resource, [obj_id],
+            fn, *args, device=self._loadbalancer_device(loadbalancer_id).host
+        )
+
+    def _pool_loadbalancer_id(self, pool_id: str) -> str:
+        """Get the load balancer a pool belongs to, falling back to the pool ID."""
+        loadbalancer_id = self._pool_loadbalancers.get(pool_id)
+        if loadbalancer_id is None:
+            try:
+                pool = self.driver_lib.get_pool(pool_id)
+            except Exception as e:
+                LOG.warning(f"Failed to look up pool {pool_id}: {e}")
+                pool = None
+            loadbalancer_id = getattr(pool, "loadbalancer_id", None)
+            if not loadbalancer_id:
+                return pool_id
+            self._pool_loadbalancers[pool_id] = loadbalancer_id
+        return loadbalancer_id
+
+    def queue_stats(self) -> dict[str, QueueStats]:
+        """Queue depth and wait times of pending operations per load balancer."""
+        return self._executor.stats() if self._executor is not None else {}
+
+    def _run_operation(self, resource: str, obj_ids: list[str], fn, *args: Any) -> None:
+        """Worker body: run ``fn`` and report ERROR if it fails."""
+        try:
+            fn(*args)
+        except Exception as e:
+            LOG.error(f"EdgeADC operation on {resource} {obj_ids} failed: {e}")
+            self._update_status({resource: [
+                {"id": obj_id, "provisioning_status": constants.PROVISIONING_STATUS_ERROR}
+                for obj_id in obj_ids
+            ]})
+
     # ========== Load Balancer Operations ==========
 
     def loadbalancer_create(self, loadbalancer: data_models.LoadBalancer) -> None:
         """Create a new load balancer."""
+        self._place_loadbalancer(loadbalancer)
+        self._dispatch(
+            loadbalancer.loadbalancer_id,
+            "loadbalancers", loadbalancer.loadbalancer_id, constants.PROVISIONING_STATUS_PENDING_CREATE,
+            self._loadbalancer_create, loadbalancer
+        )
+
+    def _loadbalancer_create(self, loadbalancer: data_models.LoadBalancer) -> None:
+        """Log in to the device and activate the load balancer."""
         LOG.info(f"Creating load balancer: {loadbalancer.loadbalancer_id}")
         try:
             client = self._get_client(loadbalancer.loadbalancer_id)
@@ -101,8 +254,21 @@ class EdgeADCProviderDriver(provider_base.ProviderDriver):
 
     def loadbalancer_delete(self, loadbalancer: data_models.LoadBalancer, cascade: bool = False) -> None:
         """Delete a load balancer."""
+        self._dispatch(
+            loadbalancer.loadbalancer_id,
+            "loadbalancers", loadbalancer.loadbalancer_id, constants.PROVISIONING_STATUS_PENDING_DELETE,
+            self._loadbalancer_delete, loadbalancer
+        )
+        if self._executor is not None:
+            # Statistics are dropped once the delete and everything queued
+            # before it have run
+            self._executor.forget(loadbalancer.loadbalancer_id)
+
+    def _loadbalancer_delete(self, loadbalancer: data_models.LoadBalancer) -> None:
+        """Forget the load balancer's mappings once its earlier operations ran."""
         LOG.info(f"Deleting load balancer: {loadbalancer.loadbalancer_id}")
         try:
+            self._mappings.delete(loadbalancer.loadbalancer_id, cascade=True)
             self._update_status({
                 "loadbalancers": [{
                     "id": loadbalancer.loadbalancer_id,
@@ -138,18 +304,40 @@ class EdgeADCProviderDriver(provider_base.ProviderDriver):
 
     def listener_create(self, listener: data_models.Listener) -> None:
         """Create a new listener (EdgeADC VIP)."""
+        self._dispatch(
+            listener.loadbalancer_id,
+            "listeners", listener.listener_id, constants.PROVISIONING_STATUS_PENDING_CREATE,
+            self._listener_create, listener
+        )
+
+    def _listener_create(self, listener: data_models.Listener) -> None:
+        """Create the listener's VIP on the device."""
         LOG.info(f"Creating listener: {listener.listener_id}")
         try:
             client = self._get_client(listener.loadbalancer_id)
-            vip_address = getattr(listener, 'vip_address', CONF.edgeadc.edgeadc_host)
-            success, _ = client.create_virtual_service(
-                ip_addr=vip_address,
-                port=listener.protocol_port,
-                protocol=listener.protocol,
-                subnet_mask=CONF.edgeadc.edgeadc_default_subnet_mask,
-                service_name=listener.name or f"octavia-{listener.listener_id[:8]}"
-            )
+            vip_address, vip_port = self._listener_vip(listener)
+            pool = self._template_pools.get(client.host)
+            template = pool.acquire() if pool else None
+            success = False
+            try:
+                success, _ = client.create_virtual_service(
+                    ip_addr=vip_address,
+                    port=vip_port,
+                    protocol=listener.protocol,
+                    subnet_mask=CONF.edgeadc.edgeadc_default_subnet_mask,
+                    service_name=listener.name or f"octavia-{listener.listener_id[:8]}",
+                    template=template
+                )
+            finally:
+                if pool and template is not None and not success:
+                    pool.put_back(template)
             if success:
+                vip = client.get_snapshot().find_vip(vip_address, vip_port) or {
+                    "ipAddr": vip_address, "port": vip_port}
+                self._mappings.put(DeviceObject.from_vip(
+                    listener.listener_id, KIND_LISTENER, client.host, vip,
+                    parent_id=listener.loadbalancer_id
+                ))
                 self._update_status({
                     "listeners": [{"id": listener.listener_id, "provisioning_status": constants.PROVISIONING_STATUS_ACTIVE, "operating_status": constants.OPERATING_STATUS_ONLINE}]
                 })
@@ -163,13 +351,25 @@ class EdgeADCProviderDriver(provider_base.ProviderDriver):
 
     def listener_delete(self, listener: data_models.Listener) -> None:
         """Delete a listener."""
+        self._dispatch(
+            listener.loadbalancer_id,
+            "listeners", listener.listener_id, constants.PROVISIONING_STATUS_PENDING_DELETE,
+            self._listener_delete, listener
+        )
+
+    def _listener_delete(self, listener: data_models.Listener) -> None:
+        """Delete the listener's VIP from the device."""
         LOG.info(f"Deleting listener: {listener.listener_id}")
         try:
             client = self._get_client(listener.loadbalancer_id)
-            vip_address = getattr(listener, 'vip_address', CONF.edgeadc.edgeadc_host)
-            client.delete_virtual_service(vip_address, listener.protocol_port)
+            vip_address, vip_port = self._listener_vip(listener)
+            # Keep the reconciler from recreating the VIP while it goes away
+            self._mappings.mark_deleting(listener.listener_id)
+            client.delete_virtual_service(vip_address, vip_port)
+            self._mappings.delete(listener.listener_id, cascade=True)
             self._update_status({"listeners": [{"id": listener.listener_id, "provisioning_status": constants.PROVISIONING_STATUS_DELETED}]})
         except Exception as e:
+            self._mappings.mark_deleting(listener.listener_id, deleting=False)
             raise driver_exceptions.DriverError(user_fault_string="Failed to delete listener", operator_fault_string=str(e))
 
     def listener_update(self, old_listener: data_models.Listener, new_listener: data_models.Listener) -> None:
@@ -182,11 +382,18 @@ class EdgeADCProviderDriver(provider_base.ProviderDriver):
     def pool_create(self, pool: data_models.Pool) -> None:
         """Create a new pool."""
         LOG.info(f"Creating pool: {pool.pool_id}")
+        listener_id = getattr(pool, 'listener_id', None)
+        listener = self._mappings.get(listener_id) if listener_id else None
+        if listener is not None:
+            self._mappings.put(dataclasses.replace(
+                listener, octavia_id=pool.pool_id, kind=KIND_POOL, parent_id=listener_id))
         self._update_status({"pools": [{"id": pool.pool_id, "provisioning_status": constants.PROVISIONING_STATUS_ACTIVE, "operating_status": constants.OPERATING_STATUS_ONLINE}]})
 
     def pool_delete(self, pool: data_models.Pool) -> None:
         """Delete a pool."""
         LOG.info(f"Deleting pool: {pool.pool_id}")
+        self._pool_loadbalancers.pop(pool.pool_id, None)
+        self._mappings.delete(pool.pool_id, cascade=True)
         self._update_status({"pools": [{"id": pool.pool_id, "provisioning_status": constants.PROVISIONING_STATUS_DELETED}]})
 
     def pool_update(self, old_pool: data_models.Pool, new_pool: data_models.Pool) -> None:
@@ -198,17 +405,28 @@ class EdgeADCProviderDriver(provider_base.ProviderDriver):
 
     def member_create(self, member: data_models.Member) -> None:
         """Create a new member (EdgeADC content server)."""
+        self._dispatch(
+            self._pool_loadbalancer_id(member.pool_id),
+            "members", member.member_id, constants.PROVISIONING_STATUS_PENDING_CREATE,
+            self._member_create, member
+        )
+
+    def _member_create(self, member: data_models.Member) -> None:
+        """Add the member's content server on the device."""
         LOG.info(f"Creating member: {member.member_id}")
         try:
-            client = self._get_client()
-            vip_address = getattr(member, 'vip_address', CONF.edgeadc.edgeadc_host)
-            vip_port = getattr(member, 'vip_port', 80)
+            client = self._device_client(self._pool_device(member.pool_id))
+            vip_address, vip_port = self._required_member_vip(member)
             success, _ = client.add_member(
                 vip_ip=vip_address, vip_port=vip_port,
                 member_ip=member.address, member_port=member.protocol_port,
                 weight=member.weight or 100
             )
             if success:
+                server = client.get_snapshot().find_server(
+                    vip_address, vip_port, member.address, member.protocol_port) or {}
+                self._record_members(client, member.pool_id, vip_address, vip_port,
+                                     [(member, server.get("cId"))])
                 self._update_status({"members": [{"id": member.member_id, "provisioning_status": constants.PROVISIONING_STATUS_ACTIVE, "operating_status": constants.OPERATING_STATUS_ONLINE}]})
             else:
                 raise driver_exceptions.DriverError(user_fault_string="Failed to add member to EdgeADC")
@@ -220,36 +438,236 @@ class EdgeADCProviderDriver(provider_base.ProviderDriver):
 
     def member_delete(self, member: data_models.Member) -> None:
         """Delete a member."""
+        self._dispatch(
+            self._pool_loadbalancer_id(member.pool_id),
+            "members", member.member_id, constants.PROVISIONING_STATUS_PENDING_DELETE,
+            self._member_delete, member
+        )
+
+    def _member_delete(self, member: data_models.Member) -> None:
+        """Remove the member's content server from the device."""
         LOG.info(f"Deleting member: {member.member_id}")
         try:
-            client = self._get_client()
-            vip_address = getattr(member, 'vip_address', CONF.edgeadc.edgeadc_host)
-            vip_port = getattr(member, 'vip_port', 80)
+            client = self._device_client(self._pool_device(member.pool_id))
+            vip_address, vip_port = self._required_member_vip(member)
+            self._mappings.mark_deleting(member.member_id)
             client.delete_member(vip_ip=vip_address, vip_port=vip_port, member_ip=member.address, member_port=member.protocol_port)
+            self._mappings.delete(member.member_id)
             self._update_status({"members": [{"id": member.member_id, "provisioning_status": constants.PROVISIONING_STATUS_DELETED}]})
         except Exception as e:
+            self._mappings.mark_deleting(member.member_id, deleting=False)
             raise driver_exceptions.DriverError(user_fault_string="Failed to delete member", operator_fault_string=str(e))
 
     def member_update(self, old_member: data_models.Member, new_member: data_models.Member) -> None:
         """Update a member."""
+        self._dispatch(
+            self._pool_loadbalancer_id(new_member.pool_id),
+            "members", new_member.member_id, constants.PROVISIONING_STATUS_PENDING_UPDATE,
+            self._member_update, new_member
+        )
+
+    def _member_update(self, new_member: data_models.Member) -> None:
+        """Apply the member's new weight on the device."""
         LOG.info(f"Updating member: {new_member.member_id}")
         try:
             if hasattr(new_member, 'weight') and new_member.weight:
-                client = self._get_client()
-                vip_address = getattr(new_member, 'vip_address', CONF.edgeadc.edgeadc_host)
-                vip_port = getattr(new_member, 'vip_port', 80)
+                client = self._device_client(self._pool_device(new_member.pool_id))
+                vip_address, vip_port = self._required_member_vip(new_member)
                 client.update_member_weight(vip_ip=vip_address, vip_port=vip_port, member_ip=new_member.address, member_port=new_member.protocol_port, weight=new_member.weight)
+                self._record_weight(new_member.member_id, new_member.weight)
             self._update_status({"members": [{"id": new_member.member_id, "provisioning_status": constants.PROVISIONING_STATUS_ACTIVE}]})
         except Exception as e:
             raise driver_exceptions.DriverError(user_fault_string="Failed to update member", operator_fault_string=str(e))
 
     def member_batch_update(self, pool_id: str, members: list[data_models.Member]) -> None:
-        """Batch update members."""
+        """Batch update members.
+
+        ``members`` is the pool's complete new membership. It is diffed
+        against the VIP's content servers and the resulting adds, weight
+        changes and deletes are committed with a single config apply.
+        """
+        if self._executor is None:
+            self._member_batch_update(pool_id, members)
+            return
+        self._update_status({"members": [
+            {"id": m.member_id, "provisioning_status": constants.PROVISIONING_STATUS_PENDING_UPDATE}
+            for m in members
+        ]})
+        self._executor.submit(
+            self._pool_loadbalancer_id(pool_id), f"pools:{pool_id}", self._run_operation,
+            "members", [m.member_id for m in members], self._member_batch_update, pool_id, members,
+            device=self._pool_device(pool_id).host
+        )
+
+    def _member_batch_update(self, pool_id: str, members: list[data_models.Member]) -> None:
+        """Diff and apply a pool's new membership on the device."""
+        LOG.info(f"Batch updating {len(members)} member(s) of pool: {pool_id}")
+        vip = self._member_vip(members[0]) if members else self._pool_vip(pool_id)
+        if vip is None:
+            LOG.warning(f"Could not resolve the VIP of pool {pool_id}; batch update skipped")
+            return
+        vip_address, vip_port = vip
+        client = self._device_client(self._pool_device(pool_id))
+        results: dict[str, bool] = {}
+        marked: list[str] = []
+        removed: list[str] = []
+        try:
+            current = {
+                (m["ip_address"], m["port"]): m
+                for m in client.get_members(vip_address, vip_port, max_age=0)
+            }
+            desired = {(m.address, m.protocol_port): m for m in members}
+            to_add = [m for key, m in desired.items() if key not in current]
+            to_update = [
+                m for key, m in desired.items()
+                if key in current and (m.weight or 100) != current[key]["weight"]
+            ]
+            to_delete = [key for key in current if key not in desired]
+            # Members removed from the pool are known by ID through the mapping
+            # store, or through Octavia for those never recorded
+            mapped = {
+                (m.address, m.port): m.octavia_id
+                for m in self._mappings.children(pool_id, KIND_MEMBER)
+            }
+            if any(key not in mapped for key in to_delete):
+                mapped = {**self._pool_member_ids(pool_id), **mapped}
+            marked = [mapped[key] for key in to_delete if key in mapped]
+            self._mappings.mark_deleting(*marked)
+
+            with client.deferred_apply():
+                if to_add:
+                    _, added = client.add_members(vip_address, vip_port, [
+                        {"ip_address": m.address, "port": m.protocol_port, "weight": m.weight or 100}
+                        for m in to_add
+                    ])
+                    for member, result in zip(to_add, added):
+                        results[member.member_id] = result["success"]
+                    self._record_members(client, pool_id, vip_address, vip_port, [
+                        (member, result["cId"])
+                        for member, result in zip(to_add, added) if result["success"]
+                    ])
+                for member in to_update:
+                    results[member.member_id] = client.update_member_weight(
+                        vip_ip=vip_address, vip_port=vip_port, member_ip=member.address,
+                        member_port=member.protocol_port, weight=member.weight or 100)
+                    if results[member.member_id]:
+                        self._record_weight(member.member_id, member.weight or 100)
+                deleted = [
+                    key for key in to_delete
+                    if client.delete_member(
+                        vip_ip=vip_address, vip_port=vip_port, member_ip=key[0], member_port=key[1])
+                ]
+
+            if to_add or to_update or deleted:
+                if not client.apply_config():
+                    results = dict.fromkeys(results, False)
+                    deleted = []
+            removed = [mapped[key] for key in deleted if key in mapped]
+            self._mappings.delete(*removed)
+            LOG.info(f"Pool {pool_id}: {len(to_add)} added, {len(to_update)} updated, "
+                     f"{len(deleted)}/{len(to_delete)} deleted")
+        except Exception as e:
+            LOG.exception(f"Failed to batch update members of pool {pool_id}: {e}")
+            results = dict.fromkeys((m.member_id for m in members), False)
+            removed = []
+        # Members still on the device are the reconciler's to look after again
+        self._mappings.mark_deleting(*(i for i in marked if i not in removed), deleting=False)
+
+        statuses = []
         for member in members:
-            try:
-                self.member_create(member)
-            except Exception as e:
-                LOG.warning(f"Failed to create member {member.member_id}: {e}")
+            if results.get(member.member_id, True):
+                statuses.append({"id": member.member_id, "provisioning_status": constants.PROVISIONING_STATUS_ACTIVE, "operating_status": constants.OPERATING_STATUS_ONLINE})
+            else:
+                statuses.append({"id": member.member_id, "provisioning_status": constants.PROVISIONING_STATUS_ERROR})
+        statuses.extend(
+            {"id": member_id, "provisioning_status": constants.PROVISIONING_STATUS_DELETED}
+            for member_id in removed
+        )
+        if statuses:
+            self._update_status({"members": statuses})
+
+    def _member_vip(self, member: data_models.Member) -> tuple[str, int] | None:
+        """Get the (address, port) of the VIP a member belongs to."""
+        mapping = self._mappings.get(member.member_id)
+        if mapping is not None and mapping.vip_ip:
+            return mapping.vip_ip, mapping.vip_port
+        return self._pool_vip(member.pool_id)
+
+    def _required_member_vip(self, member: data_models.Member) -> tuple[str, int]:
+        """Like ``_member_vip``, but fail the operation if the VIP is unknown."""
+        vip = self._member_vip(member)
+        if vip is None:
+            raise driver_exceptions.DriverError(
+                user_fault_string=f"Could not resolve the VIP of pool {member.pool_id}"
+            )
+        return vip
+
+    def _listener_vip(self, listener: data_models.Listener) -> tuple[str, int]:
+        """Get the (address, port) of a listener's VIP."""
+        mapping = self._mappings.get(listener.listener_id)
+        if mapping is not None and mapping.vip_ip:
+            return mapping.vip_ip, mapping.vip_port
+        loadbalancer = self._mappings.get(listener.loadbalancer_id)
+        if loadbalancer is not None and loadbalancer.vip_ip:
+            return loadbalancer.vip_ip, listener.protocol_port
+        return getattr(listener, 'vip_address', CONF.edgeadc.edgeadc_host), listener.protocol_port
+
+    def _record_members(
+        self,
+        client: EdgeADCClient,
+        pool_id: str,
+        vip_address: str,
+        vip_port: int,
+        members: list[tuple[data_models.Member, Any]]
+    ) -> None:
+        """Store the device coordinates of members and their content-server cIds."""
+        if not members:
+            return
+        vip = client.get_snapshot().find_vip(vip_address, vip_port) or {
+            "ipAddr": vip_address, "port": vip_port}
+        template = DeviceObject.from_vip("", KIND_MEMBER, client.host, vip, parent_id=pool_id)
+        self._mappings.put(*(
+            dataclasses.replace(
+                template, octavia_id=member.member_id, address=member.address,
+                port=member.protocol_port, cid=int(cid) if cid is not None else None,
+                weight=member.weight or 100
+            )
+            for member, cid in members
+        ))
+
+    def _record_weight(self, member_id: str, weight: int) -> None:
+        """Remember a member's configured weight."""
+        mapping = self._mappings.get(member_id)
+        if mapping is not None and mapping.weight != weight:
+            self._mappings.put(dataclasses.replace(mapping, weight=weight))
+
+    def _pool_member_ids(self, pool_id: str) -> dict[tuple[str, int], str]:
+        """Map (address, port) to member ID for the members Octavia has in a pool."""
+        try:
+            pool = self.driver_lib.get_pool(pool_id)
+        except Exception as e:
+            LOG.warning(f"Failed to look up pool {pool_id}: {e}")
+            return {}
+        return {
+            (m.address, m.protocol_port): m.member_id
+            for m in getattr(pool, "members", None) or []
+        }
+
+    def _pool_vip(self, pool_id: str) -> tuple[str, int] | None:
+        """Resolve a pool's VIP through its listener and load balancer."""
+        mapping = self._mappings.get(pool_id)
+        if mapping is not None and mapping.vip_ip:
+            return mapping.vip_ip, mapping.vip_port
+        try:
+            pool = self.driver_lib.get_pool(pool_id)
+            listener = self.driver_lib.get_listener(pool.listener_id) if pool else None
+            loadbalancer = self.driver_lib.get_loadbalancer(pool.loadbalancer_id) if pool else None
+        except Exception as e:
+            LOG.warning(f"Failed to look up pool {pool_id}: {e}")
+            return None
+        if not listener or not loadbalancer:
+            return None
+        return loadbalancer.vip_address, listener.protocol_port
 
     # ========== Health Monitor Operations ==========
 
@@ -289,19 +707,25 @@ class EdgeADCProviderDriver(provider_base.ProviderDriver):
     # ========== Flavor/AZ Support ==========
 
     def get_supported_flavor_metadata(self) -> dict[str, str]:
-        return {"edgeadc_device": "EdgeADC device hostname", "ssl_offload": "Enable SSL offload", "compression": "Enable compression"}
+        return {FLAVOR_DEVICE_KEY: "EdgeADC device name or hostname", "ssl_offload": "Enable SSL offload", "compression": "Enable compression"}
 
     def validate_flavor(self, flavor_metadata: dict[str, Any]) -> None:
         supported = self.get_supported_flavor_metadata()
         for key in flavor_metadata:
             if key not in supported:
                 raise driver_exceptions.UnsupportedOptionError(user_fault_string=f"Unsupported flavor option: {key}")
+        device = flavor_metadata.get(FLAVOR_DEVICE_KEY)
+        if device and self._devices.get(device) is None:
+            raise driver_exceptions.UnsupportedOptionError(user_fault_string=f"Unknown EdgeADC device: {device}")
 
     def get_supported_availability_zone_metadata(self) -> dict[str, str]:
-        return {"edgeadc_cluster": "EdgeADC cluster for this AZ"}
+        return {AZ_CLUSTER_KEY: "EdgeADC cluster for this AZ"}
 
     def validate_availability_zone(self, availability_zone_metadata: dict[str, Any]) -> None:
         supported = self.get_supported_availability_zone_metadata()
         for key in availability_zone_metadata:
             if key not in supported:
                 raise driver_exceptions.UnsupportedOptionError(user_fault_string=f"Unsupported AZ option: {key}")
+        cluster = availability_zone_metadata.get(AZ_CLUSTER_KEY)
+        if cluster and cluster not in self._devices.clusters:
+            raise driver_exceptions.UnsupportedOptionError(user_fault_string=f"Unknown EdgeADC cluster: {cluster}")
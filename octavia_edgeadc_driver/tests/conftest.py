@@ -1,10 +1,16 @@
 """
 Pytest configuration and fixtures for EdgeADC driver tests.
 """
+import copy
+import itertools
+import json
 from unittest.mock import Mock
 
+import httpx
 import pytest
 
+from octavia_edgeadc_driver.api.edgeadc_client import EdgeADCClient
+
 
 @pytest.fixture
 def mock_edgeadc_client():
@@ -45,3 +51,124 @@ def mock_listener():
     listener.protocol_port = 80
     listener.default_pool_id = "pool-123"
     return listener
+
+
+@pytest.fixture
+def ip_services_response():
+    """Create a /GET/9 response with one VIP and two content servers."""
+    return {
+        "data": {
+            "dataset": {
+                "ipService": [[
+                    {
+                        "InterfaceID": "1",
+                        "ChannelID": "2",
+                        "ChannelKey": "12",
+                        "ipAddr": "10.0.0.100",
+                        "port": "80",
+                        "serviceName": "test-vip",
+                        "contentServer": {
+                            "CServerId": [
+                                {"cId": "1", "CSIPAddr": "10.0.1.1", "CSPort": "8080",
+                                 "WeightFactor": "100", "statusReason": "Online"},
+                                {"cId": "2", "CSIPAddr": "10.0.1.2", "CSPort": "8080",
+                                 "WeightFactor": "50", "statusReason": "Online"},
+                            ]
+                        }
+                    }
+                ]]
+            }
+        }
+    }
+
+
+class FakeEdgeADC:
+    """In-memory EdgeADC answering the REST calls made by the clients."""
+
+    def __init__(self):
+        self.vips = []
+        self.requests = []
+        self.applies = 0
+        self._channels = itertools.count(1)
+        self._cids = itertools.count(1)
+
+    def add_vip(self, ip_addr, port, servers=()):
+        """Add a configured VIP with (ip, port, weight) content servers."""
+        channel = str(next(self._channels))
+        vip = {"InterfaceID": "1", "ChannelID": channel, "ChannelKey": channel,
+               "ipAddr": ip_addr, "port": str(port), "serviceName": f"vip-{channel}",
+               "serviceType": "HTTP", "subnetMask": "255.255.255.0",
+               "contentServer": {"CServerId": []}}
+        for ip, cs_port, weight in servers:
+            vip["contentServer"]["CServerId"].append({
+                "cId": str(next(self._cids)), "CSIPAddr": ip, "CSPort": str(cs_port),
+                "WeightFactor": str(weight), "statusReason": "Online",
+                "imagePath": "images/jnpsStateGreen.gif"})
+        self.vips.append(vip)
+        return vip
+
+    def response(self):
+        return {"success": True, "data": {"dataset": {"ipService": [copy.deepcopy(self.vips)]}}}
+
+    def _vip(self, payload):
+        for vip in self.vips:
+            if (vip["InterfaceID"], vip["ChannelID"]) == (payload["editedInterface"], payload["editedChannel"]):
+                return vip
+        return None
+
+    def _mutate(self, action, kind, payload):
+        if (action, kind) == ("3", "1"):
+            self.add_vip("", "")["serviceName"] = ""
+            return
+        vip = self._vip(payload)
+        if vip is None:
+            return
+        servers = vip["contentServer"]["CServerId"]
+        if (action, kind) == ("2", "1"):
+            vip.update({k: payload[k] for k in ("ipAddr", "port", "serviceName", "serviceType", "subnetMask")})
+        elif (action, kind) == ("3", "4"):
+            self.vips.remove(vip)
+        elif (action, kind) == ("3", "3"):
+            servers.append({"cId": str(next(self._cids)), "CSIPAddr": "", "CSPort": ""})
+        elif (action, kind) == ("2", "2"):
+            for server in servers:
+                if server["cId"] == payload["cId"]:
+                    server.update({k: v for k, v in payload.items() if k.startswith("CS") or k == "WeightFactor"})
+        elif (action, kind) == ("3", "5"):
+            servers[:] = [cs for cs in servers if cs["cId"] != payload["cId"]]
+
+    def handler(self, request):
+        path = request.url.path
+        self.requests.append((request.method, path, dict(request.url.params)))
+        if path == "/POST/32":
+            return httpx.Response(200, json={"GUID": "f" * 32})
+        if path == "/GET/9":
+            return httpx.Response(200, json=self.response())
+        if path == "/POST/9":
+            self._mutate(request.url.params.get("iAction"), request.url.params.get("iType"),
+                         json.loads(request.content))
+            return httpx.Response(200, json=self.response())
+        if path == "/POST/5":
+            self.applies += 1
+            return httpx.Response(200, json={"success": True})
+        return httpx.Response(200, json={})
+
+    def count(self, method, path, **params):
+        """Count requests to ``path`` whose query contains ``params``."""
+        return sum(1 for m, p, q in self.requests
+                   if m == method and p == path and all(q.get(k) == v for k, v in params.items()))
+
+
+@pytest.fixture
+def fake_device():
+    """Create an in-memory EdgeADC device."""
+    return FakeEdgeADC()
+
+
+@pytest.fixture
+def fake_client(fake_device):
+    """Create an EdgeADCClient talking to the in-memory device."""
+    client = EdgeADCClient(host="192.168.1.100", username="admin", password="x", cache_ttl=60)
+    client._client = httpx.Client(transport=httpx.MockTransport(fake_device.handler))
+    yield client
+    client.close()
@@ -0,0 +1,55 @@
+"""
+Unit tests for the coalescing apply scheduler.
+"""
+import threading
+from unittest.mock import Mock
+
+from octavia_edgeadc_driver.api.apply_scheduler import ApplyScheduler
+
+
+class TestApplyScheduler:
+    """Tests for ApplyScheduler."""
+
+    def test_requests_in_window_share_one_apply(self):
+        """Test changes made within the window are applied once."""
+        apply_fn = Mock(return_value=True)
+        scheduler = ApplyScheduler(apply_fn, window=0.05)
+        tickets = [scheduler.request() for _ in range(10)]
+        assert scheduler.wait(tickets[-1], timeout=2)
+        assert scheduler.wait(tickets[0], timeout=2)
+        assert apply_fn.call_count == 1
+        assert scheduler.pending == 0
+
+    def test_flush_applies_immediately(self):
+        """Test flush does not wait for the window."""
+        apply_fn = Mock(return_value=True)
+        scheduler = ApplyScheduler(apply_fn, window=60)
+        scheduler.request()
+        assert scheduler.flush(timeout=2)
+        assert apply_fn.call_count == 1
+        assert scheduler.flush(timeout=2)
+        assert apply_fn.call_count == 1
+
+    def test_failed_apply_is_reported(self):
+        """Test waiters see the outcome of the apply covering them."""
+        scheduler = ApplyScheduler(Mock(return_value=False), window=0.01)
+        assert not scheduler.wait(scheduler.request(), timeout=2)
+
+    def test_change_during_apply_gets_next_apply(self):
+        """Test a change made while applying is covered by a later apply."""
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_apply():
+            started.set()
+            release.wait(2)
+            return True
+
+        apply_fn = Mock(side_effect=slow_apply)
+        scheduler = ApplyScheduler(apply_fn, window=0.01)
+        scheduler.request()
+        assert started.wait(2)
+        late = scheduler.request()
+        release.set()
+        assert scheduler.wait(late, timeout=2)
+        assert apply_fn.call_count == 2
@@ -0,0 +1,112 @@
+"""
+Unit tests for the asyncio EdgeADC client.
+"""
+import asyncio
+import json
+
+import httpx
+
+from octavia_edgeadc_driver.api.async_client import AsyncEdgeADCClient
+from octavia_edgeadc_driver.common import constants
+
+
+def _client(handler, **kwargs):
+    """Create an async client whose requests are answered by ``handler``."""
+    client = AsyncEdgeADCClient(host="192.168.1.100", username="admin", password="x", **kwargs)
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+class TestAsyncEdgeADCClient:
+    """Tests for AsyncEdgeADCClient."""
+
+    def test_login_once_for_concurrent_reads(self, ip_services_response):
+        """Test concurrent reads share one login and the cached snapshot."""
+        requests = []
+
+        def handler(request):
+            requests.append(request.url.path)
+            if request.url.path == constants.API_LOGIN:
+                return httpx.Response(200, json={"GUID": "g" * 32})
+            return httpx.Response(200, json=ip_services_response)
+
+        async def run():
+            client = _client(handler, cache_ttl=60)
+            await client.get_ip_services()
+            results = await asyncio.gather(*[client.get_members("10.0.0.100", 80) for _ in range(5)])
+            await client.close()
+            return results
+
+        results = asyncio.run(run())
+        assert all(len(r) == 2 for r in results)
+        assert requests.count(constants.API_LOGIN) == 1
+        assert requests.count(constants.API_IP_SERVICES) == 1
+
+    def test_coalesced_weight_updates(self, ip_services_response):
+        """Test concurrent mutations share one debounced apply."""
+        bodies = []
+
+        def handler(request):
+            if request.url.path == constants.API_LOGIN:
+                return httpx.Response(200, json={"GUID": "g" * 32})
+            if request.method == "POST":
+                bodies.append((request.url.path, json.loads(request.content)))
+                return httpx.Response(200, json={"success": True})
+            return httpx.Response(200, json=ip_services_response)
+
+        async def run():
+            client = _client(handler, cache_ttl=60, apply_delay=0.05)
+            await client.get_snapshot()
+            results = await asyncio.gather(
+                client.update_member_weight("10.0.0.100", 80, "10.0.1.1", 8080, 10),
+                client.update_member_weight("10.0.0.100", 80, "10.0.1.2", 8080, 20),
+            )
+            await client.close()
+            return results
+
+        assert asyncio.run(run()) == [True, True]
+        paths = [path for path, _ in bodies]
+        assert paths.count("/POST/5") == 1
+        assert {b["WeightFactor"] for p, b in bodies if p == "/POST/9"} == {"10", "20"}
+
+    def test_concurrent_member_adds(self, fake_device):
+        """Test concurrent adds to one VIP each fill their own placeholder."""
+        fake_device.add_vip("10.0.0.100", 80)
+
+        async def run():
+            client = _client(fake_device.handler, cache_ttl=60)
+            results = await asyncio.gather(*[
+                client.add_member("10.0.0.100", 80, f"10.0.2.{i}", 8080) for i in range(1, 6)
+            ])
+            await client.close()
+            return results
+
+        assert [success for success, _ in asyncio.run(run())] == [True] * 5
+        servers = fake_device.vips[0]["contentServer"]["CServerId"]
+        assert sorted(cs["CSIPAddr"] for cs in servers) == [f"10.0.2.{i}" for i in range(1, 6)]
+
+    def test_deferred_apply_is_per_task(self, fake_device):
+        """Test a task deferring applies does not suppress another task's apply."""
+        fake_device.add_vip("10.0.0.100", 80)
+
+        async def run():
+            client = _client(fake_device.handler, cache_ttl=60)
+            entered, done = asyncio.Event(), asyncio.Event()
+
+            async def deferring():
+                with client.deferred_apply():
+                    entered.set()
+                    await done.wait()
+
+            async def adding():
+                await entered.wait()
+                result = await client.add_member("10.0.0.100", 80, "10.0.2.1", 8080)
+                done.set()
+                return result
+
+            _, (success, _) = await asyncio.gather(deferring(), adding())
+            await client.close()
+            return success
+
+        assert asyncio.run(run())
+        assert fake_device.applies == 1
@@ -2,6 +2,15 @@
 Unit tests for EdgeADC REST client.
 """
 import base64
+import json
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import httpx
+
+from octavia_edgeadc_driver.api.snapshot import IPServicesSnapshot
+from octavia_edgeadc_driver.common import constants
 
 
 class TestEdgeADCClientInit:
@@ -30,6 +39,396 @@ class TestEdgeADCClientInit:
         assert encoded == "dGVzdHBhc3M="
 
 
+class TestSnapshotCache:
+    """Tests for the cached IP-services snapshot."""
+
+    def _client(self, **kwargs):
+        from octavia_edgeadc_driver.api.edgeadc_client import EdgeADCClient
+        client = EdgeADCClient(host="192.168.1.100", username="admin", password="x", **kwargs)
+        client._guid = "test-guid"
+        return client
+
+    def test_reads_are_served_from_cache(self, ip_services_response):
+        """Test repeated reads within the TTL fetch the dataset once."""
+        client = self._client(cache_ttl=60)
+        with patch.object(client, "_get", return_value=(200, ip_services_response)) as get:
+            assert client.get_members("10.0.0.100", 80)
+            assert client.get_members("10.0.0.100", 80)
+            assert len(client.get_ip_services()) == 1
+        assert get.call_count == 1
+
+    def test_max_age_zero_forces_fetch(self, ip_services_response):
+        """Test max_age=0 bypasses the cache."""
+        client = self._client(cache_ttl=60)
+        with patch.object(client, "_get", return_value=(200, ip_services_response)) as get:
+            client.get_ip_services()
+            client.get_ip_services(max_age=0)
+        assert get.call_count == 2
+
+    def test_zero_ttl_disables_cache(self, ip_services_response):
+        """Test cache_ttl=0 fetches on every read."""
+        client = self._client(cache_ttl=0)
+        with patch.object(client, "_get", return_value=(200, ip_services_response)) as get:
+            client.get_ip_services()
+            client.get_ip_services()
+        assert get.call_count == 2
+
+    def test_mutation_invalidates_cache(self, ip_services_response):
+        """Test a /POST/9 without a dataset drops the cached snapshot."""
+        client = self._client(cache_ttl=60)
+        http = client._get_client()
+        with patch.object(client, "_get", return_value=(200, ip_services_response)) as get, \
+                patch.object(http, "post") as post:
+            post.return_value.content = b""
+            post.return_value.status_code = 200
+            client.get_ip_services()
+            client._post(constants.API_VIP_DELETE, {})
+            client.get_ip_services()
+        assert get.call_count == 2
+        client.close()
+
+    def test_mutation_response_refreshes_cache(self, ip_services_response):
+        """Test a /POST/9 response dataset replaces the snapshot."""
+        client = self._client(cache_ttl=60)
+        http = client._get_client()
+        with patch.object(client, "_get") as get, patch.object(http, "post") as post:
+            post.return_value.content = b"{}"
+            post.return_value.status_code = 200
+            post.return_value.json.return_value = ip_services_response
+            client._post(constants.API_SERVER_ADD_UPDATE, {})
+            assert client.get_members("10.0.0.100", 80)
+        get.assert_not_called()
+        client.close()
+
+    def test_older_response_does_not_overwrite_newer(self, ip_services_response):
+        """Test a /POST/9 answered after a later one keeps the later dataset."""
+        client = self._client(cache_ttl=60)
+        http = client._get_client()
+        stale = {"data": {"dataset": {"ipService": [[]]}}}
+
+        def post(url, **kwargs):
+            response = Mock(content=b"{}", status_code=200)
+            if not post.nested:
+                # A second change is sent and answered while the first is in flight
+                post.nested = True
+                response.json.return_value = stale
+                client._post(constants.API_SERVER_ADD_UPDATE, {})
+            else:
+                response.json.return_value = ip_services_response
+            return response
+
+        post.nested = False
+        with patch.object(client, "_get") as get, patch.object(http, "post", side_effect=post):
+            client._post(constants.API_SERVER_ADD_UPDATE, {})
+            assert client.get_members("10.0.0.100", 80)
+        get.assert_not_called()
+        client.close()
+
+    def test_create_uses_template_from_response(self, ip_services_response):
+        """Test VIP create finds its template without polling."""
+        client = self._client()
+        before = json.loads(json.dumps(ip_services_response))
+        template = {"InterfaceID": "1", "ChannelID": "3", "ChannelKey": "13", "ipAddr": ""}
+        ip_services_response["data"]["dataset"]["ipService"][0].append(template)
+        created = {"data": {"dataset": {"ipService": [[
+            {"InterfaceID": "1", "ChannelID": "3", "ipAddr": "10.0.0.101", "port": "80"}
+        ]]}}}
+        with patch.object(client, "_get", side_effect=[(200, before), (200, created)]) as get, \
+                patch.object(client, "_post", return_value=(200, ip_services_response)) as post:
+            success, _ = client.create_virtual_service("10.0.0.101", 80)
+        assert success
+        update = post.call_args_list[1]
+        assert update.args[0] == constants.API_VIP_UPDATE_TEMPLATE
+        assert update.args[1]["editedChannel"] == "3"
+        # One GET reads the templates before the create, one confirms the VIP
+        assert get.call_count == 2
+        assert post.call_args_list[-1].args[0] == constants.API_APPLY_CONFIG
+
+
+class TestCoalescedApply:
+    """Tests for applying changes through the apply scheduler."""
+
+    def test_mutations_share_one_apply(self, ip_services_response):
+        """Test non-waiting mutations are committed by one apply."""
+        from octavia_edgeadc_driver.api.edgeadc_client import EdgeADCClient
+        client = EdgeADCClient(host="192.168.1.100", username="admin", password="x",
+                               cache_ttl=60, apply_delay=60)
+        client._guid = "test-guid"
+        with patch.object(client, "_get", return_value=(200, ip_services_response)), \
+                patch.object(client, "_post", return_value=(200, None)) as post:
+            assert client.update_member_weight("10.0.0.100", 80, "10.0.1.1", 8080, 10, wait_apply=False)
+            assert client.update_member_weight("10.0.0.100", 80, "10.0.1.2", 8080, 20, wait_apply=False)
+            assert client.flush_apply(timeout=2)
+        paths = [c.args[0] for c in post.call_args_list]
+        assert paths.count(constants.API_APPLY_CONFIG) == 1
+        assert paths[-1] == constants.API_APPLY_CONFIG
+
+
+class TestBulkAddMembers:
+    """Tests for EdgeADCClient.add_members()."""
+
+    def test_one_apply_for_all_members(self, fake_device, fake_client):
+        """Test N placeholders and N updates are committed by one apply."""
+        fake_device.add_vip("10.0.0.100", 80, [("10.0.1.1", 8080, 100)])
+        members = [{"ip_address": f"10.0.2.{i}", "port": 8080, "weight": i} for i in range(1, 21)]
+        success, results = fake_client.add_members("10.0.0.100", 80, members)
+        assert success
+        assert all(r["success"] for r in results)
+        assert len({r["cId"] for r in results}) == 20
+        assert fake_device.applies == 1
+        assert fake_device.count("GET", "/GET/9") == 1
+        assert fake_device.count("POST", "/POST/9", iAction="3", iType="3") == 20
+        configured = {(m["ip_address"], m["weight"]) for m in fake_client.get_members("10.0.0.100", 80)}
+        assert ("10.0.2.7", 7) in configured
+        assert len(configured) == 21
+
+    def test_existing_placeholders_are_not_reused(self, fake_device, fake_client):
+        """Test stale blank placeholders are left for their owner."""
+        vip = fake_device.add_vip("10.0.0.100", 80)
+        vip["contentServer"]["CServerId"].append({"cId": "99", "CSIPAddr": ""})
+        success, results = fake_client.add_members(
+            "10.0.0.100", 80, [{"ip_address": "10.0.2.1", "port": 8080}])
+        assert success
+        assert results[0]["cId"] != "99"
+
+    def test_failed_create_leaves_no_placeholders(self, fake_device, fake_client):
+        """Test placeholders created but not filled are removed."""
+        fake_device.add_vip("10.0.0.100", 80)
+        handler = fake_device.handler
+        inits = []
+
+        def failing_handler(request):
+            response = handler(request)
+            if request.url.params.get("iAction") == "3" and request.url.params.get("iType") == "3":
+                inits.append(request)
+                if len(inits) == 2:
+                    # The device added the placeholder but reported an error
+                    return httpx.Response(500, json={})
+            return response
+
+        fake_client._client = httpx.Client(transport=httpx.MockTransport(failing_handler))
+        members = [{"ip_address": f"10.0.2.{i}", "port": 8080} for i in range(1, 4)]
+        success, results = fake_client.add_members("10.0.0.100", 80, members)
+        assert not success
+        assert [r["success"] for r in results] == [True, False, False]
+        servers = fake_device.vips[0]["contentServer"]["CServerId"]
+        assert [cs["CSIPAddr"] for cs in servers] == ["10.0.2.1"]
+        assert not fake_client._reserved_placeholders
+
+    def test_create_confirmed_from_response(self, fake_device, fake_client):
+        """Test a created VIP is confirmed from the /POST/9 response, without polling."""
+        success, _ = fake_client.create_virtual_service("10.0.0.101", 80)
+        assert success
+        # Only the read of the templates that existed before the create
+        assert fake_device.count("GET", "/GET/9") == 1
+
+    def test_ids_read_from_device(self, fake_device, fake_client):
+        """Test deletes use the device's current IDs, not a stale cached snapshot."""
+        fake_device.add_vip("10.0.0.100", 80, [("10.0.1.1", 8080, 100)])
+        fake_client.get_snapshot()
+        fake_device.vips.clear()
+        recreated = fake_device.add_vip("10.0.0.100", 80, [("10.0.1.1", 8080, 100)])
+        assert fake_client.delete_member("10.0.0.100", 80, "10.0.1.1", 8080)
+        assert recreated["contentServer"]["CServerId"] == []
+        assert fake_client.delete_virtual_service("10.0.0.100", 80)
+        assert fake_device.vips == []
+
+    def test_missing_vip(self, fake_device, fake_client):
+        """Test adding to an unknown VIP fails without device writes."""
+        success, results = fake_client.add_members(
+            "10.0.0.200", 80, [{"ip_address": "10.0.2.1", "port": 8080}])
+        assert not success
+        assert not results[0]["success"]
+        assert fake_device.applies == 0
+
+
+class TestConcurrency:
+    """Tests for sharing one EdgeADCClient between threads."""
+
+    def _run(self, *targets):
+        threads = [threading.Thread(target=t) for t in targets]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def test_member_adds_run_in_parallel(self, fake_device, fake_client):
+        """Test member adds overlap, on one VIP too, and each fills its own placeholder."""
+        fake_device.add_vip("10.0.0.100", 80)
+        fake_device.add_vip("10.0.0.101", 80)
+        in_flight: dict[str, int] = {}
+        overlap = {"same_vip": 0, "total": 0}
+        lock = threading.Lock()
+        handler = fake_device.handler
+
+        def slow_handler(request):
+            if request.url.path != "/POST/9":
+                return handler(request)
+            channel = json.loads(request.content).get("editedChannel")
+            with lock:
+                in_flight[channel] = in_flight.get(channel, 0) + 1
+                overlap["same_vip"] = max(overlap["same_vip"], in_flight[channel])
+                overlap["total"] = max(overlap["total"], sum(in_flight.values()))
+            time.sleep(0.01)
+            try:
+                return handler(request)
+            finally:
+                with lock:
+                    in_flight[channel] -= 1
+
+        fake_client._client = httpx.Client(transport=httpx.MockTransport(slow_handler))
+        results = []
+
+        def add(vip_ip, member_ip):
+            def target():
+                results.append(fake_client.add_member(vip_ip, 80, member_ip, 8080)[0])
+            return target
+
+        self._run(*(add(f"10.0.0.10{i % 2}", f"10.0.2.{i}") for i in range(8)))
+        assert results == [True] * 8
+        assert overlap["same_vip"] > 1
+        for vip_ip in ("10.0.0.100", "10.0.0.101"):
+            members = fake_client.get_snapshot(max_age=0).find_vip(vip_ip, 80)["contentServer"]["CServerId"]
+            assert len({cs["cId"] for cs in members}) == 4
+            assert all(cs["CSIPAddr"] for cs in members)
+
+    def test_concurrent_creates_get_own_templates(self, fake_device, fake_client):
+        """Test concurrent VIP creates never fill the same template."""
+        results = []
+
+        def create(ip_addr):
+            def target():
+                results.append(fake_client.create_virtual_service(ip_addr, 80)[0])
+            return target
+
+        self._run(*(create(f"10.0.0.{i}") for i in range(1, 7)))
+        assert results == [True] * 6
+        assert sorted(v["ipAddr"] for v in fake_device.vips) == [f"10.0.0.{i}" for i in range(1, 7)]
+        assert fake_client._reserved_templates == set()
+
+    def test_create_skips_existing_blank_templates(self, fake_device, fake_client):
+        """Test a create fills the template it made, not an older blank one."""
+        orphan = fake_device.add_vip("", "")
+        fake_client.get_snapshot()
+        success, _ = fake_client.create_virtual_service("10.0.0.1", 80)
+        assert success
+        assert orphan["ipAddr"] == ""
+        assert fake_device.vips[1]["ipAddr"] == "10.0.0.1"
+
+    def test_deferred_apply_is_per_thread(self, fake_device, fake_client):
+        """Test one thread's deferred_apply() does not hold back another thread's apply."""
+        fake_device.add_vip("10.0.0.100", 80)
+        with fake_client.deferred_apply():
+            self._run(lambda: fake_client.add_member("10.0.0.100", 80, "10.0.2.1", 8080))
+            assert fake_device.applies == 1
+            fake_client.add_member("10.0.0.100", 80, "10.0.2.2", 8080)
+            assert fake_device.applies == 1
+
+
+class TestClusterRouting:
+    """Tests for routing requests across the members of a device cluster."""
+
+    def _client(self, fake_device, roles):
+        from octavia_edgeadc_driver.api.edgeadc_client import EdgeADCClient
+
+        hosts = []
+
+        def handler(request):
+            hosts.append((request.method, request.url.host, request.url.path))
+            if request.url.path == constants.API_CLUSTER_STATUS:
+                return httpx.Response(200, json={"data": roles[request.url.host]})
+            return fake_device.handler(request)
+
+        client = EdgeADCClient(host="10.9.0.1", username="admin", password="x", cache_ttl=0,
+                               peers=["10.9.0.2"], peer_read_grace=0)
+        client._client = httpx.Client(transport=httpx.MockTransport(handler))
+        return client, hosts
+
+    def test_cluster_role(self):
+        """Test roles are read from role fields or clusterState."""
+        from octavia_edgeadc_driver.api.cluster import cluster_role
+
+        assert cluster_role({"data": [{"clusterRole": "Primary"}]}) == "primary"
+        assert cluster_role({"clusterState": 1}) == "secondary"
+        assert cluster_role({"clusterState": "0"}) == "standalone"
+        assert cluster_role({"data": [{"role": "active", "clusterState": "0"}]}) == "standalone"
+        assert cluster_role({}) is None
+
+    def test_writes_go_to_primary_reads_rotate(self, fake_device):
+        """Test mutations reach the primary peer and reads use both members."""
+        fake_device.add_vip("10.0.0.100", 80, [("10.0.1.1", 8080, 100)])
+        client, hosts = self._client(fake_device, {
+            "10.9.0.1": {"clusterState": "1"}, "10.9.0.2": {"clusterRole": "primary"}})
+        assert client.login()
+        assert client.write_host == "10.9.0.2"
+
+        assert client.update_member_weight("10.0.0.100", 80, "10.0.1.1", 8080, 50)
+        assert {h for m, h, p in hosts if m == "POST" and p != constants.API_LOGIN} == {"10.9.0.2"}
+        for _ in range(4):
+            client.get_ip_services()
+        assert {h for m, h, p in hosts if p == constants.API_IP_SERVICES} == {"10.9.0.1", "10.9.0.2"}
+        client.close()
+
+    def test_secondary_without_primary_keeps_writing(self, fake_device):
+        """Test writes stay on the device when no peer reports itself primary."""
+        fake_device.add_vip("10.0.0.100", 80)
+        client, hosts = self._client(fake_device, {
+            "10.9.0.1": {"clusterState": "1"}, "10.9.0.2": {"clusterState": "1"}})
+        success, _ = client.add_member("10.0.0.100", 80, "10.0.2.1", 8080)
+        assert success
+        assert client.write_host == "10.9.0.1"
+        client.close()
+
+    def test_clustered_device_without_peers_keeps_writing(self, fake_device):
+        """Test a device reporting clusterState 1 still gets member changes and applies."""
+        from octavia_edgeadc_driver.api.edgeadc_client import EdgeADCClient
+
+        fake_device.add_vip("10.0.0.100", 80)
+        handler = fake_device.handler
+
+        def clustered_handler(request):
+            if request.url.path == constants.API_CLUSTER_STATUS:
+                return httpx.Response(200, json={"data": {"clusterState": 1, "role": "member"}})
+            return handler(request)
+
+        client = EdgeADCClient(host="192.168.3.159", username="admin", password="x")
+        client._client = httpx.Client(transport=httpx.MockTransport(clustered_handler))
+        assert client.login()
+        assert client.write_host == "192.168.3.159"
+        success, _ = client.add_member("10.0.0.100", 80, "10.0.2.1", 8080)
+        assert success
+        assert client.apply_config()
+        assert fake_device.count("POST", "/POST/9") == 2
+        client.close()
+
+
+class TestWarmStart:
+    """Tests for serving a saved snapshot while the device is revalidated."""
+
+    def test_reads_served_from_saved_snapshot(self, fake_device, fake_client, tmp_path):
+        """Test reads use the saved snapshot without contacting the device."""
+        path = str(tmp_path / "snapshot.json")
+        IPServicesSnapshot([{"ipAddr": "10.0.0.50", "port": "443"}]).save(path)
+        fake_client.snapshot_path = path
+
+        assert [v["ipAddr"] for v in fake_client.get_ip_services()] == ["10.0.0.50"]
+        assert fake_device.count("GET", "/GET/9") == 0
+        # Callers that bound staleness still go to the device
+        assert fake_client.get_ip_services(max_age=0) == []
+
+    def test_warm_start_revalidates_and_saves(self, fake_device, fake_client, tmp_path):
+        """Test warm_start refreshes the snapshot and writes it to disk."""
+        path = str(tmp_path / "snapshot.json")
+        IPServicesSnapshot([{"ipAddr": "10.0.0.50", "port": "443"}]).save(path)
+        fake_device.add_vip("10.0.0.100", 80)
+        fake_client.snapshot_path = path
+
+        fake_client.warm_start()
+        fake_client._revalidate_thread.join(timeout=5)
+        assert [v["ipAddr"] for v in fake_client.get_ip_services()] == ["10.0.0.100"]
+        assert IPServicesSnapshot.load(path).find_vip("10.0.0.100", 80) is not None
+
+
 class TestProtocolMapping:
     """Tests for protocol mapping."""
 
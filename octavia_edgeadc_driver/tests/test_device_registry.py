@@ -0,0 +1,40 @@
+"""
+Unit tests for the device registry.
+"""
+import pytest
+
+from octavia_edgeadc_driver.common.device_registry import DeviceConfig, DeviceRegistry
+
+
+@pytest.fixture
+def registry():
+    return DeviceRegistry([
+        DeviceConfig("dc1", "192.168.1.100", cluster="east"),
+        DeviceConfig("dc2", "192.168.2.100", cluster="east"),
+        DeviceConfig("dc3", "192.168.3.100", cluster="west"),
+    ])
+
+
+class TestDeviceRegistry:
+    """Tests for DeviceRegistry."""
+
+    def test_lookup_by_name_or_host(self, registry):
+        """Test devices are found by name and by host."""
+        assert registry.get("dc2").host == "192.168.2.100"
+        assert registry.get("192.168.3.100").name == "dc3"
+        assert registry.get("dc4") is None
+        assert registry.default.name == "dc1"
+        assert registry.clusters == {"east", "west"}
+
+    def test_candidates(self, registry):
+        """Test flavor and AZ metadata narrow the eligible devices."""
+        assert [d.name for d in registry.candidates()] == ["dc1", "dc2", "dc3"]
+        assert [d.name for d in registry.candidates({"edgeadc_device": "dc2"})] == ["dc2"]
+        assert [d.name for d in registry.candidates(None, {"edgeadc_cluster": "east"})] == ["dc1", "dc2"]
+        assert registry.candidates({"edgeadc_device": "dc3"}, {"edgeadc_cluster": "east"}) == []
+        assert registry.candidates({"edgeadc_device": "dc4"}) == []
+
+    def test_requires_a_device(self):
+        """Test an empty registry is rejected."""
+        with pytest.raises(ValueError):
+            DeviceRegistry([])
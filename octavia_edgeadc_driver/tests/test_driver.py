@@ -4,12 +4,14 @@ Unit tests for EdgeADC Octavia driver.
 Note: Driver tests require OpenStack dependencies (oslo_config, octavia_lib).
 These tests are skipped in CI when dependencies are not available.
 """
+import dataclasses
+
 import pytest
 
 # Skip all tests in this module if oslo_config is not available
 pytest.importorskip("oslo_config", reason="oslo_config not installed")
 
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 
 @pytest.fixture
@@ -23,9 +25,52 @@ def mock_conf():
         conf.edgeadc.edgeadc_verify_ssl = False
         conf.edgeadc.edgeadc_request_timeout = 30
         conf.edgeadc.edgeadc_default_subnet_mask = "255.255.255.0"
+        conf.edgeadc.edgeadc_devices = []
+        conf.edgeadc.edgeadc_peers = []
+        conf.edgeadc.edgeadc_placement_strategy = "least_vips"
+        conf.edgeadc.edgeadc_placement_refresh_interval = 60.0
+        conf.edgeadc.edgeadc_cache_ttl = 5.0
+        conf.edgeadc.edgeadc_apply_delay = 0.0
+        conf.edgeadc.edgeadc_poll_timeout = 5.0
+        conf.edgeadc.edgeadc_template_pool_size = 0
+        conf.edgeadc.edgeadc_template_pool_interval = 30.0
+        conf.edgeadc.edgeadc_orphan_reap_interval = 0.0
+        conf.edgeadc.edgeadc_orphan_grace_period = 600.0
+        conf.edgeadc.edgeadc_orphan_batch_size = 50
+        conf.edgeadc.edgeadc_worker_threads = 0
+        conf.edgeadc.edgeadc_device_concurrency = 4
+        conf.edgeadc.edgeadc_status_interval = 0.0
+        conf.edgeadc.edgeadc_status_batch_size = 100
+        conf.edgeadc.edgeadc_mapping_db = ":memory:"
+        conf.edgeadc.edgeadc_snapshot_dir = ""
         yield conf
 
 
+@pytest.fixture
+def driver(mock_conf, fake_client):
+    """Create a driver wired to the in-memory device, without a driver agent."""
+    with patch('octavia_edgeadc_driver.driver.driver_lib.DriverLibrary'):
+        from octavia_edgeadc_driver.driver import EdgeADCProviderDriver
+        driver = EdgeADCProviderDriver()
+    driver._clients[fake_client.host] = fake_client
+    # pool-123 belongs to listener l1 on port 80 of load balancer lb1 at 10.0.0.100
+    driver.driver_lib.get_pool.return_value = Mock(listener_id="l1", loadbalancer_id="lb1", members=[])
+    driver.driver_lib.get_listener.return_value = Mock(protocol_port=80)
+    driver.driver_lib.get_loadbalancer.return_value = Mock(vip_address="10.0.0.100")
+    yield driver
+    driver.close()
+
+
+def _member(member_id, address, port=8080, weight=100):
+    member = Mock()
+    member.member_id = member_id
+    member.pool_id = "pool-123"
+    member.address = address
+    member.protocol_port = port
+    member.weight = weight
+    return member
+
+
 class TestEdgeADCProviderDriver:
     """Tests for EdgeADC provider driver."""
 
@@ -39,7 +84,381 @@ class TestEdgeADCProviderDriver:
         mock_conf.edgeadc.edgeadc_verify_ssl = False
         mock_conf.edgeadc.edgeadc_request_timeout = 30
         mock_conf.edgeadc.edgeadc_default_subnet_mask = "255.255.255.0"
+        mock_conf.edgeadc.edgeadc_devices = []
+        mock_conf.edgeadc.edgeadc_peers = []
+        mock_conf.edgeadc.edgeadc_worker_threads = 0
+        mock_conf.edgeadc.edgeadc_status_interval = 0.0
+        mock_conf.edgeadc.edgeadc_mapping_db = ":memory:"
+        mock_conf.edgeadc.edgeadc_snapshot_dir = ""
 
         from octavia_edgeadc_driver.driver import EdgeADCProviderDriver
         driver = EdgeADCProviderDriver()
         assert driver is not None
+        driver.close()
+
+
+class TestMemberBatchUpdate:
+    """Tests for the diff-based member batch update."""
+
+    def test_diff_applied_with_single_apply(self, driver, fake_device):
+        """Test adds, weight changes and deletes share one apply."""
+        fake_device.add_vip("10.0.0.100", 80, [
+            ("10.0.1.1", 8080, 100), ("10.0.1.2", 8080, 100), ("10.0.1.3", 8080, 100)])
+        members = [
+            _member("m1", "10.0.1.1"),
+            _member("m2", "10.0.1.2", weight=50),
+            _member("m4", "10.0.1.4"),
+            _member("m5", "10.0.1.5"),
+        ]
+        driver.member_batch_update("pool-123", members)
+
+        servers = fake_device.vips[0]["contentServer"]["CServerId"]
+        assert {(s["CSIPAddr"], s["WeightFactor"]) for s in servers} == {
+            ("10.0.1.1", "100"), ("10.0.1.2", "50"), ("10.0.1.4", "100"), ("10.0.1.5", "100")}
+        assert fake_device.applies == 1
+        driver.driver_lib.update_loadbalancer_status.assert_called_once()
+        status = driver.driver_lib.update_loadbalancer_status.call_args.args[0]
+        assert {m["id"]: m["provisioning_status"] for m in status["members"]} == dict.fromkeys(
+            ["m1", "m2", "m4", "m5"], "ACTIVE")
+
+    def test_no_changes_no_apply(self, driver, fake_device):
+        """Test an unchanged membership does not touch the device."""
+        fake_device.add_vip("10.0.0.100", 80, [("10.0.1.1", 8080, 100)])
+        driver.member_batch_update("pool-123", [_member("m1", "10.0.1.1")])
+        assert fake_device.applies == 0
+        assert fake_device.count("POST", "/POST/9") == 0
+
+
+class TestOperationExecutor:
+    """Tests for running driver operations on worker threads."""
+
+    def test_batch_update_runs_in_background(self, driver, fake_device, mock_conf):
+        """Test members are reported pending first, then ACTIVE by the worker."""
+        from octavia_edgeadc_driver.common.executor import OperationExecutor
+
+        driver._runtime.executor = OperationExecutor(max_workers=2)
+        fake_device.add_vip("10.0.0.100", 80, [("10.0.1.1", 8080, 100)])
+        driver.member_batch_update("pool-123", [_member("m1", "10.0.1.1", weight=50)])
+        driver._executor.shutdown(wait=True)
+
+        calls = [c.args[0]["members"][0]["provisioning_status"]
+                 for c in driver.driver_lib.update_loadbalancer_status.call_args_list]
+        assert calls == ["PENDING_UPDATE", "ACTIVE"]
+        assert fake_device.vips[0]["contentServer"]["CServerId"][0]["WeightFactor"] == "50"
+
+    def test_failed_operation_reports_error(self, driver):
+        """Test an exception on a worker marks the object ERROR."""
+        from octavia_edgeadc_driver.common.executor import OperationExecutor
+
+        driver._runtime.executor = OperationExecutor(max_workers=1)
+        with patch.object(driver, "_member_update", side_effect=RuntimeError("boom")):
+            driver.member_update(None, _member("m1", "10.0.1.1"))
+        driver._executor.shutdown(wait=True)
+
+        status = driver.driver_lib.update_loadbalancer_status.call_args.args[0]
+        assert status == {"members": [{"id": "m1", "provisioning_status": "ERROR"}]}
+
+    def test_operations_queued_per_loadbalancer(self, driver):
+        """Test member operations are queued under the pool's load balancer."""
+        from octavia_edgeadc_driver.common.executor import OperationExecutor
+
+        driver._runtime.executor = OperationExecutor(max_workers=2)
+        driver.driver_lib.get_pool.return_value = Mock(loadbalancer_id="lb-1")
+        with patch.object(driver, "_member_update"), patch.object(driver, "_member_delete"):
+            driver.member_update(None, _member("m1", "10.0.1.1"))
+            driver.member_delete(_member("m2", "10.0.1.2"))
+        driver._executor.shutdown(wait=True)
+
+        assert driver.queue_stats()["lb-1"].completed == 2
+        driver.driver_lib.get_pool.assert_called_once_with("pool-123")
+
+    def test_instances_share_queues(self, driver):
+        """Test driver instances of one process share the executor and device sessions."""
+        from octavia_edgeadc_driver.common.executor import OperationExecutor
+        from octavia_edgeadc_driver.driver import EdgeADCProviderDriver
+
+        driver._runtime.executor = OperationExecutor(max_workers=2)
+        driver.driver_lib.get_pool.return_value = Mock(loadbalancer_id="lb-1")
+        with patch('octavia_edgeadc_driver.driver.driver_lib.DriverLibrary'):
+            other = EdgeADCProviderDriver()
+        assert other._runtime is driver._runtime
+        assert other._executor is driver._executor
+        assert other._get_client() is driver._get_client()
+
+        order = []
+        with patch.object(driver, "_member_update", side_effect=lambda m: order.append(m.member_id)), \
+                patch.object(other, "_member_update", side_effect=lambda m: order.append(m.member_id)):
+            driver.member_update(None, _member("m1", "10.0.1.1"))
+            other.member_update(None, _member("m2", "10.0.1.2"))
+            driver._executor.shutdown(wait=True)
+        assert order == ["m1", "m2"]
+        assert driver.queue_stats()["lb-1"].completed == 2
+        other.driver_lib.get_pool.assert_not_called()
+
+    def test_loadbalancer_delete_queued_behind_operations(self, driver):
+        """Test a load balancer delete waits for its queued operations, then drops the stats."""
+        import threading
+
+        from octavia_edgeadc_driver.common.executor import OperationExecutor
+
+        driver._runtime.executor = OperationExecutor(max_workers=2)
+        driver.driver_lib.get_pool.return_value = Mock(loadbalancer_id="lb-1")
+        release = threading.Event()
+        order = []
+
+        def update(member):
+            release.wait(timeout=5)
+            order.append(member.member_id)
+
+        with patch.object(driver, "_member_update", side_effect=update), \
+                patch.object(driver._mappings, "delete", side_effect=lambda *a, **k: order.append("lb")):
+            driver.member_update(None, _member("m1", "10.0.1.1"))
+            driver.loadbalancer_delete(Mock(loadbalancer_id="lb-1"))
+            assert "lb-1" in driver.queue_stats()
+            release.set()
+            driver._executor.shutdown(wait=True)
+
+        assert order == ["m1", "lb"]
+        assert "lb-1" not in driver.queue_stats()
+        status = driver.driver_lib.update_loadbalancer_status.call_args.args[0]
+        assert status["loadbalancers"][0]["provisioning_status"] == "DELETED"
+
+
+class TestSharedRuntime:
+    """Tests for process-wide state shared by driver instances."""
+
+    def test_warm_start_once_per_process(self, mock_conf, tmp_path):
+        """Test only the first driver instance warm-starts the devices."""
+        from octavia_edgeadc_driver.api.edgeadc_client import EdgeADCClient
+        from octavia_edgeadc_driver.driver import EdgeADCProviderDriver
+
+        mock_conf.edgeadc.edgeadc_snapshot_dir = str(tmp_path)
+        with patch('octavia_edgeadc_driver.driver.driver_lib.DriverLibrary'), \
+                patch.object(EdgeADCClient, "warm_start") as warm_start:
+            drivers = [EdgeADCProviderDriver() for _ in range(3)]
+        assert warm_start.call_count == 1
+        drivers[0].close()
+
+    def test_template_pool_once_per_process(self, mock_conf):
+        """Test driver instances share one template pool, closed with the runtime."""
+        from octavia_edgeadc_driver.driver import EdgeADCProviderDriver
+
+        mock_conf.edgeadc.edgeadc_template_pool_size = 2
+        with patch('octavia_edgeadc_driver.driver.driver_lib.DriverLibrary'), \
+                patch('octavia_edgeadc_driver.common.runtime.TemplatePool') as pool_cls:
+            drivers = [EdgeADCProviderDriver() for _ in range(3)]
+            device = drivers[0]._devices.devices[0]
+            for driver in drivers:
+                driver._device_client(device)
+            pool_cls.assert_called_once()
+            drivers[0].close()
+        pool_cls.return_value.close.assert_called_once()
+
+    def test_orphan_reaper_once_per_process(self, mock_conf):
+        """Test driver instances share one reaper per device."""
+        from octavia_edgeadc_driver.driver import EdgeADCProviderDriver
+
+        mock_conf.edgeadc.edgeadc_orphan_reap_interval = 300.0
+        with patch('octavia_edgeadc_driver.driver.driver_lib.DriverLibrary'), \
+                patch('octavia_edgeadc_driver.common.runtime.OrphanReaper') as reaper_cls:
+            drivers = [EdgeADCProviderDriver() for _ in range(3)]
+            device = drivers[0]._devices.devices[0]
+            for driver in drivers:
+                driver._device_client(device)
+            reaper_cls.assert_called_once()
+            assert reaper_cls.call_args.args[0] is drivers[2]._device_client(device)
+            drivers[0].close()
+        reaper_cls.return_value.close.assert_called_once()
+
+    def test_placement_scheduler_once_per_process(self, mock_conf):
+        """Test driver instances share one started placement scheduler."""
+        from octavia_edgeadc_driver.common.device_registry import DeviceConfig
+        from octavia_edgeadc_driver.driver import EdgeADCProviderDriver
+
+        devices = [DeviceConfig("dc1", "192.168.1.100"), DeviceConfig("dc2", "192.168.2.100")]
+        with patch('octavia_edgeadc_driver.driver.driver_lib.DriverLibrary'), \
+                patch('octavia_edgeadc_driver.common.config.load_devices', return_value=devices), \
+                patch('octavia_edgeadc_driver.common.runtime.PlacementScheduler') as scheduler_cls:
+            drivers = [EdgeADCProviderDriver() for _ in range(3)]
+            scheduler_cls.assert_called_once()
+            scheduler_cls.return_value.start.assert_called_once()
+            assert all(driver._scheduler is scheduler_cls.return_value for driver in drivers)
+            drivers[0].close()
+        scheduler_cls.return_value.close.assert_called_once()
+
+
+class TestStatusBatching:
+    """Tests for batched status reporting from the driver."""
+
+    def test_operations_share_one_status_update(self, driver, fake_device):
+        """Test pending and final statuses of queued operations are merged."""
+        from octavia_edgeadc_driver.common.executor import OperationExecutor
+        from octavia_edgeadc_driver.common.status import StatusAggregator
+
+        driver._runtime.executor = OperationExecutor(max_workers=2)
+        driver._runtime.status = StatusAggregator(driver.driver_lib.update_loadbalancer_status, interval=60)
+        fake_device.add_vip("10.0.0.100", 80, [("10.0.1.1", 8080, 100)])
+        driver.member_batch_update("pool-123", [_member("m1", "10.0.1.1"), _member("m2", "10.0.1.2")])
+        driver.close()
+
+        driver.driver_lib.update_loadbalancer_status.assert_called_once()
+        status = driver.driver_lib.update_loadbalancer_status.call_args.args[0]
+        assert {m["id"]: m["provisioning_status"] for m in status["members"]} == {
+            "m1": "ACTIVE", "m2": "ACTIVE"}
+
+
+class TestMappingStore:
+    """Tests for resolving device objects through the mapping store."""
+
+    def test_listener_and_members_recorded(self, driver, fake_device):
+        """Test listener and member creates store their device coordinates."""
+        listener = Mock(listener_id="l1", loadbalancer_id="lb1", protocol_port=80,
+                        protocol="HTTP", vip_address="10.0.0.100")
+        listener.name = "web"
+        driver.listener_create(listener)
+        recorded = driver._mappings.get("l1")
+        assert (recorded.vip_ip, recorded.vip_port) == ("10.0.0.100", 80)
+        assert recorded.channel_key == fake_device.vips[0]["ChannelKey"]
+
+        driver.pool_create(Mock(pool_id="pool-123", listener_id="l1"))
+        member = _member("m1", "10.0.1.1")
+        driver.member_create(member)
+        recorded = driver._mappings.get("m1")
+        assert recorded.cid == int(fake_device.vips[0]["contentServer"]["CServerId"][0]["cId"])
+        assert driver._member_vip(member) == ("10.0.0.100", 80)
+
+    def test_failed_listener_create_returns_template(self, driver, fake_client):
+        """Test a pooled template is handed back when the VIP create fails."""
+        from octavia_lib.api.drivers import exceptions as driver_exceptions
+
+        pool = driver._template_pools[fake_client.host] = Mock()
+        listener = Mock(listener_id="l1", loadbalancer_id="lb1", protocol_port=80,
+                        protocol="HTTP", vip_address="10.0.0.100")
+        with patch.object(fake_client, "create_virtual_service", return_value=(False, None)), \
+                pytest.raises(driver_exceptions.DriverError):
+            driver.listener_create(listener)
+        pool.put_back.assert_called_once_with(pool.acquire.return_value)
+
+    def test_batch_removal_reports_deleted(self, driver, fake_device):
+        """Test members dropped by a batch update are reported DELETED."""
+        fake_device.add_vip("10.0.0.100", 80)
+        driver.member_batch_update("pool-123", [_member("m1", "10.0.1.1"), _member("m2", "10.0.1.2")])
+        assert driver._mappings.get("m2") is not None
+
+        driver.member_batch_update("pool-123", [_member("m1", "10.0.1.1")])
+        status = driver.driver_lib.update_loadbalancer_status.call_args.args[0]
+        assert {"id": "m2", "provisioning_status": "DELETED"} in status["members"]
+        assert driver._mappings.get("m2") is None
+
+    def test_unmapped_removal_reports_deleted(self, driver, fake_device):
+        """Test a removed member with no mapping is reported DELETED by its Octavia ID."""
+        fake_device.add_vip("10.0.0.100", 80, [("10.0.1.1", 8080, 100), ("10.0.1.2", 8080, 100)])
+        driver.driver_lib.get_pool.return_value.members = [
+            Mock(member_id="m2", address="10.0.1.2", protocol_port=8080)]
+        driver.member_batch_update("pool-123", [_member("m1", "10.0.1.1")])
+        status = driver.driver_lib.update_loadbalancer_status.call_args.args[0]
+        assert {"id": "m2", "provisioning_status": "DELETED"} in status["members"]
+        assert len(fake_device.vips[0]["contentServer"]["CServerId"]) == 1
+
+    def test_failed_batch_delete_clears_flag(self, driver, fake_device, fake_client):
+        """Test a member whose delete failed is handed back to the reconciler."""
+        fake_device.add_vip("10.0.0.100", 80)
+        driver.member_batch_update("pool-123", [_member("m1", "10.0.1.1"), _member("m2", "10.0.1.2")])
+        with patch.object(fake_client, "delete_member", return_value=False):
+            driver.member_batch_update("pool-123", [_member("m1", "10.0.1.1")])
+        assert driver._mappings.get("m2").deleting is False
+
+    def test_member_vip_unresolved(self, driver):
+        """Test a member whose VIP cannot be resolved fails instead of guessing."""
+        from octavia_lib.api.drivers import exceptions as driver_exceptions
+
+        driver.driver_lib.get_pool.return_value = None
+        with pytest.raises(driver_exceptions.DriverError):
+            driver.member_update(None, _member("m1", "10.0.1.1"))
+
+    def test_deletes_marked_before_device_delete(self, driver, fake_device, fake_client):
+        """Test mappings are flagged for the reconciler before the device delete."""
+        fake_device.add_vip("10.0.0.100", 80)
+        driver.member_batch_update("pool-123", [_member("m1", "10.0.1.1")])
+        listener = Mock(listener_id="l1", loadbalancer_id="lb1", protocol_port=80, vip_address="10.0.0.100")
+        driver._mappings.put(dataclasses.replace(driver._mappings.get("m1"), octavia_id="l1", kind="listener"))
+        seen = []
+        delete_member, delete_vip = fake_client.delete_member, fake_client.delete_virtual_service
+
+        def record(octavia_id, delete):
+            def wrapper(*args, **kwargs):
+                seen.append(driver._mappings.get(octavia_id).deleting)
+                return delete(*args, **kwargs)
+            return wrapper
+
+        with patch.object(fake_client, "delete_member", record("m1", delete_member)), \
+                patch.object(fake_client, "delete_virtual_service", record("l1", delete_vip)):
+            driver.member_delete(_member("m1", "10.0.1.1"))
+            driver.listener_delete(listener)
+        assert seen == [True, True]
+
+
+class TestDevicePlacement:
+    """Tests for placing load balancers on one of several devices."""
+
+    @pytest.fixture
+    def devices(self, driver):
+        from octavia_edgeadc_driver.common.device_registry import DeviceConfig, DeviceRegistry
+
+        driver._devices = DeviceRegistry([
+            DeviceConfig("dc1", "192.168.1.100", cluster="east"),
+            DeviceConfig("dc2", "192.168.2.100", cluster="west"),
+        ])
+        return driver._devices
+
+    def test_flavor_selects_device(self, driver, devices):
+        """Test the edgeadc_device flavor key binds the load balancer to that device."""
+        loadbalancer = Mock(loadbalancer_id="lb1", flavor={"edgeadc_device": "dc2"},
+                            availability_zone=None, vip_address="10.0.0.1")
+        assert driver._place_loadbalancer(loadbalancer).name == "dc2"
+        assert driver._mappings.get("lb1").host == "192.168.2.100"
+        assert driver._get_client("lb1").host == "192.168.2.100"
+        # The binding is remembered even if the flavor no longer matches
+        loadbalancer.flavor = {"edgeadc_device": "dc1"}
+        assert driver._place_loadbalancer(loadbalancer).name == "dc2"
+
+    def test_availability_zone_selects_cluster(self, driver, devices):
+        """Test the edgeadc_cluster AZ key limits placement to the cluster's devices."""
+        loadbalancer = Mock(loadbalancer_id="lb1", flavor=None,
+                            availability_zone={"edgeadc_cluster": "west"}, vip_address="10.0.0.1")
+        assert driver._place_loadbalancer(loadbalancer).host == "192.168.2.100"
+
+    def test_no_matching_device(self, driver, devices):
+        """Test a flavor and AZ that exclude every device fail the create."""
+        from octavia_lib.api.drivers import exceptions as driver_exceptions
+
+        loadbalancer = Mock(loadbalancer_id="lb1", flavor={"edgeadc_device": "dc1"},
+                            availability_zone={"edgeadc_cluster": "west"})
+        with pytest.raises(driver_exceptions.DriverError):
+            driver.loadbalancer_create(loadbalancer)
+        assert driver._mappings.get("lb1") is None
+
+    def test_scheduler_picks_least_loaded_device(self, driver, devices):
+        """Test devices allowed by the AZ are chosen by the placement scheduler."""
+        from octavia_edgeadc_driver.common.placement import LeastVIPsStrategy, PlacementScheduler
+
+        driver._runtime.scheduler = PlacementScheduler(
+            LeastVIPsStrategy(), Mock(), [d.host for d in devices.devices])
+        driver._scheduler._loads["192.168.1.100"].vips = 3
+        hosts = [
+            driver._place_loadbalancer(Mock(loadbalancer_id=f"lb{i}", flavor=None,
+                                            availability_zone=None, vip_address="10.0.0.1")).host
+            for i in range(4)
+        ]
+        assert hosts == ["192.168.2.100", "192.168.2.100", "192.168.2.100", "192.168.1.100"]
+
+    def test_validation_rejects_unknown_devices(self, driver, devices):
+        """Test flavors and AZs naming unconfigured devices or clusters are rejected."""
+        from octavia_lib.api.drivers import exceptions as driver_exceptions
+
+        driver.validate_flavor({"edgeadc_device": "192.168.1.100"})
+        driver.validate_availability_zone({"edgeadc_cluster": "east"})
+        with pytest.raises(driver_exceptions.UnsupportedOptionError):
+            driver.validate_flavor({"edgeadc_device": "dc3"})
+        with pytest.raises(driver_exceptions.UnsupportedOptionError):
+            driver.validate_availability_zone({"edgeadc_cluster": "north"})
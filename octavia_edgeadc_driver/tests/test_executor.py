@@ -0,0 +1,125 @@
+"""
+Unit tests for the per-load-balancer operation executor.
+"""
+import threading
+import time
+
+import pytest
+
+from octavia_edgeadc_driver.common.executor import OperationExecutor
+
+
+@pytest.fixture
+def executor():
+    executor = OperationExecutor(max_workers=4)
+    yield executor
+    executor.shutdown(wait=True)
+
+
+class TestOperationExecutor:
+    """Tests for OperationExecutor."""
+
+    def test_same_key_runs_in_order(self, executor):
+        """Test operations on one key run one at a time, in submission order."""
+        order = []
+        running = []
+
+        def op(i):
+            running.append(i)
+            assert len(running) == 1
+            time.sleep(0.01)
+            order.append(i)
+            running.remove(i)
+
+        futures = [executor.submit("lb-1", f"op{i}", op, i) for i in range(5)]
+        for future in futures:
+            future.result(timeout=5)
+        assert order == [0, 1, 2, 3, 4]
+
+    def test_different_keys_run_in_parallel(self, executor):
+        """Test operations on different keys overlap."""
+        barrier = threading.Barrier(2, timeout=5)
+        futures = [executor.submit(key, "op", barrier.wait) for key in ("lb-1", "lb-2")]
+        for future in futures:
+            future.result(timeout=5)
+
+    def test_device_concurrency_limit(self):
+        """Test the per-device limit caps concurrent operations across keys."""
+        executor = OperationExecutor(max_workers=4, device_concurrency=1)
+        lock = threading.Lock()
+        active = []
+        peak = []
+
+        def op():
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.02)
+            with lock:
+                active.pop()
+
+        futures = [executor.submit(f"lb-{i}", "op", op, device="adc1") for i in range(4)]
+        for future in futures:
+            future.result(timeout=5)
+        executor.shutdown()
+        assert max(peak) == 1
+
+    def test_busy_device_does_not_hold_workers(self):
+        """Test queues waiting on a busy device leave workers free for other devices."""
+        executor = OperationExecutor(max_workers=2, device_concurrency=1)
+        gate = threading.Event()
+        blocked = [executor.submit(f"lb-{i}", "op", gate.wait, 5, device="adc1") for i in range(4)]
+        other = executor.submit("lb-9", "op", lambda: "done", device="adc2")
+        assert other.result(timeout=2) == "done"
+        gate.set()
+        for future in blocked:
+            future.result(timeout=5)
+        executor.shutdown(wait=True)
+        assert executor.inflight == 0
+
+    def test_failure_does_not_block_queue(self, executor):
+        """Test a failed operation is reported and the next one still runs."""
+        def fail():
+            raise RuntimeError("boom")
+
+        first = executor.submit("lb-1", "fail", fail)
+        second = executor.submit("lb-1", "ok", lambda: "done")
+        assert second.result(timeout=5) == "done"
+        assert isinstance(first.exception(), RuntimeError)
+
+    def test_queue_depth_and_wait_stats(self, executor):
+        """Test queue depth and wait times are tracked per key."""
+        gate = threading.Event()
+        executor.submit("lb-1", "block", gate.wait, 5)
+        last = executor.submit("lb-1", "after", lambda: None)
+        assert executor.queue_depth("lb-1") == 2
+        assert executor.stats()["lb-1"].depth == 2
+
+        time.sleep(0.05)
+        gate.set()
+        last.result(timeout=5)
+        executor.shutdown(wait=True)
+
+        stats = executor.stats()["lb-1"]
+        assert stats.depth == 0
+        assert stats.completed == 2
+        assert stats.max_wait >= 0.05
+        assert executor.inflight == 0
+
+    def test_forget_drops_idle_stats(self, executor):
+        """Test forget removes statistics of an idle key."""
+        executor.submit("lb-1", "op", lambda: None).result(timeout=5)
+        executor.shutdown(wait=True)
+        executor.forget("lb-1")
+        assert "lb-1" not in executor.stats()
+
+    def test_forget_waits_for_queued_operations(self, executor):
+        """Test forgetting a busy key keeps its statistics until the queue drains."""
+        release = threading.Event()
+        future = executor.submit("lb-1", "op", release.wait, 5)
+        executor.forget("lb-1")
+        assert "lb-1" in executor.stats()
+        release.set()
+        future.result(timeout=5)
+        executor.shutdown(wait=True)
+        assert "lb-1" not in executor.stats()
@@ -0,0 +1,66 @@
+"""
+Unit tests for member operating-status polling.
+"""
+from unittest.mock import Mock
+
+import pytest
+
+from octavia_edgeadc_driver.common.health import MemberStatusPoller, member_operating_status
+from octavia_edgeadc_driver.common.mapping_store import KIND_MEMBER, DeviceObject, MappingStore
+
+
+@pytest.fixture
+def poller(fake_device, fake_client):
+    fake_device.add_vip("10.0.0.100", 80, [("10.0.1.1", 8080, 100), ("10.0.1.2", 8080, 100)])
+    mappings = MappingStore()
+    mappings.put(*(
+        DeviceObject(f"m{i}", KIND_MEMBER, fake_client.host, parent_id="p1", vip_ip="10.0.0.100",
+                     vip_port=80, address=f"10.0.1.{i}", port=8080)
+        for i in (1, 2)
+    ))
+    poller = MemberStatusPoller(Mock(), mappings, {fake_client.host: fake_client}, batch_size=1)
+    return poller
+
+
+class TestMemberOperatingStatus:
+    """Tests for mapping device health indicators."""
+
+    @pytest.mark.parametrize("server,expected", [
+        ({"imagePath": "images/jnpsStateGreen.gif", "statusReason": "Online"}, "ONLINE"),
+        ({"imagePath": "images/jnpsStateRed.gif", "statusReason": "Connection refused"}, "ERROR"),
+        ({"imagePath": "images/jnpsStateAmber.gif"}, "DEGRADED"),
+        ({"imagePath": "images/jnpsStateGrey.gif", "statusReason": "Finding status"}, None),
+        ({"statusReason": "Offline"}, "ERROR"),
+        ({}, None),
+    ])
+    def test_mapping(self, server, expected):
+        """Test imagePath and statusReason map to operating statuses."""
+        assert member_operating_status(server) == expected
+
+
+class TestMemberStatusPoller:
+    """Tests for MemberStatusPoller."""
+
+    def test_pushes_only_changes_in_batches(self, poller, fake_device):
+        """Test the first poll reports everything and later polls only changes."""
+        assert poller.poll_once() == 2
+        assert poller._send_fn.call_count == 2
+        assert poller.poll_once() == 0
+
+        fake_device.vips[0]["contentServer"]["CServerId"][1].update({"imagePath": "images/jnpsStateRed.gif", "statusReason": "Timeout"})
+        assert poller.poll_once() == 1
+        poller._send_fn.assert_called_with({"members": [{"id": "m2", "operating_status": "ERROR"}]})
+
+    def test_failed_push_is_retried(self, poller):
+        """Test statuses that could not be sent are sent again next poll."""
+        poller._send_fn.side_effect = RuntimeError("socket")
+        poller.poll_once()
+        poller._send_fn.side_effect = None
+        assert poller.poll_once() == 2
+
+    def test_missing_server_is_error(self, poller, fake_device):
+        """Test a mapped member absent from the device is reported ERROR."""
+        poller.poll_once()
+        del fake_device.vips[0]["contentServer"]["CServerId"][0]
+        assert poller.poll_once() == 1
+        poller._send_fn.assert_called_with({"members": [{"id": "m1", "operating_status": "ERROR"}]})
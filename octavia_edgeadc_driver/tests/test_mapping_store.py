@@ -0,0 +1,87 @@
+"""
+Unit tests for the Octavia-to-device mapping store.
+"""
+import dataclasses
+
+from octavia_edgeadc_driver.common.mapping_store import (
+    KIND_LISTENER,
+    KIND_MEMBER,
+    KIND_POOL,
+    DeviceObject,
+    MappingStore,
+)
+
+
+def _listener():
+    vip = {"ipAddr": "10.0.0.100", "port": "80", "InterfaceID": "1", "ChannelID": "3", "ChannelKey": "7"}
+    return DeviceObject.from_vip("l1", KIND_LISTENER, "adc1", vip, parent_id="lb1")
+
+
+class TestMappingStore:
+    """Tests for MappingStore."""
+
+    def test_put_and_get(self):
+        """Test a stored object is returned with its device coordinates."""
+        store = MappingStore()
+        store.put(_listener())
+        listener = store.get("l1")
+        assert (listener.vip_ip, listener.vip_port) == ("10.0.0.100", 80)
+        assert (listener.interface_id, listener.channel_id, listener.channel_key) == ("1", "3", "7")
+        assert store.get("missing") is None
+
+    def test_children_and_cascade_delete(self):
+        """Test children are listed by parent and removed with it."""
+        store = MappingStore()
+        listener = _listener()
+        pool = dataclasses.replace(listener, octavia_id="p1", kind=KIND_POOL, parent_id="l1")
+        members = [
+            dataclasses.replace(pool, octavia_id=f"m{i}", kind=KIND_MEMBER, parent_id="p1",
+                                address=f"10.0.1.{i}", port=8080, cid=i)
+            for i in range(3)
+        ]
+        store.put(listener, pool, *members)
+        assert {m.octavia_id for m in store.children("p1", KIND_MEMBER)} == {"m0", "m1", "m2"}
+        assert len(store.all(kind=KIND_MEMBER, host="adc1")) == 3
+
+        store.delete("l1", cascade=True)
+        assert store.all() == []
+
+    def test_persists_across_restart(self, tmp_path):
+        """Test mappings survive reopening the database."""
+        path = str(tmp_path / "mappings.db")
+        store = MappingStore(path)
+        store.put(_listener())
+        store.close()
+
+        reopened = MappingStore(path)
+        assert reopened.get("l1") == _listener()
+        reopened.close()
+
+    def test_unusable_path_falls_back_to_memory(self, tmp_path):
+        """Test an unwritable database path does not break the driver."""
+        store = MappingStore(str(tmp_path / "missing" / "mappings.db"))
+        assert store.path == ":memory:"
+        store.put(_listener())
+        assert store.get("l1") is not None
+
+    def test_mark_deleting(self, tmp_path):
+        """Test the deleting flag is stored, including in older databases."""
+        import sqlite3
+
+        path = str(tmp_path / "mappings.db")
+        store = MappingStore(path)
+        store.put(_listener())
+        store.close()
+        # A database written before the flag existed
+        conn = sqlite3.connect(path)
+        conn.execute("ALTER TABLE device_objects DROP COLUMN deleting")
+        conn.commit()
+        conn.close()
+
+        store = MappingStore(path)
+        assert store.get("l1").deleting is False
+        store.mark_deleting("l1")
+        assert store.get("l1").deleting is True
+        store.mark_deleting("l1", deleting=False)
+        assert store.get("l1").deleting is False
+        store.close()
@@ -0,0 +1,83 @@
+"""
+Unit tests for the orphan reaper.
+"""
+from octavia_edgeadc_driver.api.orphan_reaper import OrphanReaper
+from octavia_edgeadc_driver.api.template_pool import TemplatePool
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _add_placeholder(vip):
+    vip["contentServer"]["CServerId"].append({"cId": "99", "CSIPAddr": "", "CSPort": ""})
+
+
+class TestOrphanReaper:
+    """Tests for OrphanReaper."""
+
+    def test_orphans_kept_during_grace_period(self, fake_device, fake_client):
+        """Test blank objects are only deleted once the grace period has passed."""
+        clock = FakeClock()
+        fake_device.add_vip("", "")
+        _add_placeholder(fake_device.add_vip("10.0.0.100", 80, [("10.0.1.1", 8080, 1)]))
+        reaper = OrphanReaper(fake_client, grace_period=60, clock=clock)
+
+        assert reaper.reap_once() == 0
+        clock.now = 59
+        assert reaper.reap_once() == 0
+        assert fake_device.count("POST", "/POST/9") == 0
+
+        clock.now = 60
+        assert reaper.reap_once() == 2
+        assert [v["ipAddr"] for v in fake_device.vips] == ["10.0.0.100"]
+        assert [cs["CSIPAddr"] for cs in fake_device.vips[0]["contentServer"]["CServerId"]] == ["10.0.1.1"]
+        assert fake_device.applies == 1
+        assert (reaper.reaped_templates, reaper.reaped_placeholders) == (1, 1)
+
+    def test_filled_template_is_forgotten(self, fake_device, fake_client):
+        """Test a template filled in between passes restarts its age."""
+        clock = FakeClock()
+        template = fake_device.add_vip("", "")
+        reaper = OrphanReaper(fake_client, grace_period=60, clock=clock)
+        reaper.reap_once()
+
+        template["ipAddr"] = "10.0.0.100"
+        clock.now = 30
+        reaper.reap_once()
+        template["ipAddr"] = ""
+        clock.now = 61
+        assert reaper.reap_once() == 0
+        assert len(fake_device.vips) == 1
+
+    def test_pooled_templates_are_kept(self, fake_device, fake_client):
+        """Test templates held by the template pool are never reaped."""
+        clock = FakeClock()
+        pool = TemplatePool(fake_client, size=2)
+        pool.refill()
+        reaper = OrphanReaper(fake_client, grace_period=0, clock=clock)
+        assert reaper.reap_once() == 0
+        assert pool.acquire() is not None
+
+    def test_batch_size_limits_one_pass(self, fake_device, fake_client):
+        """Test at most batch_size orphans are deleted per pass, under one apply each."""
+        for _ in range(5):
+            fake_device.add_vip("", "")
+        reaper = OrphanReaper(fake_client, grace_period=0, batch_size=3, clock=FakeClock())
+        assert reaper.reap_once() == 3
+        assert reaper.reap_once() == 2
+        assert fake_device.vips == []
+        assert fake_device.applies == 2
+
+    def test_placeholders_being_filled_are_kept(self, fake_device, fake_client):
+        """Test placeholders held by a member add in progress are never reaped."""
+        _add_placeholder(fake_device.add_vip("10.0.0.100", 80))
+        assert fake_client._claim_placeholders("1", set(), fake_client.get_snapshot(), 1) == [99]
+        reaper = OrphanReaper(fake_client, grace_period=0, clock=FakeClock())
+        assert reaper.reap_once() == 0
@@ -0,0 +1,77 @@
+"""
+Unit tests for load-aware device placement.
+"""
+import pytest
+
+from octavia_edgeadc_driver.common.device_registry import DeviceConfig
+from octavia_edgeadc_driver.common.placement import (
+    DeviceLoad,
+    LeastMembersStrategy,
+    LeastVIPsStrategy,
+    PlacementScheduler,
+    WeightedUtilizationStrategy,
+    load_strategy,
+    system_load,
+)
+
+DEVICES = [DeviceConfig("dc1", "10.1.0.1"), DeviceConfig("dc2", "10.2.0.1")]
+
+
+class TestStrategies:
+    """Tests for the built-in placement strategies."""
+
+    def test_least_vips(self):
+        """Test the device with fewer VIPs, counting recent placements, wins."""
+        loads = {"10.1.0.1": DeviceLoad("10.1.0.1", vips=2), "10.2.0.1": DeviceLoad("10.2.0.1", vips=1, placed=2)}
+        assert LeastVIPsStrategy().choose(DEVICES, loads).name == "dc1"
+
+    def test_least_members(self):
+        """Test the device with fewer content servers wins."""
+        loads = {"10.1.0.1": DeviceLoad("10.1.0.1", vips=1, members=40),
+                 "10.2.0.1": DeviceLoad("10.2.0.1", vips=5, members=10)}
+        assert LeastMembersStrategy().choose(DEVICES, loads).name == "dc2"
+
+    def test_weighted_utilization(self):
+        """Test VIP capacity and CPU use outweigh raw VIP counts."""
+        loads = {"10.1.0.1": DeviceLoad("10.1.0.1", vips=10, max_vips=1000, cpu=10.0),
+                 "10.2.0.1": DeviceLoad("10.2.0.1", vips=5, max_vips=50, cpu=90.0)}
+        assert WeightedUtilizationStrategy().choose(DEVICES, loads).name == "dc1"
+
+    def test_ties_go_to_first_device(self):
+        """Test devices without load figures are chosen in configuration order."""
+        assert WeightedUtilizationStrategy().choose(DEVICES, {}).name == "dc1"
+
+    def test_load_strategy(self):
+        """Test strategies are created by name or module:Class path."""
+        assert isinstance(load_strategy("least_members"), LeastMembersStrategy)
+        assert isinstance(
+            load_strategy("octavia_edgeadc_driver.common.placement:LeastVIPsStrategy"), LeastVIPsStrategy)
+        with pytest.raises(ValueError):
+            load_strategy("busiest")
+
+
+class TestPlacementScheduler:
+    """Tests for PlacementScheduler."""
+
+    def test_system_load_fields(self):
+        """Test capacity and utilization are found anywhere in the response."""
+        info = {"data": {"dataset": {"row": [{"MaxVirtualServices": "256", "CPUUsage": "42%"}]}}}
+        assert system_load(info) == {"max_vips": 256.0, "cpu": 42.0}
+
+    def test_refresh_reads_cached_snapshot(self, fake_device, fake_client):
+        """Test load figures come from the snapshot cache and system info."""
+        fake_device.add_vip("10.0.0.100", 80, [("10.0.1.1", 8080, 1), ("10.0.1.2", 8080, 1)])
+        fake_device.add_vip("", "")
+        scheduler = PlacementScheduler(LeastVIPsStrategy(), lambda host: fake_client, [fake_client.host])
+        load = scheduler.refresh(fake_client.host)
+        assert (load.vips, load.members, load.cpu) == (1, 2, None)
+
+        fake_device.add_vip("10.0.0.101", 80)
+        scheduler.refresh(fake_client.host)
+        assert scheduler.loads()[fake_client.host].vips == 1
+        assert fake_device.count("GET", "/GET/9") == 1
+
+    def test_select_spreads_between_refreshes(self):
+        """Test back-to-back placements do not all land on one device."""
+        scheduler = PlacementScheduler(LeastVIPsStrategy(), None, [d.host for d in DEVICES])
+        assert [scheduler.select(DEVICES).name for _ in range(4)] == ["dc1", "dc2", "dc1", "dc2"]
@@ -0,0 +1,58 @@
+"""
+Unit tests for adaptive polling.
+"""
+import asyncio
+import itertools
+
+from octavia_edgeadc_driver.api.polling import AdaptivePoller
+
+
+class TestAdaptivePoller:
+    """Tests for AdaptivePoller."""
+
+    def test_immediate_hit_does_not_sleep(self):
+        """Test a ready condition returns on the first check."""
+        poller = AdaptivePoller("test", deadline=1.0)
+        assert poller.wait(lambda: "ready") == "ready"
+        assert poller.observed < 0.05
+
+    def test_backs_off_until_ready(self):
+        """Test polling continues until the condition is met."""
+        counter = itertools.count()
+        poller = AdaptivePoller("test", deadline=2.0, min_interval=0.001)
+        assert poller.wait(lambda: "ready" if next(counter) == 3 else None) == "ready"
+        assert next(counter) == 4
+
+    def test_gives_up_at_deadline(self):
+        """Test None is returned once the deadline expires."""
+        poller = AdaptivePoller("test", deadline=0.05, min_interval=0.01)
+        assert poller.wait(lambda: None) is None
+        assert poller.observed is None
+
+    def test_gives_up_after_max_checks(self):
+        """Test max_checks bounds the number of checks before the deadline."""
+        counter = itertools.count()
+        poller = AdaptivePoller("test", deadline=10.0, min_interval=0.001)
+        assert poller.wait(lambda: None if next(counter) < 10 else "ready", max_checks=3) is None
+        assert next(counter) == 3
+
+    def test_first_interval_tracks_latency(self):
+        """Test the first interval follows the observed latency."""
+        poller = AdaptivePoller("test", min_interval=0.05, max_interval=1.0, smoothing=0.5)
+        assert poller.first_interval() == 0.05
+        poller.record(0.4)
+        assert poller.first_interval() == 0.2
+        poller.record(0.8)
+        assert abs(poller.observed - 0.6) < 1e-9
+        poller.record(10)
+        assert poller.first_interval() == 1.0
+
+    def test_wait_async(self):
+        """Test the coroutine variant."""
+        counter = itertools.count()
+
+        async def check():
+            return "ready" if next(counter) == 2 else None
+
+        poller = AdaptivePoller("test", deadline=2.0, min_interval=0.001)
+        assert asyncio.run(poller.wait_async(check)) == "ready"
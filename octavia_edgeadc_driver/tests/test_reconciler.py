@@ -0,0 +1,142 @@
+"""
+Unit tests for desired-state reconciliation and rate limiting.
+"""
+from unittest.mock import Mock
+
+import pytest
+
+from octavia_edgeadc_driver.common.mapping_store import (
+    KIND_LISTENER,
+    KIND_MEMBER,
+    DeviceObject,
+    MappingStore,
+)
+from octavia_edgeadc_driver.common.rate_limit import TokenBucket
+from octavia_edgeadc_driver.common.reconciler import Reconciler
+
+
+@pytest.fixture
+def mappings(fake_client):
+    store = MappingStore()
+    store.put(DeviceObject("l1", KIND_LISTENER, fake_client.host, vip_ip="10.0.0.100", vip_port=80))
+    store.put(*(
+        DeviceObject(f"m{i}", KIND_MEMBER, fake_client.host, parent_id="p1", vip_ip="10.0.0.100",
+                     vip_port=80, address=f"10.0.1.{i}", port=8080, weight=100)
+        for i in (1, 2, 3)
+    ))
+    return store
+
+
+def _listener(listener_id):
+    listener = Mock(protocol="HTTP", listener_id=listener_id)
+    listener.configure_mock(name="web")
+    return listener
+
+
+@pytest.fixture
+def library():
+    library = Mock()
+    library.get_listener.side_effect = _listener
+    library.get_member.side_effect = lambda i: Mock(weight=100, member_id=i)
+    return library
+
+
+def _reconciler(library, mappings, client, **kwargs):
+    return Reconciler(library, mappings, {client.host: client}, rate=0, **kwargs)
+
+
+class TestReconciler:
+    """Tests for Reconciler."""
+
+    def test_in_sync_device_untouched(self, fake_device, fake_client, mappings, library):
+        """Test a device matching the desired state gets no writes or lookups."""
+        fake_device.add_vip("10.0.0.100", 80, [(f"10.0.1.{i}", 8080, 100) for i in (1, 2, 3)])
+        (report,) = _reconciler(library, mappings, fake_client).reconcile_once()
+        assert report.repairs == 0
+        assert fake_device.count("POST", "/POST/9") == 0
+        library.get_member.assert_not_called()
+
+    def test_repairs_missing_members_and_weights(self, fake_device, fake_client, mappings, library):
+        """Test missing servers are re-added and drifted weights fixed."""
+        fake_device.add_vip("10.0.0.100", 80, [("10.0.1.1", 8080, 100), ("10.0.1.2", 8080, 30)])
+        (report,) = _reconciler(library, mappings, fake_client).reconcile_once()
+        assert (report.members_added, report.weights_fixed) == (1, 1)
+        assert fake_device.applies == 1
+        servers = {s["CSIPAddr"]: s["WeightFactor"] for s in fake_device.vips[0]["contentServer"]["CServerId"]}
+        assert servers == {"10.0.1.1": "100", "10.0.1.2": "100", "10.0.1.3": "100"}
+        assert mappings.get("m3").cid is not None
+
+    def test_recreates_lost_vip_in_batches(self, fake_device, fake_client, mappings, library):
+        """Test a wiped VIP is rebuilt with one apply per batch."""
+        fake_device.add_vip("10.0.0.200", 80)
+        (report,) = _reconciler(library, mappings, fake_client, batch_size=2).reconcile_once()
+        assert (report.vips_created, report.members_added) == (1, 3)
+        assert fake_device.applies == 2
+        vip = next(v for v in fake_device.vips if v["ipAddr"] == "10.0.0.100")
+        assert len(vip["contentServer"]["CServerId"]) == 3
+        assert mappings.get("m1").channel_key == vip["ChannelKey"]
+
+    def test_deleted_objects_drop_mappings(self, fake_device, fake_client, mappings, library):
+        """Test objects Octavia no longer knows are forgotten, not recreated."""
+        fake_device.add_vip("10.0.0.100", 80, [("10.0.1.1", 8080, 100), ("10.0.1.2", 8080, 100)])
+        library.get_member.side_effect = None
+        library.get_member.return_value = None
+        (report,) = _reconciler(library, mappings, fake_client).reconcile_once()
+        assert report.stale_mappings == 1
+        assert report.repairs == 0
+        assert mappings.get("m3") is None
+
+    def test_objects_being_deleted_are_left_alone(self, fake_device, fake_client, mappings, library):
+        """Test objects the driver is removing are not recreated."""
+        fake_device.add_vip("10.0.0.200", 80)
+        mappings.mark_deleting("l1", "m1")
+        (report,) = _reconciler(library, mappings, fake_client).reconcile_once()
+        assert report.repairs == 0
+        assert fake_device.count("POST", "/POST/9") == 0
+        library.get_listener.assert_not_called()
+
+    def test_deletion_after_planning_skips_repair(self, fake_device, fake_client, mappings, library):
+        """Test a repair planned before the driver marked the object is dropped."""
+        fake_device.add_vip("10.0.0.100", 80, [("10.0.1.1", 8080, 100), ("10.0.1.2", 8080, 100)])
+        library.get_member.side_effect = lambda i: mappings.mark_deleting(i) or Mock(weight=100)
+        (report,) = _reconciler(library, mappings, fake_client).reconcile_once()
+        assert report.repairs == 0
+        assert len(fake_device.vips[0]["contentServer"]["CServerId"]) == 2
+
+    def test_rate_limit_charged_per_write(self, fake_device, fake_client, mappings, library):
+        """Test each repair is charged for the writes it sends, plus one for the apply."""
+        fake_device.add_vip("10.0.0.100", 80, [("10.0.1.1", 8080, 100), ("10.0.1.2", 8080, 30)])
+        reconciler = _reconciler(library, mappings, fake_client)
+        limiter = reconciler._limiters[fake_client.host] = Mock()
+        reconciler.reconcile_once()
+        charged = sorted(c.args[0] if c.args else 1 for c in limiter.acquire.call_args_list)
+        assert charged == [1, 1, 2]
+
+    def test_empty_read_skipped(self, fake_device, fake_client, mappings, library):
+        """Test an empty dataset does not trigger a full rebuild."""
+        (report,) = _reconciler(library, mappings, fake_client).reconcile_once()
+        assert report.repairs == 0
+        assert fake_device.applies == 0
+
+
+class TestTokenBucket:
+    """Tests for TokenBucket."""
+
+    def test_rate_limits_after_burst(self):
+        """Test operations beyond the burst wait for refills."""
+        now = [0.0]
+
+        def sleep(seconds):
+            now[0] += seconds
+
+        bucket = TokenBucket(rate=2, burst=2, clock=lambda: now[0], sleep=sleep)
+        waits = [bucket.acquire() for _ in range(4)]
+        assert waits[:2] == [0.0, 0.0]
+        assert waits[2] == pytest.approx(0.5)
+        assert now[0] == pytest.approx(1.0)
+        assert not bucket.try_acquire()
+
+    def test_zero_rate_is_unlimited(self):
+        """Test a rate of 0 never blocks."""
+        bucket = TokenBucket(rate=0, sleep=Mock(side_effect=AssertionError))
+        assert all(bucket.acquire() == 0.0 for _ in range(10))
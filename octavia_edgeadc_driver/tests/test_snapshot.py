@@ -0,0 +1,55 @@
+"""
+Unit tests for the indexed IP-services snapshot.
+"""
+from octavia_edgeadc_driver.api.snapshot import IPServicesSnapshot, content_servers
+
+
+class TestIPServicesSnapshot:
+    """Tests for IPServicesSnapshot indexes."""
+
+    def test_find_vip(self, ip_services_response):
+        """Test VIP lookup by address, ChannelKey and channel."""
+        snapshot = IPServicesSnapshot.from_response(ip_services_response)
+        vip = snapshot.find_vip("10.0.0.100", 80)
+        assert vip["serviceName"] == "test-vip"
+        assert snapshot.by_channel_key["12"] is vip
+        assert snapshot.by_channel[("1", "2")] is vip
+        assert snapshot.find_vip("10.0.0.100", 443) is None
+
+    def test_find_server(self, ip_services_response):
+        """Test content server lookup by VIP and server address."""
+        snapshot = IPServicesSnapshot.from_response(ip_services_response)
+        server = snapshot.find_server("10.0.0.100", "80", "10.0.1.2", 8080)
+        assert server["cId"] == "2"
+        assert snapshot.find_server("10.0.0.100", 80, "10.0.1.3", 8080) is None
+
+    def test_blank_vips_and_placeholders(self, ip_services_response):
+        """Test blank templates and placeholder servers are tracked."""
+        vips = ip_services_response["data"]["dataset"]["ipService"][0]
+        vips[0]["contentServer"]["CServerId"].extend([
+            {"cId": "3", "CSIPAddr": ""},
+            {"cId": "5", "CSIPAddr": ""},
+        ])
+        vips.append({"InterfaceID": "1", "ChannelID": "3", "ChannelKey": "13", "ipAddr": ""})
+        snapshot = IPServicesSnapshot.from_response(ip_services_response)
+        assert snapshot.placeholder_cids("12") == [3, 5]
+        assert snapshot.placeholder_cids("13") == []
+        assert [v["ChannelID"] for v in snapshot.blank_vips] == ["3"]
+
+    def test_single_server_dict(self):
+        """Test a lone content server returned as a dict is normalized."""
+        vip = {"contentServer": {"CServerId": {"cId": "1", "CSIPAddr": "10.0.1.1"}}}
+        assert content_servers(vip) == [{"cId": "1", "CSIPAddr": "10.0.1.1"}]
+
+    def test_response_without_dataset(self):
+        """Test responses without a dataset yield no snapshot."""
+        assert IPServicesSnapshot.from_response({"success": True}) is None
+        assert IPServicesSnapshot.from_response(None) is None
+
+    def test_save_and_load(self, ip_services_response, tmp_path):
+        """Test a saved snapshot loads back with the same indexes."""
+        path = str(tmp_path / "snapshot.json")
+        IPServicesSnapshot.from_response(ip_services_response).save(path)
+        loaded = IPServicesSnapshot.load(path)
+        assert loaded.find_vip("10.0.0.100", 80)["serviceName"] == "test-vip"
+        assert IPServicesSnapshot.load(str(tmp_path / "missing.json")) is None
@@ -0,0 +1,61 @@
+"""
+Unit tests for the IP-services snapshot diff.
+"""
+import copy
+from unittest.mock import patch
+
+from octavia_edgeadc_driver.api import snapshot_diff
+from octavia_edgeadc_driver.api.snapshot import IPServicesSnapshot
+from octavia_edgeadc_driver.api.snapshot_diff import diff_snapshots
+
+
+def _vip(key, ip, servers=()):
+    return {"ChannelKey": key, "InterfaceID": "1", "ChannelID": key, "ipAddr": ip, "port": "80",
+            "contentServer": {"CServerId": [
+                {"cId": cid, "CSIPAddr": cs_ip, "CSPort": "8080", "WeightFactor": "100"}
+                for cid, cs_ip in servers
+            ]}}
+
+
+class TestSnapshotDiff:
+    """Tests for diff_snapshots()."""
+
+    def test_identical_snapshots(self):
+        """Test equal datasets produce an empty diff."""
+        vips = [_vip("1", "10.0.0.1", [("1", "10.0.1.1")])]
+        assert not diff_snapshots(IPServicesSnapshot(vips), IPServicesSnapshot(copy.deepcopy(vips)))
+
+    def test_vips_added_removed_modified(self):
+        """Test VIPs are matched by ChannelKey."""
+        old = IPServicesSnapshot([_vip("1", "10.0.0.1"), _vip("2", "10.0.0.2")])
+        changed = _vip("2", "10.0.0.2")
+        changed["serviceName"] = "renamed"
+        new = IPServicesSnapshot([changed, _vip("3", "10.0.0.3")])
+
+        diff = diff_snapshots(old, new)
+        assert [v["ChannelKey"] for v in diff.added] == ["3"]
+        assert [v["ChannelKey"] for v in diff.removed] == ["1"]
+        assert [(c.key, c.fields) for c in diff.modified] == [("2", {"serviceName"})]
+
+    def test_servers_matched_by_cid(self):
+        """Test content server changes are reported per cId."""
+        old = IPServicesSnapshot([_vip("1", "10.0.0.1", [("1", "10.0.1.1"), ("2", "10.0.1.2")])])
+        vip = _vip("1", "10.0.0.1", [("2", "10.0.1.2"), ("3", "10.0.1.3")])
+        vip["contentServer"]["CServerId"][0]["WeightFactor"] = "50"
+        diff = diff_snapshots(old, IPServicesSnapshot([vip]))
+
+        (change,) = diff.modified
+        assert change.fields == set()
+        assert [s["cId"] for s in change.servers_added] == ["3"]
+        assert [s["cId"] for s in change.servers_removed] == ["1"]
+        assert [(s.cid, s.fields) for s in change.servers_modified] == [("2", {"WeightFactor"})]
+
+    def test_unchanged_vips_skipped(self):
+        """Test VIPs with equal fingerprints are not compared in depth."""
+        vips = [_vip(str(i), f"10.0.0.{i}", [("1", "10.0.1.1")]) for i in range(50)]
+        new_vips = copy.deepcopy(vips)
+        new_vips[7]["serviceName"] = "changed"
+        with patch.object(snapshot_diff, "diff_vip", wraps=snapshot_diff.diff_vip) as diff_vip:
+            diff = diff_snapshots(IPServicesSnapshot(vips), IPServicesSnapshot(new_vips))
+        assert diff_vip.call_count == 1
+        assert diff.modified[0].key == "7"
@@ -0,0 +1,80 @@
+"""
+Unit tests for listener statistics collection.
+"""
+from unittest.mock import Mock
+
+import pytest
+
+from octavia_edgeadc_driver.common.mapping_store import KIND_LISTENER, DeviceObject, MappingStore
+from octavia_edgeadc_driver.common.statistics import ListenerStatsCollector, vip_counters
+
+
+def _set_counters(vip, bytes_in, bytes_out, active, total):
+    vip.update({"BytesIn": str(bytes_in), "BytesOut": str(bytes_out),
+                "CurrentConnections": str(active), "TotalConnections": str(total)})
+
+
+@pytest.fixture
+def collector(fake_device, fake_client):
+    for i in (1, 2):
+        fake_device.add_vip(f"10.0.0.{i}", 80)
+    mappings = MappingStore()
+    mappings.put(*(
+        DeviceObject(f"l{i}", KIND_LISTENER, fake_client.host, vip_ip=f"10.0.0.{i}", vip_port=80)
+        for i in (1, 2)
+    ))
+    return ListenerStatsCollector(Mock(), mappings, {fake_client.host: fake_client}, batch_size=1)
+
+
+class TestListenerStatsCollector:
+    """Tests for ListenerStatsCollector."""
+
+    def test_vip_counters(self):
+        """Test counters are read from known field names."""
+        assert vip_counters({"BytesIn": "10", "totalConn": 3}) == {"bytes_in": 10, "total_connections": 3}
+        assert vip_counters({"ipAddr": "10.0.0.1"}) is None
+
+    def test_deltas_submitted_in_batches(self, collector, fake_device):
+        """Test the first sample is a baseline and later samples give deltas."""
+        for vip in fake_device.vips:
+            _set_counters(vip, 100, 200, 5, 10)
+        assert collector.collect_once() == 0
+        collector._send_fn.assert_not_called()
+
+        _set_counters(fake_device.vips[0], 150, 260, 2, 14)
+        _set_counters(fake_device.vips[1], 100, 200, 7, 10)
+        assert collector.collect_once() == 2
+        assert collector._send_fn.call_count == 2
+        first = collector._send_fn.call_args_list[0].args[0]["listeners"][0]
+        assert first == {"id": "l1", "bytes_in": 50, "bytes_out": 60, "active_connections": 2,
+                         "total_connections": 4, "request_errors": 0}
+
+    def test_counter_reset(self, collector, fake_device):
+        """Test a counter that went backwards counts from zero."""
+        _set_counters(fake_device.vips[0], 1000, 1000, 0, 100)
+        collector.collect_once()
+        _set_counters(fake_device.vips[0], 30, 40, 0, 2)
+        collector.collect_once()
+        update = collector._send_fn.call_args.args[0]["listeners"][0]
+        assert (update["bytes_in"], update["bytes_out"], update["total_connections"]) == (30, 40, 2)
+
+    def test_failed_submit_carried_over(self, collector, fake_device):
+        """Test deltas that could not be submitted are added to the next ones."""
+        _set_counters(fake_device.vips[0], 0, 0, 0, 0)
+        collector.collect_once()
+        _set_counters(fake_device.vips[0], 10, 0, 0, 1)
+        collector._send_fn.side_effect = RuntimeError("socket")
+        collector.collect_once()
+        collector._send_fn.side_effect = None
+        _set_counters(fake_device.vips[0], 25, 0, 0, 3)
+        collector.collect_once()
+        update = collector._send_fn.call_args.args[0]["listeners"][0]
+        assert (update["bytes_in"], update["total_connections"]) == (25, 3)
+
+    def test_missing_counters_not_submitted(self, collector, fake_device, caplog):
+        """Test VIPs without counters are skipped with one warning per device."""
+        for _ in range(3):
+            assert collector.collect_once() == 0
+        collector._send_fn.assert_not_called()
+        warnings = [r for r in caplog.records if "no traffic counters" in r.getMessage()]
+        assert len(warnings) == 1
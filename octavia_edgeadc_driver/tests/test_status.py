@@ -0,0 +1,80 @@
+"""
+Unit tests for batched status reporting.
+"""
+import time
+from unittest.mock import Mock
+
+from octavia_edgeadc_driver.common.status import StatusAggregator
+
+
+class TestStatusAggregator:
+    """Tests for StatusAggregator."""
+
+    def test_merges_resources_into_one_update(self):
+        """Test updates of different resources are sent together."""
+        send = Mock()
+        aggregator = StatusAggregator(send, interval=60)
+        aggregator.update({"members": [{"id": "m1", "provisioning_status": "ACTIVE"}]})
+        aggregator.update({"listeners": [{"id": "l1", "provisioning_status": "ACTIVE"}]})
+        aggregator.update({"loadbalancers": [{"id": "lb1", "provisioning_status": "ACTIVE"}]})
+        send.assert_not_called()
+
+        assert aggregator.flush()
+        send.assert_called_once()
+        combined = send.call_args.args[0]
+        assert list(combined) == ["loadbalancers", "listeners", "members"]
+
+    def test_latest_status_wins(self):
+        """Test a second update of the same object replaces the first."""
+        send = Mock()
+        aggregator = StatusAggregator(send, interval=60)
+        aggregator.update({"members": [{"id": "m1", "provisioning_status": "PENDING_UPDATE"}]})
+        aggregator.update({"members": [
+            {"id": "m1", "provisioning_status": "ACTIVE", "operating_status": "ONLINE"}]})
+        aggregator.flush()
+        assert send.call_args.args[0] == {"members": [
+            {"id": "m1", "provisioning_status": "ACTIVE", "operating_status": "ONLINE"}]}
+
+    def test_size_threshold_flushes(self):
+        """Test reaching the batch size sends immediately."""
+        send = Mock()
+        aggregator = StatusAggregator(send, interval=60, max_batch=3)
+        aggregator.update({"members": [{"id": f"m{i}", "provisioning_status": "ACTIVE"} for i in range(3)]})
+        send.assert_called_once()
+        assert aggregator.pending == 0
+
+    def test_timer_flushes(self):
+        """Test pending updates are sent after the interval."""
+        send = Mock()
+        aggregator = StatusAggregator(send, interval=0.02)
+        aggregator.update({"pools": [{"id": "p1", "provisioning_status": "ACTIVE"}]})
+        deadline = time.monotonic() + 2
+        while not send.called and time.monotonic() < deadline:
+            time.sleep(0.01)
+        send.assert_called_once()
+
+    def test_send_failure_is_logged(self):
+        """Test a failed send reports False and does not raise."""
+        aggregator = StatusAggregator(Mock(side_effect=RuntimeError("socket")), interval=60)
+        aggregator.update({"members": [{"id": "m1", "provisioning_status": "ACTIVE"}]})
+        assert aggregator.flush() is False
+        assert aggregator.sent_batches == 0
+        aggregator.close()
+
+    def test_failed_batch_is_retried(self):
+        """Test a failed batch is kept under newer updates and resent by the backoff timer."""
+        send = Mock(side_effect=[RuntimeError("socket"), None])
+        aggregator = StatusAggregator(send, interval=0.01)
+        aggregator.update({"members": [{"id": "m1", "provisioning_status": "PENDING_UPDATE"},
+                                       {"id": "m2", "provisioning_status": "ACTIVE"}]})
+        assert aggregator.flush() is False
+        assert aggregator.pending == 2
+        aggregator.update({"members": [{"id": "m1", "provisioning_status": "ACTIVE"}]})
+
+        deadline = time.monotonic() + 2
+        while send.call_count < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert send.call_args.args[0] == {"members": [
+            {"id": "m1", "provisioning_status": "ACTIVE"}, {"id": "m2", "provisioning_status": "ACTIVE"}]}
+        assert aggregator.pending == 0
+        aggregator.close()
@@ -0,0 +1,75 @@
+"""
+Unit tests for the blank VIP template pool.
+"""
+from octavia_edgeadc_driver.api.template_pool import TemplatePool
+
+
+class TestTemplatePool:
+    """Tests for TemplatePool."""
+
+    def test_refill_reserves_templates(self, fake_device, fake_client):
+        """Test refill creates distinct reserved templates."""
+        pool = TemplatePool(fake_client, size=3)
+        assert pool.refill() == 3
+        assert pool.available == 3
+        assert len({v["ChannelID"] for v in fake_device.vips}) == 3
+        assert len(fake_client._reserved_templates) == 3
+
+    def test_create_with_pooled_template(self, fake_device, fake_client):
+        """Test a VIP create from the pool skips template creation."""
+        pool = TemplatePool(fake_client, size=1)
+        pool.refill()
+        creates = fake_device.count("POST", "/POST/9", iAction="3", iType="1")
+        template = pool.acquire()
+        success, _ = fake_client.create_virtual_service("10.0.0.100", 80, template=template)
+        assert success
+        assert fake_device.count("POST", "/POST/9", iAction="3", iType="1") == creates
+        assert fake_device.vips[0]["ipAddr"] == "10.0.0.100"
+        assert pool.consumed == 1
+
+    def test_unpooled_create_leaves_pool_alone(self, fake_device, fake_client):
+        """Test a regular create never fills a reserved template."""
+        pool = TemplatePool(fake_client, size=2)
+        pool.refill()
+        success, _ = fake_client.create_virtual_service("10.0.0.100", 80)
+        assert success
+        assert pool.acquire() is not None
+        assert pool.discarded == 0
+
+    def test_acquire_skips_used_template(self, fake_device, fake_client):
+        """Test templates used behind the pool's back are discarded."""
+        pool = TemplatePool(fake_client, size=1)
+        pool.refill()
+        fake_device.vips[0]["ipAddr"] = "10.0.0.9"
+        fake_client.invalidate_cache()
+        assert pool.acquire() is None
+        assert pool.discarded == 1
+
+    def test_acquire_checks_device_not_cache(self, fake_device, fake_client):
+        """Test a template filled in since the last read is not handed out."""
+        pool = TemplatePool(fake_client, size=1)
+        pool.refill()
+        fake_client.get_snapshot()
+        fake_device.vips[0]["ipAddr"] = "10.0.0.9"
+        assert pool.acquire() is None
+        assert pool.discarded == 1
+
+    def test_put_back_after_failed_create(self, fake_device, fake_client):
+        """Test a template from a failed create is reused, not orphaned."""
+        pool = TemplatePool(fake_client, size=1)
+        pool.refill()
+        template = pool.acquire()
+        fake_client.release_template(template)
+        pool.put_back(template)
+        assert fake_client.is_reserved_template(template)
+        assert pool.acquire() == template
+        assert (pool.consumed, pool.discarded) == (1, 0)
+
+    def test_close_reclaims_with_one_apply(self, fake_device, fake_client):
+        """Test shutdown deletes leftover templates under a single apply."""
+        pool = TemplatePool(fake_client, size=3)
+        pool.refill()
+        assert pool.close() == 3
+        assert fake_device.vips == []
+        assert fake_device.applies == 1
+        assert fake_client._reserved_templates == set()
@@ -0,0 +1,76 @@
+"""
+Unit tests for batched client transactions.
+"""
+import copy
+from unittest.mock import patch
+
+import pytest
+
+from octavia_edgeadc_driver.api.edgeadc_client import EdgeADCClient
+from octavia_edgeadc_driver.common import constants
+
+
+@pytest.fixture
+def client():
+    """Create a logged-in client with a long cache TTL."""
+    client = EdgeADCClient(host="192.168.1.100", username="admin", password="x", cache_ttl=60)
+    client._guid = "test-guid"
+    return client
+
+
+def _device(ip_services_response):
+    """Return a fake _post that answers /POST/9 with a placeholder dataset."""
+    with_placeholder = copy.deepcopy(ip_services_response)
+    vip = with_placeholder["data"]["dataset"]["ipService"][0][0]
+    vip["contentServer"]["CServerId"].append({"cId": "3", "CSIPAddr": ""})
+
+    def post(path, payload):
+        if path == constants.API_SERVER_ADD_INIT:
+            return 200, with_placeholder
+        return 200, None
+    return post
+
+
+class TestTransaction:
+    """Tests for EdgeADCClient.transaction()."""
+
+    def test_single_apply_for_all_operations(self, client, ip_services_response):
+        """Test queued operations are applied once at commit."""
+        with patch.object(client, "_get", return_value=(200, ip_services_response)), \
+                patch.object(client, "_post", side_effect=_device(ip_services_response)) as post:
+            with client.transaction() as txn:
+                txn.add_member("10.0.0.100", 80, "10.0.1.3", 8080)
+                txn.update_member_weight("10.0.0.100", 80, "10.0.1.1", 8080, 10)
+                txn.delete_member("10.0.0.100", 80, "10.0.1.2", 8080)
+                assert post.call_count == 0
+        paths = [c.args[0] for c in post.call_args_list]
+        assert paths.count(constants.API_APPLY_CONFIG) == 1
+        assert paths[-1] == constants.API_APPLY_CONFIG
+        assert txn.success
+        assert [r.success for r in txn.results] == [True, True, True]
+
+    def test_failure_rolls_back_completed_steps(self, client, ip_services_response):
+        """Test a failed step skips the rest and undoes earlier steps."""
+        with patch.object(client, "_get", return_value=(200, ip_services_response)), \
+                patch.object(client, "_post", side_effect=_device(ip_services_response)) as post:
+            with client.transaction() as txn:
+                txn.update_member_weight("10.0.0.100", 80, "10.0.1.1", 8080, 10)
+                txn.delete_member("10.0.0.100", 80, "10.0.9.9", 8080)
+                txn.add_member("10.0.0.100", 80, "10.0.1.3", 8080)
+        assert not txn.success
+        assert txn.results[0].rolled_back
+        assert txn.results[1].error == "Operation failed"
+        assert txn.results[2].error == "Skipped"
+        updates = [c.args[1]["WeightFactor"] for c in post.call_args_list
+                   if c.args[0] == constants.API_SERVER_ADD_UPDATE]
+        assert updates == ["10", "100"]
+
+    def test_exception_discards_queue(self, client):
+        """Test an exception inside the block executes nothing."""
+        with patch.object(client, "_post") as post:
+            with pytest.raises(ValueError):
+                with client.transaction() as txn:
+                    txn.delete_virtual_service("10.0.0.100", 80)
+                    raise ValueError("boom")
+        post.assert_not_called()
+        assert txn.results == []